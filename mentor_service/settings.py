@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,14 +44,14 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "bootstrap5",
     "mentorizon",
 ]
 
 MIDDLEWARE = [
+    "mentorizon.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "mentorizon.middleware.replica_pinning_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -59,6 +60,11 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    # right after SecurityMiddleware
+    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "mentor_service.urls"
 
 TEMPLATES = [
@@ -83,13 +89,210 @@ WSGI_APPLICATION = "mentor_service.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE selects the profile: "sqlite3" (default) or "postgresql".
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked
+# before reuse, so a request does not pay for connecting.
+
+DB_ENGINE = config("DB_ENGINE", default="sqlite3")
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("DB_NAME", default="mentorizon"),
+            "USER": config("DB_USER", default="mentorizon"),
+            "PASSWORD": config("DB_PASSWORD", default=""),
+            "HOST": config("DB_HOST", default="127.0.0.1"),
+            "PORT": config("DB_PORT", default="5432"),
+        }
+    }
+elif DB_ENGINE == "sqlite3":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("DB_NAME", default=str(BASE_DIR / "db.sqlite3")),
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        f"DB_ENGINE must be sqlite3 or postgresql, not {DB_ENGINE!r}."
+    )
+
+DATABASES["default"].update(
+    CONN_MAX_AGE=config("DB_CONN_MAX_AGE", default=60, cast=int),
+    CONN_HEALTH_CHECKS=True,
+)
+
+# Setting DB_REPLICA_HOST (PostgreSQL) or DB_REPLICA_NAME (SQLite file)
+# adds a "replica" database, which serves the reads of the pages.
+# After a write a browser reads from the primary for REPLICA_PIN_SECONDS.
+# With SQLite, "manage.py sync_replica" copies the primary to the replica.
+
+DB_REPLICA_HOST = config("DB_REPLICA_HOST", default="")
+DB_REPLICA_NAME = config("DB_REPLICA_NAME", default="")
+
+REPLICA_DATABASE = None
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+
+if DB_REPLICA_HOST or DB_REPLICA_NAME:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": DB_REPLICA_HOST or DATABASES["default"].get("HOST", ""),
+        "NAME": DB_REPLICA_NAME or DATABASES["default"]["NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASE = "replica"
+    DATABASE_ROUTERS = ["mentorizon.routers.PrimaryReplicaRouter"]
+
+# Applied to every new SQLite connection by mentorizon.signals.
+# WAL lets readers run alongside the writer, synchronous=NORMAL syncs
+# at checkpoints instead of every commit (safe in WAL mode) and the
+# busy timeout makes a writer wait for the lock instead of failing
+# with "database is locked".
+
+SQLITE_PRAGMAS = {
+    "journal_mode": config("SQLITE_JOURNAL_MODE", default="wal"),
+    "synchronous": config("SQLITE_SYNCHRONOUS", default="normal"),
+    "mmap_size": config(
+        "SQLITE_MMAP_SIZE", default=256 * 1024 * 1024, cast=int
+    ),
+    "busy_timeout": config("SQLITE_BUSY_TIMEOUT", default=20000, cast=int),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Use a shared backend (e.g. Redis or Memcached) when running
+# several worker processes, so that signal-based invalidation
+# reaches all of them.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
     }
 }
 
+# Versions of the cached API collections, typeahead indexes and meeting
+# cards (see mentorizon.caching) are only dropped in the cache of the
+# process making a change. With a cache local to the process they
+# expire soon, bounding how long the other workers serve stale data.
+SHARED_CACHE = CACHES["default"]["BACKEND"] not in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+CACHE_VERSION_TIMEOUT = config(
+    "CACHE_VERSION_TIMEOUT",
+    default=24 * 60 * 60 if SHARED_CACHE else 60,
+    cast=int,
+)
+
+
+# Sessions and authentication
+# With a shared cache sessions are read from the cache and fall back to
+# the database, and mentorizon.auth.CachedModelBackend loads the user of
+# a request from the cache, so authenticating a request costs no
+# queries. With a cache local to the process both are read from the
+# database: another worker would keep serving a session logged out or
+# a user changed, deactivated or deleted elsewhere until the timeout.
+# ModelBackend only loads the users of sessions logged in before
+# CachedModelBackend replaced it, until they log in again.
+
+SESSION_ENGINE = (
+    "django.contrib.sessions.backends.cached_db"
+    if SHARED_CACHE
+    else "django.contrib.sessions.backends.db"
+)
+AUTHENTICATION_BACKENDS = [
+    "mentorizon.auth.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+AUTH_USER_CACHE_TIMEOUT = config(
+    "AUTH_USER_CACHE_TIMEOUT", default=60 * 60, cast=int
+)
+AUTH_USER_CACHE = config("AUTH_USER_CACHE", default=SHARED_CACHE, cast=bool)
+
+
+# Metrics
+# /metrics serves request metrics in the Prometheus text format to
+# METRICS_ALLOWED_IPS. With several worker processes set METRICS_DIR
+# to a directory shared by them (emptied on deploy), so that every
+# worker reports the totals of all of them.
+
+METRICS_DIR = config("METRICS_DIR", default="")
+METRICS_FLUSH_SECONDS = config("METRICS_FLUSH_SECONDS", default=5, cast=int)
+METRICS_ALLOWED_IPS = config(
+    "METRICS_ALLOWED_IPS",
+    default="127.0.0.1",
+    cast=lambda value: [ip.strip() for ip in value.split(",")],
+)
+
+
+# Leaderboard
+# Mentors are ranked as if they had LEADERBOARD_PRIOR_VOTES more votes at
+# the average vote of their sphere (see mentorizon.leaderboard).
+
+LEADERBOARD_PRIOR_VOTES = config(
+    "LEADERBOARD_PRIOR_VOTES", default=10, cast=int
+)
+LEADERBOARD_SIZE = config("LEADERBOARD_SIZE", default=5, cast=int)
+
+
+# Recommendations
+# "manage.py build_recommendations" stores RECOMMENDATIONS_PER_USER
+# upcoming meetings for every user (see mentorizon.recommendations), the
+# index and account pages show the best RECOMMENDATIONS_SHOWN of them
+# not booked since.
+
+RECOMMENDATIONS_PER_USER = config(
+    "RECOMMENDATIONS_PER_USER", default=10, cast=int
+)
+RECOMMENDATIONS_SHOWN = config("RECOMMENDATIONS_SHOWN", default=3, cast=int)
+
+
+# Slow query log
+# Set SLOW_QUERY_LOG to a file to log queries slower than
+# SLOW_QUERY_THRESHOLD_MS there as JSON lines (see mentorizon.slowqueries).
+# SLOW_QUERY_SAMPLE_RATE is the fraction of the slow queries logged.
+
+SLOW_QUERY_LOG = config("SLOW_QUERY_LOG", default="")
+SLOW_QUERY_THRESHOLD_MS = config(
+    "SLOW_QUERY_THRESHOLD_MS", default=100, cast=int
+)
+SLOW_QUERY_SAMPLE_RATE = config(
+    "SLOW_QUERY_SAMPLE_RATE", default=1.0, cast=float
+)
+SLOW_QUERY_EXPLAIN = config("SLOW_QUERY_EXPLAIN", default=False, cast=bool)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {},
+    "loggers": {},
+}
+
+if SLOW_QUERY_LOG:
+    LOGGING["handlers"]["slow_queries"] = {
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": SLOW_QUERY_LOG,
+        "maxBytes": config(
+            "SLOW_QUERY_LOG_MAX_BYTES", default=10 * 1024 * 1024, cast=int
+        ),
+        "backupCount": config("SLOW_QUERY_LOG_BACKUPS", default=5, cast=int),
+        "formatter": "message",
+    }
+    LOGGING["loggers"]["mentorizon.slow_queries"] = {
+        "handlers": ["slow_queries"],
+        "level": "WARNING",
+        "propagate": False,
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -1,5 +1,7 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import ValidationError
 
 from mentorizon.models import (
     Meeting,
@@ -64,10 +66,59 @@ class SphereAdmin(admin.ModelAdmin):
     search_fields = ("name",)
 
 
+class MeetingAdminForm(forms.ModelForm):
+
+    def clean_limit_of_participants(self):
+        data = self.cleaned_data["limit_of_participants"]
+        # the participants field comes first, unless it is invalid
+        participants = self.cleaned_data.get("participants")
+        if participants is not None:
+            number_of_participants = len(participants)
+        elif self.instance.pk is not None:
+            number_of_participants = self.instance.participants.count()
+        else:
+            number_of_participants = 0
+        if data < number_of_participants:
+            raise ValidationError(
+                "Limit of participants can't be less than the number of "
+                f"participants: {number_of_participants}"
+            )
+        return data
+
+
 @admin.register(Meeting)
 class MeetingAdmin(admin.ModelAdmin):
+    form = MeetingAdminForm
     list_display = ("topic", "date", "limit_of_participants", "link")
     search_fields = ("topic", "date")
+    # the seat counter follows the bookings and the limit
+    readonly_fields = ("available_places",)
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # the limit is changed with the counter by save_related()
+        obj.save(update_fields=[
+            field for field in form.changed_data
+            if field not in ("participants", "limit_of_participants")
+        ] + ["updated_at"])
+
+    def save_related(self, request, form, formsets, change):
+        # after the participants are set, so the promoted users stay
+        super().save_related(request, form, formsets, change)
+        if (
+            change
+            and "limit_of_participants" in form.changed_data
+            and not form.instance.change_limit(
+                form.cleaned_data["limit_of_participants"]
+            )
+        ):
+            self.message_user(
+                request,
+                "The limit of participants was not changed: the meeting "
+                "has more participants.",
+                messages.ERROR
+            )
 
 
 @admin.register(MentorSession)
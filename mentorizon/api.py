@@ -0,0 +1,270 @@
+"""Read-only JSON API for meetings, mentors and spheres, and the
+typeahead endpoints of the sphere and mentor name inputs.
+
+Responses carry an ETag and Last-Modified built from the cached
+collection versions only, so a conditional request for an unchanged
+collection is answered with 304 Not Modified without querying it.
+Rows are fetched with values() restricted to the requested fields.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views import generic
+
+from mentorizon.caching import collection_versions
+from mentorizon.models import Meeting, Sphere
+from mentorizon.pagination import KeysetPaginator
+from mentorizon.search import search
+from mentorizon.typeahead import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    mentor_index,
+    sphere_index,
+)
+
+MAX_PER_PAGE = 100
+MAX_BATCH_SIZE = 100
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ApiView(LoginRequiredMixin, generic.View):
+    raise_exception = True
+    queryset = None
+    # field name in the response: ORM path passed to values()
+    fields = {}
+    collection = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_fields(self) -> dict:
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return self.fields
+        names = [name.strip() for name in requested.split(",")]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+        return {name: self.fields[name] for name in names}
+
+    @staticmethod
+    def serialize(rows, fields: dict) -> list:
+        return [
+            {name: row[path] for name, path in fields.items()}
+            for row in rows
+        ]
+
+    def get_data(self, fields: dict) -> dict:
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        version = collection_versions(self.collection)[self.collection]
+        etag = '"{}"'.format(hashlib.md5(
+            f"{request.get_full_path()}:{version}".encode()
+        ).hexdigest())
+        last_modified = version // 1_000_000_000
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            try:
+                response = JsonResponse(self.get_data(self.get_fields()))
+            except ApiError as error:
+                return JsonResponse(
+                    {"error": str(error)}, status=error.status
+                )
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ApiListView(ApiView):
+    keyset_ordering = ("id",)
+    search_param = "q"
+
+    def filter_queryset(self, queryset):
+        query = self.request.GET.get(self.search_param, "").strip()
+        if query:
+            queryset = search(queryset, query)
+        return queryset
+
+    def get_per_page(self) -> int:
+        try:
+            per_page = int(self.request.GET.get("limit", 20))
+        except ValueError:
+            raise ApiError("limit must be an integer")
+        return max(1, min(per_page, MAX_PER_PAGE))
+
+    def page_url(self, cursor: str) -> str:
+        query = self.request.GET.copy()
+        query["cursor"] = cursor
+        return f"{self.request.path}?{query.urlencode()}"
+
+    def get_data(self, fields: dict) -> dict:
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = self.keyset_ordering
+        if "search_rank" in queryset.query.annotations:
+            ordering = ("search_rank",) + ordering
+        paginator = KeysetPaginator(
+            queryset.values(*dict.fromkeys((*fields.values(), *ordering))),
+            self.get_per_page(),
+            ordering
+        )
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except Http404:
+            raise ApiError("Invalid cursor")
+        return {
+            "results": self.serialize(page.object_list, fields),
+            "next": (
+                self.page_url(page.next_cursor) if page.has_next() else None
+            ),
+            "previous": (
+                self.page_url(page.previous_cursor)
+                if page.has_previous() else None
+            ),
+        }
+
+
+class ApiBatchView(ApiView):
+    """Fetch up to MAX_BATCH_SIZE objects by id in one request,
+    e.g. ?ids=3,1,2. Results keep the requested order."""
+
+    def get_ids(self) -> list:
+        try:
+            ids = [
+                int(pk) for pk in self.request.GET.get("ids", "").split(",")
+                if pk.strip()
+            ]
+        except ValueError:
+            raise ApiError("ids must be comma separated integers")
+        if not ids or len(ids) > MAX_BATCH_SIZE:
+            raise ApiError(f"Pass between 1 and {MAX_BATCH_SIZE} ids")
+        return list(dict.fromkeys(ids))
+
+    def get_data(self, fields: dict) -> dict:
+        ids = self.get_ids()
+        rows = {
+            row["id"]: row
+            for row in self.get_queryset().filter(pk__in=ids).values(
+                *dict.fromkeys(("id", *fields.values()))
+            )
+        }
+        return {
+            "results": self.serialize(
+                (rows[pk] for pk in ids if pk in rows), fields
+            ),
+            "missing": [pk for pk in ids if pk not in rows],
+        }
+
+
+class MeetingApiMixin:
+    collection = "meetings"
+    fields = {
+        "id": "id",
+        "topic": "topic",
+        "date": "date",
+        "description": "description",
+        "limit_of_participants": "limit_of_participants",
+        "available_places": "available_places",
+        "mentor_id": "mentor_session__mentor_id",
+        "mentor_first_name": "mentor_session__mentor__first_name",
+        "mentor_last_name": "mentor_session__mentor__last_name",
+        "sphere": "mentor_session__mentor__mentor_sphere__name",
+    }
+
+    def get_queryset(self):
+        # evaluated per request, MeetingManager filters by the current time
+        return Meeting.objects.all()
+
+
+class MentorApiMixin:
+    queryset = get_user_model().objects.filter(mentor_sphere__isnull=False)
+    collection = "mentors"
+    fields = {
+        "id": "id",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "experience_description": "experience_description",
+        "sphere": "mentor_sphere__name",
+        "rating": "rating__average",
+        "votes_count": "rating__votes_count",
+    }
+
+
+class MeetingApiListView(MeetingApiMixin, ApiListView):
+    keyset_ordering = ("date", "id")
+
+    def filter_queryset(self, queryset):
+        sphere_name = self.request.GET.get("sphere")
+        if sphere_name:
+            queryset = queryset.filter(
+                mentor_session__mentor__mentor_sphere__name=sphere_name
+            )
+        return super().filter_queryset(queryset)
+
+
+class MentorApiListView(MentorApiMixin, ApiListView):
+    keyset_ordering = ("last_name", "id")
+
+    def filter_queryset(self, queryset):
+        sphere_name = self.request.GET.get("sphere")
+        if sphere_name:
+            queryset = queryset.filter(mentor_sphere__name=sphere_name)
+        return super().filter_queryset(queryset)
+
+
+class SphereApiListView(ApiListView):
+    queryset = Sphere.objects.all()
+    collection = "spheres"
+    fields = {"id": "id", "name": "name"}
+    keyset_ordering = ("name", "id")
+
+
+class TypeaheadView(ApiView):
+    """Up to ?limit= items of the index with a name starting with ?q=,
+    for typeahead widgets."""
+    index = None
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.GET.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError("limit must be an integer")
+        return max(1, min(limit, MAX_LIMIT))
+
+    def get_data(self, fields: dict) -> dict:
+        items = self.index.search(
+            self.request.GET.get("q", ""), self.get_limit()
+        )
+        return {"results": self.serialize(items, fields)}
+
+
+class SphereTypeaheadView(TypeaheadView):
+    index = sphere_index
+    collection = "spheres"
+    fields = {"id": "id", "name": "name"}
+
+
+class MentorTypeaheadView(TypeaheadView):
+    index = mentor_index
+    collection = "mentors"
+    fields = {"id": "id", "name": "name", "label": "label"}
+
+
+class MeetingApiBatchView(MeetingApiMixin, ApiBatchView):
+    pass
+
+
+class MentorApiBatchView(MentorApiMixin, ApiBatchView):
+    pass
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MentorizonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mentorizon"
+
+    def ready(self):
+        from mentorizon import signals  # noqa: F401
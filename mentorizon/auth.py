@@ -0,0 +1,87 @@
+"""Authentication backend loading the user of a session from the cache.
+
+The user is cached by id on login or on the first lookup after that
+and dropped by the User signals when it is saved or deleted
+(UserUpdateView, admin, password changes). Together with the cached_db
+session engine an authenticated request reads neither its session nor
+its user from the database.
+
+Users are only cached when AUTH_USER_CACHE is set, which it is by
+default for a cache shared by the worker processes. A cache local to
+the process would miss the invalidations of the other workers.
+
+Users are looked up on the primary database, bypassing
+mentorizon.routers, so that a deactivated user or a changed password
+takes effect without waiting for the replica.
+"""
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+def _user_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def cache_user(user) -> None:
+    """Cache the user without the related objects loaded with it, which
+    their own changes would not invalidate."""
+    if not settings.AUTH_USER_CACHE:
+        return
+    user = copy.copy(user)
+    user._state = copy.copy(user._state)
+    user._state.fields_cache = {}
+    user.__dict__.pop("_prefetched_objects_cache", None)
+    cache.set(_user_key(user.pk), user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(_user_key(user_id))
+
+
+def _primary_users():
+    return get_user_model()._default_manager.db_manager(DEFAULT_DB_ALIAS)
+
+
+class CachedModelBackend(ModelBackend):
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = _primary_users().get_by_natural_key(username)
+        except user_model.DoesNotExist:
+            # run the hasher anyway, so unknown usernames take as long
+            user_model().set_password(password)
+            return None
+        if (
+            user.check_password(password)
+            and self.user_can_authenticate(user)
+        ):
+            return user
+        return None
+
+    def _get_primary_user(self, user_id):
+        try:
+            user = _primary_users().get(pk=user_id)
+        except get_user_model().DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def get_user(self, user_id):
+        if not settings.AUTH_USER_CACHE:
+            return self._get_primary_user(user_id)
+        user = cache.get(_user_key(user_id))
+        if user is None:
+            user = self._get_primary_user(user_id)
+            if user is not None:
+                cache_user(user)
+            return user
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,166 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from mentorizon.models import Meeting, Sphere
+
+COUNTER_TIMEOUT = 60 * 60
+STALE_TIMEOUT = 24 * 60 * 60
+LOCK_TIMEOUT = 10
+LOCK_WAIT_ATTEMPTS = 20
+LOCK_WAIT_INTERVAL = 0.05
+
+
+def _count_mentors() -> tuple:
+    return get_user_model().objects.filter(
+        mentor_sphere__isnull=False
+    ).count(), COUNTER_TIMEOUT
+
+
+def _count_meetings() -> tuple:
+    """Count upcoming meetings and expire the value when the
+    earliest of them starts and drops out of MeetingManager."""
+    meetings = Meeting.objects.aggregate(
+        count=Count("id"), next_date=Min("date")
+    )
+    timeout = COUNTER_TIMEOUT
+    if meetings["next_date"] is not None:
+        until_next = (meetings["next_date"] - timezone.now()).total_seconds()
+        timeout = max(1, min(timeout, int(until_next) + 1))
+    return meetings["count"], timeout
+
+
+def _count_spheres() -> tuple:
+    return Sphere.objects.count(), COUNTER_TIMEOUT
+
+
+DASHBOARD_COUNTERS = {
+    "num_mentors": _count_mentors,
+    "num_meetings": _count_meetings,
+    "num_spheres": _count_spheres,
+}
+
+
+def _counter_key(name: str) -> str:
+    return f"dashboard:{name}"
+
+
+def _get_or_compute(name: str) -> int:
+    """Only one process recomputes a missing counter at a time, the
+    others serve the last known (stale) value or wait for the fresh
+    one instead of hitting the database."""
+    key = _counter_key(name)
+    compute = DASHBOARD_COUNTERS[name]
+    if cache.add(f"{key}:lock", True, LOCK_TIMEOUT):
+        try:
+            value, timeout = compute()
+            cache.set(key, value, timeout)
+            cache.set(f"{key}:stale", value, STALE_TIMEOUT)
+        finally:
+            cache.delete(f"{key}:lock")
+        return value
+    stale = cache.get(f"{key}:stale")
+    if stale is not None:
+        return stale
+    for _ in range(LOCK_WAIT_ATTEMPTS):
+        time.sleep(LOCK_WAIT_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return compute()[0]
+
+
+def get_dashboard_counters() -> dict:
+    keys = {name: _counter_key(name) for name in DASHBOARD_COUNTERS}
+    cached = cache.get_many(keys.values())
+    return {
+        name: cached[key] if key in cached else _get_or_compute(name)
+        for name, key in keys.items()
+    }
+
+
+def invalidate_dashboard_counters(*names: str) -> None:
+    cache.delete_many([_counter_key(name) for name in names])
+
+
+def _card_version_key(label: str, pk) -> str:
+    return f"card-version:{label}:{pk}"
+
+
+def card_key(*objects) -> str:
+    """Cache key of a rendered card which changes whenever one of the
+    objects shown on the card changes. A version missing from the cache
+    is recreated from the clock, so eviction and expiry never revive
+    old cards."""
+    objects = [obj for obj in objects if obj is not None]
+    keys = [
+        _card_version_key(obj._meta.label_lower, obj.pk) for obj in objects
+    ]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), settings.CACHE_VERSION_TIMEOUT)
+            versions[key] = cache.get(key)
+    return ":".join(
+        f"{obj._meta.model_name}.{obj.pk}.{versions[key]}"
+        for obj, key in zip(objects, keys)
+    )
+
+
+def bump_card_version(model, pk) -> None:
+    cache.set(
+        _card_version_key(model._meta.label_lower, pk),
+        time.time_ns(),
+        settings.CACHE_VERSION_TIMEOUT
+    )
+
+
+def _until_next_meeting():
+    """Seconds until the earliest upcoming meeting starts, None if
+    there are no upcoming meetings."""
+    next_date = Meeting.objects.aggregate(next_date=Min("date"))["next_date"]
+    if next_date is None:
+        return None
+    return max(1, int((next_date - timezone.now()).total_seconds()) + 1)
+
+
+# collection: None or a callable evaluated when its version is created,
+# returning a sooner timeout of the version than CACHE_VERSION_TIMEOUT
+COLLECTIONS = {
+    "meetings": _until_next_meeting,
+    "mentors": None,
+    "spheres": None,
+}
+
+
+def _collection_version_key(name: str) -> str:
+    return f"collection-version:{name}"
+
+
+def collection_versions(*names: str) -> dict:
+    """Versions (creation time in nanoseconds) of the given collections.
+    A version is dropped when the collection changes and recreated on
+    the next read. It expires after CACHE_VERSION_TIMEOUT, the meetings
+    version also when the earliest upcoming meeting starts and leaves
+    the upcoming meetings."""
+    keys = {name: _collection_version_key(name) for name in names}
+    cached = cache.get_many(keys.values())
+    versions = {}
+    for name, key in keys.items():
+        if key not in cached:
+            timeout = settings.CACHE_VERSION_TIMEOUT
+            if COLLECTIONS[name] is not None:
+                timeout = min(timeout, COLLECTIONS[name]() or timeout)
+            version = time.time_ns()
+            cache.add(key, version, timeout)
+            cached[key] = cache.get(key, version)
+        versions[name] = cached[key]
+    return versions
+
+
+def invalidate_collections(*names: str) -> None:
+    cache.delete_many([_collection_version_key(name) for name in names])
@@ -0,0 +1,73 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import QuerySet, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def latest_update(queryset: QuerySet, *related: QuerySet):
+    """Latest updated_at of the rows of queryset and the related
+    querysets in a single query, every part of it a lookup of the
+    updated_at index. None if queryset has no rows."""
+    subqueries = {
+        f"related_{position}": Subquery(
+            related_queryset.order_by("-updated_at").values("updated_at")[:1]
+        )
+        for position, related_queryset in enumerate(related)
+    }
+    row = queryset.order_by("-updated_at").annotate(**subqueries).values_list(
+        "updated_at", *subqueries
+    ).first()
+    if row is None:
+        return None
+    return max(value for value in row if value is not None)
+
+
+class ConditionalGetMixin:
+    """Answer GET with 304 Not Modified while the page would render the
+    same for this viewer.
+
+    get_last_update() returns the latest modification of the rows shown
+    (None disables the check), get_etag_extra() anything else the page
+    depends on which timestamps cannot reflect, like deleted rows.
+    The ETag covers the viewer, so per-user parts of the page are safe.
+    Last-Modified is only sent when the timestamps alone describe the
+    page, since If-Modified-Since cannot account for the extra values.
+    """
+
+    def get_last_update(self):
+        raise NotImplementedError
+
+    def get_etag_extra(self) -> tuple:
+        return ()
+
+    def get_validators(self, last_update, extra: tuple) -> tuple:
+        request = self.request
+        etag = '"{}"'.format(hashlib.md5(repr((
+            request.user.pk,
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+            request.get_full_path(),
+            last_update.isoformat(),
+            extra,
+        )).encode()).hexdigest())
+        last_modified = None if extra else int(last_update.timestamp())
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        last_update = self.get_last_update()
+        if last_update is None:
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = self.get_validators(
+            last_update, self.get_etag_extra()
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,234 @@
+"""iCalendar feeds of upcoming meetings for calendar clients.
+
+Calendar clients cannot log in, so a feed URL carries the id of the
+subscriber and a token derived from it and from the subscriber's
+password hash: changing the password revokes the old feed URLs.
+
+Feeds are built from a chunked queryset iterator and carry a strong
+ETag built by a single aggregate query, so clients polling an
+unchanged feed are answered with 304 Not Modified without reading the
+meetings. Under WSGI the feed is streamed. Django 4.1 iterates
+streaming responses in the event loop under ASGI, where the ORM cannot
+run, so there the body is built in the view, which runs in a thread.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max, Q, QuerySet
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.views import generic
+
+from mentorizon.models import Meeting
+
+PRODUCT_ID = "-//Mentorizon//Meetings//EN"
+TOKEN_SALT = "mentorizon.feeds.calendar_token"
+CHUNK_SIZE = 500
+# meetings have a start only
+EVENT_DURATION = timezone.timedelta(hours=1)
+MAX_LINE_OCTETS = 75
+
+
+def calendar_token(user) -> str:
+    return salted_hmac(
+        TOKEN_SALT, f"{user.pk}:{user.password}", algorithm="sha256"
+    ).hexdigest()
+
+
+def calendar_feed_url(request, mentor=None) -> str:
+    """Absolute URL of the viewer's feed, or of the mentor's meetings
+    subscribed to by the viewer."""
+    user = request.user
+    kwargs = {"pk": user.pk, "token": calendar_token(user)}
+    if mentor is None:
+        path = reverse("mentorizon:user-calendar", kwargs=kwargs)
+    else:
+        path = reverse(
+            "mentorizon:mentor-calendar",
+            kwargs={**kwargs, "mentor_pk": mentor.pk}
+        )
+    return request.build_absolute_uri(path)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", r"\;").replace(
+        ",", r"\,"
+    ).replace("\r\n", "\n").replace("\n", r"\n")
+
+
+def _fold(line: str) -> bytes:
+    """Content line split into lines of at most 75 octets, without
+    splitting a UTF-8 sequence, continuation lines starting with
+    a space."""
+    encoded = line.encode()
+    parts = []
+    limit = MAX_LINE_OCTETS
+    while len(encoded) > limit:
+        end = limit
+        # step back to the first byte of a character
+        while encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[:end])
+        encoded = encoded[end:]
+        limit = MAX_LINE_OCTETS - 1
+    parts.append(encoded)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _format_time(value) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _event(meeting: Meeting, request, subscriber) -> bytes:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:meeting-{meeting.id}@{request.get_host()}",
+        f"DTSTAMP:{_format_time(meeting.updated_at)}",
+        f"DTSTART:{_format_time(meeting.date)}",
+        f"DTEND:{_format_time(meeting.date + EVENT_DURATION)}",
+        f"SUMMARY:{_escape(meeting.topic)}",
+    ]
+    description = meeting.description
+    session = getattr(meeting, "mentor_session", None)
+    if session is not None:
+        mentor = session.mentor
+        description = (
+            f"by {mentor.first_name} {mentor.last_name}\n\n{description}"
+        )
+    lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines.append(
+        f"URL:{request.build_absolute_uri(meeting.get_absolute_url())}"
+    )
+    # like on the pages, only participants and the mentor get the link
+    if meeting.is_participant or (
+        session is not None and session.mentor_id == subscriber.id
+    ):
+        lines.append(f"LOCATION:{_escape(meeting.link)}")
+    lines.append("END:VEVENT")
+    return b"".join(_fold(line) for line in lines)
+
+
+def _calendar(name: str, meetings, request, subscriber):
+    """Yield the feed a chunk of events at a time."""
+    yield b"".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ))
+    chunk = []
+    for meeting in meetings:
+        chunk.append(_event(meeting, request, subscriber))
+        if len(chunk) == CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(_fold("END:VCALENDAR"))
+    yield b"".join(chunk)
+
+
+class CalendarFeedView(generic.View):
+    """Serve the upcoming meetings of get_queryset() to the owner of
+    the token in the URL."""
+
+    def get_subscriber(self):
+        user = get_user_model().objects.filter(pk=self.kwargs["pk"]).first()
+        if user is None or not constant_time_compare(
+            calendar_token(user), self.kwargs["token"]
+        ):
+            raise Http404("Unknown calendar feed")
+        return user
+
+    def get_queryset(self) -> QuerySet:
+        raise NotImplementedError
+
+    def get_calendar_name(self) -> str:
+        raise NotImplementedError
+
+    def get_etag_extra(self) -> tuple:
+        """Values the feed depends on besides its meetings."""
+        return ()
+
+    def get_etag(self, queryset: QuerySet) -> str:
+        state = queryset.aggregate(
+            count=Count("id"),
+            updated_at=Max("updated_at"),
+            mentor_updated_at=Max("mentor_session__mentor__updated_at"),
+        )
+        return '"{}"'.format(hashlib.md5(repr((
+            self.request.path,
+            sorted(state.items()),
+            self.get_etag_extra(),
+        )).encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        self.subscriber = self.get_subscriber()
+        queryset = self.get_queryset()
+        etag = self.get_etag(queryset)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            meetings = queryset.select_related(
+                "mentor_session__mentor"
+            ).with_booking_state(self.subscriber).order_by(
+                "date", "id"
+            ).iterator(chunk_size=CHUNK_SIZE)
+            content = _calendar(
+                self.get_calendar_name(), meetings, request, self.subscriber
+            )
+            content_type = "text/calendar; charset=utf-8"
+            if isinstance(request, ASGIRequest):
+                response = HttpResponse(
+                    b"".join(content), content_type=content_type
+                )
+            else:
+                response = StreamingHttpResponse(
+                    content, content_type=content_type
+                )
+            response["Content-Disposition"] = (
+                'inline; filename="mentorizon.ics"'
+            )
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class UserCalendarView(CalendarFeedView):
+    """Meetings the subscriber mentors or attends."""
+
+    def get_queryset(self) -> QuerySet:
+        user_id = self.subscriber.id
+        return Meeting.objects.filter(
+            Q(mentor_session__mentor_id=user_id)
+            | Q(id__in=Meeting.participants.through.objects.filter(
+                user_id=user_id
+            ).values("meeting_id"))
+        )
+
+    def get_calendar_name(self) -> str:
+        return "Mentorizon: my meetings"
+
+
+class MentorCalendarView(CalendarFeedView):
+    """Meetings of a mentor."""
+
+    def get_queryset(self) -> QuerySet:
+        self.mentor = get_user_model().objects.filter(
+            pk=self.kwargs["mentor_pk"], mentor_sphere__isnull=False
+        ).first()
+        if self.mentor is None:
+            raise Http404("No mentor found matching the query")
+        return Meeting.objects.filter(
+            mentor_session__mentor_id=self.mentor.id
+        )
+
+    def get_calendar_name(self) -> str:
+        return f"Mentorizon: {self.mentor.first_name} {self.mentor.last_name}"
+
+    def get_etag_extra(self) -> tuple:
+        # the name of a mentor without meetings
+        return (self.mentor.updated_at.isoformat(),)
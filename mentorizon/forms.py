@@ -4,11 +4,68 @@ from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 from django import forms
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
+from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.html import format_html
 
 from mentorizon.models import Meeting, Sphere
 
 
+class TypeaheadInput(forms.TextInput):
+    """Text input completed from a typeahead endpoint as the user types,
+    instead of a select rendering every choice as an option."""
+
+    class Media:
+        js = ("js/typeahead.js",)
+
+    def __init__(self, url, attrs=None) -> None:
+        super().__init__(attrs)
+        self.url = url
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = dict(attrs or {})
+        list_id = f"{attrs.get('id', name)}-options"
+        attrs.update({
+            "list": list_id,
+            "data-typeahead": self.url,
+            "autocomplete": "off",
+        })
+        return format_html(
+            '{}<datalist id="{}"></datalist>',
+            super().render(name, value, attrs, renderer),
+            list_id
+        )
+
+
+class SphereNameField(forms.ModelChoiceField):
+    """Sphere picked by its name in a typeahead input."""
+
+    def __init__(self, **kwargs) -> None:
+        kwargs.setdefault("widget", TypeaheadInput(
+            reverse_lazy("mentorizon:api-sphere-typeahead"),
+            attrs={"placeholder": "Sphere"}
+        ))
+        super().__init__(
+            queryset=Sphere.objects.all(), to_field_name="name", **kwargs
+        )
+
+    def to_python(self, value):
+        """Look the sphere up case-insensitively, names are stored
+        capitalized but typed as they come."""
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Sphere):
+            return value
+        try:
+            return self.queryset.get(name__iexact=str(value).strip())
+        except (ValueError, TypeError, Sphere.DoesNotExist):
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+
 class UserCreateForm(UserCreationForm):
 
     class Meta(UserCreationForm.Meta):
@@ -23,6 +80,10 @@ class UserCreateForm(UserCreationForm):
 
 class UserUpdateForm(UserChangeForm):
     password = None
+    mentor_sphere = SphereNameField(
+        required=False,
+        help_text="Start typing the name of your sphere.",
+    )
 
     class Meta:
         model = get_user_model()
@@ -35,13 +96,22 @@ class UserUpdateForm(UserChangeForm):
             "experience_description"
         )
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # the input shows the name, not the id ModelForm starts with
+        if self.instance.mentor_sphere_id is not None:
+            self.initial["mentor_sphere"] = self.instance.mentor_sphere
+
 
 class MentorSearchForm(forms.Form):
     last_name = forms.CharField(
         max_length=150,
         required=False,
         label="",
-        widget=forms.TextInput(attrs={"placeholder": "Search by last name..."})
+        widget=TypeaheadInput(
+            reverse_lazy("mentorizon:api-mentor-typeahead"),
+            attrs={"placeholder": "Search by name or experience..."}
+        )
     )
 
 
@@ -94,6 +164,10 @@ class MeetingSearchForm(forms.Form):
     )
 
 
+class RateForm(forms.Form):
+    rate = forms.IntegerField(min_value=1, max_value=5)
+
+
 class SphereCreateForm(forms.ModelForm):
 
     class Meta:
@@ -111,15 +185,16 @@ class SphereSearchForm(forms.Form):
 
 
 class SphereFilterForm(forms.ModelForm):
-    name = forms.ModelChoiceField(
-        queryset=Sphere.objects.all(),
-        empty_label="Sphere",
-        to_field_name="name",
-        required=False,
-        label="",
-        widget=forms.Select()
-    )
+    name = SphereNameField(required=False, label="")
 
     class Meta:
         model = Sphere
         fields = ("name",)
+
+
+class MentorFilterForm(SphereFilterForm):
+    sort = forms.ChoiceField(
+        choices=(("", "By name"), ("rating", "By rating")),
+        required=False,
+        label="",
+    )
@@ -0,0 +1,151 @@
+"""Mentor leaderboards ranked by a Bayesian-smoothed rating.
+
+The score of a mentor is the average of their votes plus
+LEADERBOARD_PRIOR_VOTES imaginary votes at the average vote of their
+sphere (the prior), so a mentor with a couple of 5s does not outrank
+one with hundreds of 4s. Scores are stored in MentorRanking, indexed
+per sphere, so a leaderboard is a range of an index:
+refresh_mentor_ranking() updates the row of a mentor whose votes or
+sphere change, and the rebuild_leaderboard command recomputes the
+priors and every row periodically.
+
+The priors are kept in the cache between rebuilds; a missing prior is
+recomputed from the stored rating aggregates of the sphere.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Sum
+
+from mentorizon.models import MentorRanking, Rating
+
+PRIOR_TIMEOUT = 2 * 24 * 60 * 60
+# prior of a sphere without votes, the middle of the 0-5 scale
+DEFAULT_PRIOR = 2.5
+BATCH_SIZE = 1000
+RANKING_FIELDS = ["sphere", "votes_count", "average", "score", "updated_at"]
+
+
+def _prior_key(sphere_id: int) -> str:
+    return f"leaderboard:prior:{sphere_id}"
+
+
+def _prior(votes_sum, votes_count) -> float:
+    return votes_sum / votes_count if votes_count else DEFAULT_PRIOR
+
+
+def sphere_prior(sphere_id: int) -> float:
+    prior = cache.get(_prior_key(sphere_id))
+    if prior is None:
+        totals = Rating.objects.filter(
+            mentor__mentor_sphere_id=sphere_id
+        ).aggregate(
+            votes_sum=Sum("votes_sum"), votes_count=Sum("votes_count")
+        )
+        prior = _prior(totals["votes_sum"], totals["votes_count"])
+        cache.set(_prior_key(sphere_id), prior, PRIOR_TIMEOUT)
+    return prior
+
+
+def score(votes_sum: int, votes_count: int, prior: float) -> float:
+    weight = settings.LEADERBOARD_PRIOR_VOTES
+    return (weight * prior + votes_sum) / (weight + votes_count)
+
+
+def _ranking(mentor_id, sphere_id, votes_sum, votes_count, average, prior):
+    return MentorRanking(
+        mentor_id=mentor_id,
+        sphere_id=sphere_id,
+        votes_count=votes_count,
+        average=average,
+        score=score(votes_sum, votes_count, prior),
+    )
+
+
+def _save(rankings: list) -> None:
+    MentorRanking.objects.bulk_create(
+        rankings,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["mentor"],
+        update_fields=RANKING_FIELDS,
+    )
+
+
+def refresh_mentor_ranking(mentor_id: int) -> None:
+    """Upsert the ranking of a mentor, or delete it if the user is
+    no mentor (anymore)."""
+    mentor = get_user_model().objects.filter(
+        pk=mentor_id, mentor_sphere__isnull=False
+    ).values_list(
+        "mentor_sphere_id",
+        "rating__votes_sum",
+        "rating__votes_count",
+        "rating__average",
+    ).first()
+    if mentor is None:
+        MentorRanking.objects.filter(mentor_id=mentor_id).delete()
+        return
+    sphere_id, votes_sum, votes_count, average = mentor
+    _save([_ranking(
+        mentor_id, sphere_id, votes_sum or 0, votes_count or 0, average,
+        sphere_prior(sphere_id)
+    )])
+
+
+def rebuild_rankings() -> int:
+    """Recompute the priors and the ranking of every mentor. Returns
+    the number of rankings."""
+    totals = Rating.objects.filter(
+        mentor__mentor_sphere__isnull=False
+    ).values("mentor__mentor_sphere_id").annotate(
+        votes_sum=Sum("votes_sum"), votes_count=Sum("votes_count")
+    ).order_by()
+    priors = {
+        row["mentor__mentor_sphere_id"]: _prior(
+            row["votes_sum"], row["votes_count"]
+        )
+        for row in totals
+    }
+    cache.set_many(
+        {
+            _prior_key(sphere_id): prior
+            for sphere_id, prior in priors.items()
+        },
+        PRIOR_TIMEOUT
+    )
+    mentors = Rating.objects.filter(
+        mentor__mentor_sphere__isnull=False
+    ).values_list(
+        "mentor_id",
+        "mentor__mentor_sphere_id",
+        "votes_sum",
+        "votes_count",
+        "average",
+    ).order_by("mentor_id")
+    batch = []
+    number_of_rankings = 0
+    for mentor_id, sphere_id, votes_sum, votes_count, average in (
+        mentors.iterator(chunk_size=BATCH_SIZE)
+    ):
+        batch.append(_ranking(
+            mentor_id, sphere_id, votes_sum, votes_count, average,
+            priors[sphere_id]
+        ))
+        if len(batch) == BATCH_SIZE:
+            _save(batch)
+            number_of_rankings += len(batch)
+            batch = []
+    _save(batch)
+    number_of_rankings += len(batch)
+    MentorRanking.objects.exclude(
+        mentor__mentor_sphere__isnull=False
+    ).delete()
+    return number_of_rankings
+
+
+def top_mentors(number: int = None):
+    """Queryset of the best ranked mentors."""
+    return MentorRanking.objects.select_related(
+        "mentor", "sphere"
+    )[:number or settings.LEADERBOARD_SIZE]
@@ -0,0 +1,124 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from mentorizon.models import (
+    ArchivedAttendance,
+    ArchivedMeeting,
+    Meeting,
+    MeetingRecommendation,
+    MentorSession,
+    WaitlistEntry,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move past meetings with their mentor sessions and participants "
+        "into the archive tables, dropping their waitlists and "
+        "recommendations, in short transactions of --batch-size "
+        "meetings. Run it periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="Archive meetings that took place at least this many "
+                 "days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Meetings moved per transaction.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between batches, so requests waiting "
+                 "for the write lock get it.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] < 1:
+            raise CommandError(
+                "--days must not be negative and --batch-size positive."
+            )
+        cutoff = timezone.now() - timezone.timedelta(days=options["days"])
+        archived = 0
+        while True:
+            moved = self.archive_batch(cutoff, options["batch_size"])
+            archived += moved
+            if moved < options["batch_size"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {archived} meeting(s).")
+        )
+
+    @staticmethod
+    def archive_batch(cutoff, batch_size: int) -> int:
+        """Archive the oldest batch_size meetings before cutoff.
+
+        The hot rows are deleted with plain DELETE statements: the
+        signal handlers of Meeting and MentorSession keep caches and
+        counters of upcoming meetings, which past meetings are not in.
+        """
+        with transaction.atomic():
+            meetings = list(
+                Meeting._base_manager.select_for_update(
+                    skip_locked=True
+                ).filter(date__lte=cutoff).order_by("date", "id")[:batch_size]
+            )
+            if not meetings:
+                return 0
+            ids = [meeting.id for meeting in meetings]
+            mentors = dict(
+                MentorSession._base_manager.filter(
+                    meeting_id__in=ids
+                ).values_list("meeting_id", "mentor_id")
+            )
+            attendances = list(
+                Meeting.participants.through.objects.filter(
+                    meeting_id__in=ids
+                ).values_list("meeting_id", "user_id")
+            )
+            ArchivedMeeting.objects.bulk_create([
+                ArchivedMeeting(
+                    id=meeting.id,
+                    topic=meeting.topic,
+                    date=meeting.date,
+                    description=meeting.description,
+                    mentor_id=mentors.get(meeting.id),
+                    limit_of_participants=meeting.limit_of_participants,
+                    participants_count=(
+                        meeting.limit_of_participants
+                        - meeting.available_places
+                    ),
+                )
+                for meeting in meetings
+            ])
+            ArchivedAttendance.objects.bulk_create([
+                ArchivedAttendance(meeting_id=meeting_id, user_id=user_id)
+                for meeting_id, user_id in attendances
+            ], batch_size=1000)
+            placeholders = ", ".join(["%s"] * len(ids))
+            with connection.cursor() as cursor:
+                for model, column in (
+                    (Meeting.participants.through, "meeting_id"),
+                    (WaitlistEntry, "meeting_id"),
+                    (MeetingRecommendation, "meeting_id"),
+                    (MentorSession, "meeting_id"),
+                    (Meeting, "id"),
+                ):
+                    cursor.execute(
+                        f"DELETE FROM {model._meta.db_table} "
+                        f"WHERE {column} IN ({placeholders})",
+                        ids
+                    )
+        return len(ids)
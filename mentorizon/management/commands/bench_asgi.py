@@ -0,0 +1,125 @@
+import asyncio
+import itertools
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+DEFAULT_ROUTES = ("index", "meeting-list", "mentor-list", "sphere-list")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the read pages served by the WSGI handler "
+        "(a thread per concurrent request) and the ASGI handler (a task "
+        "per concurrent request). Requests are made in process against "
+        "the configured database, e.g. after generate_load."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument(
+            "--route",
+            action="append",
+            dest="routes",
+            help=(
+                "Route name to request, repeatable "
+                f"(default: {', '.join(DEFAULT_ROUTES)})."
+            ),
+        )
+        parser.add_argument(
+            "--username", help="User to log in as (default: the first one)."
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("id")
+        if options["username"]:
+            users = users.filter(username=options["username"])
+        self.user = users.first()
+        if self.user is None:
+            raise CommandError("No user to log in as.")
+        routes = options["routes"] or DEFAULT_ROUTES
+        self.urls = [reverse(f"mentorizon:{route}") for route in routes]
+        self.session_keys = []
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING(
+                "DEBUG is on, the debug toolbar skews the results."
+            ))
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                for label, client_class, run in (
+                    ("wsgi", Client, self.run_wsgi),
+                    ("asgi", AsyncClient, self.run_asgi),
+                ):
+                    clients = [
+                        self.login(client_class())
+                        for _ in range(options["concurrency"])
+                    ]
+                    start = time.perf_counter()
+                    results = run(clients, options["requests"])
+                    self.report(label, results, time.perf_counter() - start)
+        finally:
+            Session.objects.filter(session_key__in=self.session_keys).delete()
+
+    def login(self, client):
+        client.force_login(self.user)
+        self.session_keys.append(client.session.session_key)
+        return client
+
+    def run_wsgi(self, clients: list, requests: int) -> list:
+        idle = queue.SimpleQueue()
+        for client in clients:
+            idle.put(client)
+        urls = itertools.cycle(self.urls)
+
+        def request(url):
+            client = idle.get()
+            try:
+                start = time.perf_counter()
+                status = client.get(url).status_code
+                return status, time.perf_counter() - start
+            finally:
+                idle.put(client)
+
+        with ThreadPoolExecutor(len(clients)) as executor:
+            return list(executor.map(
+                request, (next(urls) for _ in range(requests))
+            ))
+
+    def run_asgi(self, clients: list, requests: int) -> list:
+        urls = itertools.cycle(self.urls)
+        remaining = itertools.count(requests, -1)
+        results = []
+
+        async def worker(client):
+            while next(remaining) > 0:
+                start = time.perf_counter()
+                response = await client.get(next(urls))
+                results.append(
+                    (response.status_code, time.perf_counter() - start)
+                )
+
+        async def run():
+            await asyncio.gather(*(worker(client) for client in clients))
+
+        asyncio.run(run())
+        return results
+
+    def report(self, label, results, elapsed) -> None:
+        timings = sorted(timing for _, timing in results)
+        errors = sum(1 for status, _ in results if status >= 400)
+        self.stdout.write(
+            f"{label}  {len(results) / elapsed:8.1f} req/s  "
+            f"median {timings[len(timings) // 2] * 1000:8.2f} ms  "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1000:8.2f} ms  "
+            f"errors {errors}"
+        )
@@ -0,0 +1,81 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import Meeting, MentorSession, Sphere
+from mentorizon.views import MeetingListView
+
+DUMMY_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare meeting list render time without a cache and with warm "
+        "card fragments. Generated rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, default=60)
+        parser.add_argument("--renders", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            sphere = Sphere.objects.create(name="Bench cards")
+            mentor = get_user_model().objects.create(
+                username="bench_cards_mentor",
+                first_name="Ivan",
+                last_name="Ivanenko",
+                mentor_sphere=sphere
+            )
+            viewer = get_user_model().objects.create(
+                username="bench_cards_viewer"
+            )
+            meetings = Meeting.objects.bulk_create(
+                Meeting(
+                    topic=f"Bench meeting {index}",
+                    date=timezone.now() + timezone.timedelta(days=1),
+                    description="Bench meeting description",
+                    limit_of_participants=10,
+                    available_places=10,
+                    link="https://example.com"
+                )
+                for index in range(options["cards"])
+            )
+            MentorSession.objects.bulk_create(
+                MentorSession(mentor=mentor, meeting=meeting)
+                for meeting in meetings
+            )
+            view = MeetingListView.as_view(paginate_by=options["cards"])
+            request = RequestFactory().get(reverse("mentorizon:meeting-list"))
+            request.user = viewer
+
+            def render():
+                return view(request).render()
+
+            with override_settings(CACHES=DUMMY_CACHE):
+                self.report("no cache", render, options["renders"])
+            cache.clear()
+            render()
+            self.report("warm cache", render, options["renders"])
+            transaction.set_rollback(True)
+
+    def report(self, label, render, renders):
+        timings = []
+        for _ in range(renders):
+            start = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        self.stdout.write(
+            f"{label:<11} "
+            f"median {timings[len(timings) // 2] * 1000:8.2f} ms  "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1000:8.2f} ms"
+        )
@@ -0,0 +1,105 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from mentorizon.recommendations import (
+    Interactions,
+    meeting_neighbours,
+    recommend,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the recommendation engine on generated interactions kept "
+        "in memory, without touching the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--mentors", type=int, default=2000)
+        parser.add_argument("--spheres", type=int, default=50)
+        parser.add_argument("--meetings", type=int, default=50_000)
+        parser.add_argument("--upcoming", type=int, default=5000)
+        parser.add_argument("--bookings-per-user", type=int, default=10)
+        parser.add_argument("--votes-per-user", type=int, default=2)
+        parser.add_argument("--top-k", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        generator = random.Random(options["seed"])
+        now = timezone.now()
+        users = range(1, options["users"] + 1)
+        mentors = generator.sample(users, options["mentors"])
+        meetings = range(1, options["meetings"] + 1)
+
+        start = time.perf_counter()
+        interactions = Interactions()
+        for mentor_id in mentors:
+            interactions.add_mentor(
+                mentor_id, generator.randrange(options["spheres"])
+            )
+        upcoming = options["meetings"] - options["upcoming"]
+        for meeting_id in meetings:
+            mentor_id = generator.choice(mentors)
+            if meeting_id > upcoming:
+                interactions.add_candidate(
+                    meeting_id,
+                    mentor_id,
+                    now + timezone.timedelta(minutes=meeting_id - upcoming)
+                )
+            else:
+                interactions.add_meeting(meeting_id, mentor_id)
+        # a few popular meetings take most bookings, like real ones
+        ranked = list(meetings)
+        generator.shuffle(ranked)
+        weights = self.popularity(len(ranked))
+        for user_id in users:
+            for meeting_id in generator.choices(
+                ranked, cum_weights=weights, k=options["bookings_per_user"]
+            ):
+                interactions.add_booking(user_id, meeting_id)
+            for _ in range(options["votes_per_user"]):
+                interactions.add_vote(
+                    user_id,
+                    generator.choice(mentors),
+                    generator.randint(1, 5)
+                )
+        interactions.finish()
+        self.stdout.write(
+            f"Generated {options['users']} users, {options['meetings']} "
+            f"meetings in {time.perf_counter() - start:.1f}s"
+        )
+
+        start = time.perf_counter()
+        neighbours = meeting_neighbours(interactions)
+        self.stdout.write(
+            f"Meeting similarities: {len(neighbours)} meetings "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+        start = time.perf_counter()
+        number_of_users = 0
+        number_of_recommendations = 0
+        for _, best in recommend(interactions, options["top_k"]):
+            number_of_users += 1
+            number_of_recommendations += len(best)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Recommendations: {number_of_recommendations} for "
+            f"{number_of_users} users in {elapsed:.1f}s "
+            f"({number_of_users / elapsed:,.0f} users/s, "
+            "similarities included)"
+        )
+
+    @staticmethod
+    def popularity(number_of_meetings):
+        """Cumulative weights of a Zipf-like distribution."""
+        weights = []
+        total = 0.0
+        for rank in range(1, number_of_meetings + 1):
+            total += 1 / rank
+            weights.append(total)
+        return weights
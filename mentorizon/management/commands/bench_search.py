@@ -0,0 +1,93 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from mentorizon.models import Meeting
+from mentorizon.search import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full-text search with substring (icontains) filtering "
+        "on generated meetings and mentors. Generated rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        generator = random.Random(options["seed"])
+        vocabulary = [
+            "".join(generator.choices("abcdefghijklmnoprstuvy", k=7))
+            for _ in range(2000)
+        ]
+        words = [
+            generator.choice(vocabulary) for _ in range(options["queries"])
+        ]
+
+        def text(number_of_words):
+            return " ".join(generator.choices(vocabulary, k=number_of_words))
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            Meeting.objects.bulk_create((
+                Meeting(
+                    topic=text(3),
+                    date=timezone.now() + timezone.timedelta(days=1),
+                    description=text(40),
+                    limit_of_participants=10,
+                    available_places=10,
+                    link="https://example.com"
+                )
+                for _ in range(options["rows"])
+            ), batch_size=2000)
+            get_user_model().objects.bulk_create((
+                get_user_model()(
+                    username=f"bench_search_{index}",
+                    first_name=text(1),
+                    last_name=text(1),
+                    experience_description=text(40),
+                )
+                for index in range(options["rows"])
+            ), batch_size=2000)
+            self.stdout.write(
+                f"Inserted {options['rows']} meetings and mentors "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+            self.report("meetings", Meeting.objects.all(), words, {
+                "icontains": lambda queryset, word: queryset.filter(
+                    topic__icontains=word
+                ).order_by("date"),
+                "fts": lambda queryset, word: search(
+                    queryset, word
+                ).order_by("search_rank", "date"),
+            })
+            self.report("mentors", get_user_model().objects.all(), words, {
+                "icontains": lambda queryset, word: queryset.filter(
+                    last_name__icontains=word
+                ).order_by("last_name"),
+                "fts": lambda queryset, word: search(
+                    queryset, word
+                ).order_by("search_rank", "last_name"),
+            })
+            transaction.set_rollback(True)
+
+    def report(self, label, queryset, words, strategies):
+        for name, apply in strategies.items():
+            timings = []
+            for word in words:
+                start = time.perf_counter()
+                list(apply(queryset, word)[:6])
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            self.stdout.write(
+                f"{label:<9} {name:<10} "
+                f"median {timings[len(timings) // 2] * 1000:8.2f} ms  "
+                f"p95 {timings[int(len(timings) * 0.95)] * 1000:8.2f} ms"
+            )
@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, OperationalError
+from django.utils import timezone
+
+from mentorizon.models import Meeting, Rating
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure throughput of concurrent writers against the configured "
+        "database, e.g. after generate_load: every thread books and "
+        "releases seats and rates mentors, one transaction per operation. "
+        "Failed operations (\"database is locked\") are counted, not "
+        "retried. Votes it casts are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--operations",
+            type=int,
+            default=500,
+            help="Operations per thread.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100,
+            help="Number of meetings and mentors written to.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        meeting_ids = list(Meeting.objects.filter(
+            date__gt=timezone.now(), available_places__gt=0
+        ).values_list("id", flat=True)[:options["rows"]])
+        rating_ids = list(
+            Rating.objects.values_list("id", flat=True)[:options["rows"]]
+        )
+        user_ids = list(get_user_model().objects.filter(
+            mentor_sphere__isnull=True
+        ).values_list("id", flat=True)[:options["threads"] * 10])
+        if not (meeting_ids and rating_ids and user_ids):
+            raise CommandError("Fill the database with generate_load first.")
+        rng = random.Random(options["seed"])
+        workloads = [
+            [
+                (
+                    rng.choice(("book", "vote")),
+                    rng.choice(meeting_ids),
+                    rng.choice(rating_ids),
+                    rng.choice(user_ids),
+                    rng.randint(1, 5),
+                )
+                for _ in range(options["operations"])
+            ]
+            for _ in range(options["threads"])
+        ]
+        counts = {"writes": 0, "failed": 0}
+        lock = threading.Lock()
+
+        def run(workload):
+            writes = failed = 0
+            try:
+                for operation, meeting_id, rating_id, user_id, rate in (
+                    workload
+                ):
+                    try:
+                        if operation == "book":
+                            meeting = Meeting(pk=meeting_id)
+                            if meeting.book(user_id):
+                                meeting.unbook(user_id)
+                                writes += 1
+                        else:
+                            Rating(pk=rating_id).vote(user_id, rate)
+                        writes += 1
+                    except OperationalError:
+                        failed += 1
+            finally:
+                connection.close()
+            with lock:
+                counts["writes"] += writes
+                counts["failed"] += failed
+
+        threads = [
+            threading.Thread(target=run, args=(workload,))
+            for workload in workloads
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{connection.vendor}  {counts['writes'] / elapsed:8.1f} "
+            f"transactions/s  failed {counts['failed']}"
+        )
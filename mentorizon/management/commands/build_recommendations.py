@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from mentorizon.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Score the upcoming meetings for every user from bookings, "
+        "attendances and votes and store the best of them. "
+        "Recommendations are not updated as users book; run this "
+        "periodically (e.g. nightly)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=None,
+            help="Recommendations per user "
+                 "(default: RECOMMENDATIONS_PER_USER)."
+        )
+
+    def handle(self, *args, **options):
+        number_of_users = build_recommendations(options["top_k"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored recommendations for {number_of_users} user(s)."
+        ))
@@ -0,0 +1,258 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from mentorizon.caching import (
+    DASHBOARD_COUNTERS,
+    invalidate_dashboard_counters,
+)
+from mentorizon.models import (
+    average_rating,
+    Meeting,
+    MentorSession,
+    Rating,
+    RatingVote,
+    Sphere,
+)
+from mentorizon.spherestats import rebuild_sphere_stats
+
+FIRST_NAMES = (
+    "Ivan", "Olena", "Petro", "Iryna", "Andrii", "Oksana", "Taras", "Mariia",
+    "Dmytro", "Nataliia", "Serhii", "Yuliia", "Oleh", "Sofiia", "Maksym",
+)
+LAST_NAMES = (
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko",
+    "Oliinyk", "Shevchuk", "Polishchuk", "Lysenko", "Melnyk", "Boiko",
+    "Marchenko", "Rudenko", "Savchenko", "Moroz", "Petrenko", "Ivanenko",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset of spheres, mentors, users, meetings, "
+        "participants and rating votes with batched bulk inserts. "
+        "Stored rating aggregates, available places and sphere stats "
+        "stay consistent."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--spheres", type=int, default=20)
+        parser.add_argument("--mentors", type=int, default=1000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1000,
+            help="Number of users without a mentor sphere.",
+        )
+        parser.add_argument("--meetings", type=int, default=10_000)
+        parser.add_argument("--votes", type=int, default=10_000)
+        parser.add_argument(
+            "--max-participants",
+            type=int,
+            default=20,
+            help="Upper bound of the participants limit of a meeting.",
+        )
+        parser.add_argument(
+            "--past-days",
+            type=int,
+            default=30,
+            help="Meeting dates are spread from this many days ago...",
+        )
+        parser.add_argument(
+            "--future-days",
+            type=int,
+            default=90,
+            help="...to this many days ahead.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--prefix",
+            default="load",
+            help="Prefix of generated usernames and sphere names.",
+        )
+        parser.add_argument(
+            "--password",
+            default="load12345",
+            help="Password of every generated user.",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.generator = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        prefix = options["prefix"]
+        if options["mentors"] and not options["spheres"]:
+            raise CommandError("Mentors need at least one sphere.")
+        if options["meetings"] and not options["mentors"]:
+            raise CommandError("Meetings need at least one mentor.")
+        if get_user_model().objects.filter(
+            username__startswith=f"{prefix}_"
+        ).exists():
+            raise CommandError(
+                f"Users prefixed with '{prefix}_' already exist, "
+                "choose another --prefix."
+            )
+
+        with transaction.atomic():
+            spheres = self.stage("spheres", self.create_spheres)
+            mentor_ids, user_ids = self.stage(
+                "users", self.create_users, spheres
+            )
+            all_ids = mentor_ids + user_ids
+            self.stage(
+                "ratings and votes", self.create_ratings, mentor_ids, all_ids
+            )
+            self.stage(
+                "meetings", self.create_meetings, mentor_ids, all_ids
+            )
+            self.stage("sphere stats", rebuild_sphere_stats)
+        invalidate_dashboard_counters(*DASHBOARD_COUNTERS)
+
+    def stage(self, label, create, *args):
+        start = time.perf_counter()
+        result = create(*args)
+        self.stdout.write(
+            f"Created {label} in {time.perf_counter() - start:.1f}s"
+        )
+        return result
+
+    def create_spheres(self) -> list:
+        return Sphere.objects.bulk_create(
+            Sphere(
+                name=f"{self.options['prefix']} sphere {index}".capitalize()
+            )
+            for index in range(self.options["spheres"])
+        )
+
+    def create_users(self, spheres: list) -> tuple:
+        password = make_password(self.options["password"])
+        prefix = self.options["prefix"]
+        mentors = self.options["mentors"]
+        users = get_user_model().objects.bulk_create((
+            get_user_model()(
+                username=f"{prefix}_{index}",
+                password=password,
+                first_name=self.generator.choice(FIRST_NAMES),
+                last_name=self.generator.choice(LAST_NAMES),
+                email=f"{prefix}_{index}@example.com",
+                mentor_sphere=(
+                    spheres[index % len(spheres)] if index < mentors else None
+                ),
+                experience_description=(
+                    f"{self.generator.randint(1, 20)} years of experience"
+                    if index < mentors else ""
+                ),
+            )
+            for index in range(mentors + self.options["users"])
+        ), batch_size=self.batch_size)
+        ids = [user.id for user in users]
+        return ids[:mentors], ids[mentors:]
+
+    def create_ratings(self, mentor_ids: list, user_ids: list) -> None:
+        """Create the rating of every user together with the votes
+        for mentors, storing aggregates computed while generating."""
+        votes = self.options["votes"]
+        mentor_positions = {
+            mentor_id: position
+            for position, mentor_id in enumerate(mentor_ids)
+        }
+        ratings, rating_votes = [], []
+        for user_id in user_ids:
+            rating = Rating(mentor_id=user_id)
+            position = mentor_positions.get(user_id)
+            if position is not None:
+                number_of_votes = min(
+                    votes // len(mentor_ids)
+                    + (position < votes % len(mentor_ids)),
+                    len(user_ids) - 1
+                )
+                voters = self.generator.sample(
+                    user_ids, min(number_of_votes + 1, len(user_ids))
+                )
+                voters = [voter for voter in voters if voter != user_id]
+                for voter_id in voters[:number_of_votes]:
+                    rate = self.generator.randint(0, 5)
+                    rating.votes_count += 1
+                    rating.votes_sum += rate
+                    rating_votes.append(RatingVote(
+                        rating=rating, voter_id=voter_id, rate=rate
+                    ))
+            ratings.append(rating)
+            if (
+                len(ratings) >= self.batch_size
+                or len(rating_votes) >= self.batch_size
+            ):
+                self.flush_ratings(ratings, rating_votes)
+                ratings, rating_votes = [], []
+        self.flush_ratings(ratings, rating_votes)
+        Rating.objects.filter(
+            mentor__username__startswith=f"{self.options['prefix']}_",
+            votes_count__gt=0,
+        ).update(average=average_rating(F("votes_sum"), F("votes_count")))
+
+    def flush_ratings(self, ratings: list, rating_votes: list) -> None:
+        Rating.objects.bulk_create(ratings, batch_size=self.batch_size)
+        RatingVote.objects.bulk_create(
+            rating_votes, batch_size=self.batch_size
+        )
+
+    def create_meetings(self, mentor_ids: list, user_ids: list) -> None:
+        now = timezone.now()
+        start = now - timezone.timedelta(days=self.options["past_days"])
+        span = (
+            self.options["past_days"] + self.options["future_days"]
+        ) * 24 * 60
+        meetings, sessions, participants = [], [], []
+        for index in range(self.options["meetings"]):
+            mentor_id = self.generator.choice(mentor_ids)
+            limit = self.generator.randint(
+                1, max(1, self.options["max_participants"])
+            )
+            meeting_participants = [
+                user_id for user_id in self.generator.sample(
+                    user_ids,
+                    min(self.generator.randint(0, limit), len(user_ids))
+                )
+                if user_id != mentor_id
+            ]
+            meeting = Meeting(
+                topic=f"Meeting {index} of {self.options['prefix']}",
+                date=start + timezone.timedelta(
+                    minutes=self.generator.randrange(max(1, span))
+                ),
+                description="Generated meeting",
+                limit_of_participants=limit,
+                available_places=limit - len(meeting_participants),
+                link="https://example.com",
+            )
+            meetings.append(meeting)
+            sessions.append(
+                MentorSession(mentor_id=mentor_id, meeting=meeting)
+            )
+            participants.extend(
+                Meeting.participants.through(meeting=meeting, user_id=user_id)
+                for user_id in meeting_participants
+            )
+            if (
+                len(meetings) >= self.batch_size
+                or len(participants) >= self.batch_size
+            ):
+                self.flush_meetings(meetings, sessions, participants)
+                meetings, sessions, participants = [], [], []
+        self.flush_meetings(meetings, sessions, participants)
+
+    def flush_meetings(
+        self, meetings: list, sessions: list, participants: list
+    ) -> None:
+        Meeting.objects.bulk_create(meetings, batch_size=self.batch_size)
+        MentorSession.objects.bulk_create(sessions, batch_size=self.batch_size)
+        Meeting.participants.through.objects.bulk_create(
+            participants, batch_size=self.batch_size
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from mentorizon.leaderboard import rebuild_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the sphere priors and the leaderboard ranking of every "
+        "mentor. Votes update rankings as they are cast; run this "
+        "periodically (e.g. nightly) so the priors follow the votes."
+    )
+
+    def handle(self, *args, **options):
+        number_of_rankings = rebuild_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Ranked {number_of_rankings} mentor(s).")
+        )
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from mentorizon.leaderboard import rebuild_rankings
+from mentorizon.models import average_rating, Rating
+from mentorizon.spherestats import rebuild_sphere_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild stored rating aggregates (votes count, votes sum, average) "
+        "from rating votes and report drift. The sphere stats and the "
+        "leaderboard, built from the aggregates, are rebuilt after a fix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, exit with an error if any is found.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = self.find_drift()
+            for rating in drifted:
+                self.stdout.write(
+                    f"Drift in rating {rating.id}: "
+                    f"count {rating.votes_count} -> {rating.actual_count}, "
+                    f"sum {rating.votes_sum} -> {rating.actual_sum}, "
+                    f"average {rating.average} -> {rating.actual_average}"
+                )
+            if options["check"]:
+                if drifted:
+                    raise CommandError(
+                        f"{len(drifted)} rating(s) drifted from their votes."
+                    )
+                self.stdout.write(self.style.SUCCESS("No drift found."))
+                return
+            now = timezone.now()
+            for rating in drifted:
+                rating.votes_count = rating.actual_count
+                rating.votes_sum = rating.actual_sum
+                rating.average = rating.actual_average
+                rating.updated_at = now
+            Rating.objects.bulk_update(
+                drifted,
+                ["votes_count", "votes_sum", "average", "updated_at"],
+                batch_size=500
+            )
+        if drifted:
+            rebuild_sphere_stats()
+            rebuild_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(drifted)} rating(s).")
+        )
+
+    @staticmethod
+    def find_drift() -> list:
+        ratings = Rating.objects.annotate(
+            actual_count=Count("rating_votes"),
+            actual_sum=Coalesce(Sum("rating_votes__rate"), 0),
+        ).annotate(
+            actual_average=average_rating(
+                F("actual_sum"), F("actual_count")
+            )
+        ).order_by("id")
+        return [
+            rating for rating in ratings.iterator(chunk_size=2000)
+            if (rating.votes_count, rating.votes_sum, rating.average)
+            != (rating.actual_count, rating.actual_sum, rating.actual_average)
+        ]
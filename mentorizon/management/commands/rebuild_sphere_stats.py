@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from mentorizon.spherestats import rebuild_sphere_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the mentors, upcoming meetings and rating aggregates of "
+        "every sphere. Changes update the counters as they happen; run "
+        "this periodically (e.g. hourly) to drop meetings that started."
+    )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_sphere_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt stats of {rebuilt} sphere(s).")
+        )
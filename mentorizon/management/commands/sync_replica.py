@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate replication for local testing: copy the primary SQLite "
+        "database into the replica with the SQLite backup API. "
+        "Run it whenever the replica should catch up."
+    )
+
+    def handle(self, *args, **options):
+        replica = getattr(settings, "REPLICA_DATABASE", None)
+        if replica is None:
+            raise CommandError(
+                "No replica configured, set DB_REPLICA_NAME."
+            )
+        source = connections[DEFAULT_DB_ALIAS]
+        target = connections[replica]
+        if source.vendor != "sqlite" or target.vendor != "sqlite":
+            raise CommandError(
+                "Only SQLite replicas are copied, use the replication "
+                "of the database server otherwise."
+            )
+        if source.settings_dict["NAME"] == target.settings_dict["NAME"]:
+            raise CommandError("The replica is the primary database file.")
+        source.ensure_connection()
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+        self.stdout.write(
+            f"Copied {source.settings_dict['NAME']} "
+            f"to {target.settings_dict['NAME']}."
+        )
@@ -0,0 +1,268 @@
+"""Per view request metrics in the Prometheus text format.
+
+MetricsMiddleware times every request and labels it with the URL name
+of its view. SQL statements are counted and timed by record_query(),
+an execute wrapper installed on every database connection, and the
+rendering of template responses is timed by a post-render callback.
+
+Every process keeps its samples in memory. With settings.METRICS_DIR
+set, each process also writes them to its own file in that directory,
+at most every METRICS_FLUSH_SECONDS, and metrics_view() sums the files
+of all processes, so any worker can answer a scrape. Histograms are
+stored as cumulative bucket counters, so every sample is a counter and
+summing is exact. Files of stopped processes are kept so that totals
+never go backwards; empty the directory when deploying.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+PREFIX = "mentorizon_"
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000)
+
+# name: (type, help)
+METRICS = {
+    "requests_total": ("counter", "Requests by view, method and status."),
+    "request_duration_seconds": ("histogram", "Request latency by view."),
+    "request_db_queries": ("histogram", "SQL queries per request by view."),
+    "request_db_seconds_total": (
+        "counter", "Time spent in SQL queries by view."
+    ),
+    "response_size_bytes": ("histogram", "Response body size by view."),
+    "template_render_seconds_total": (
+        "counter", "Time spent rendering template responses by view."
+    ),
+}
+
+
+class RequestMetrics:
+    """Measurements of the request being served."""
+
+    def __init__(self, request, task) -> None:
+        self.request = request
+        # the asyncio task serving the request, None for sync requests
+        self.task = task
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper counting and timing the queries of a request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - start
+
+
+def install_query_recorder(connection) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _format_number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class MetricsStore:
+    """Samples of this process keyed by (name, suffix, labels)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._samples = defaultdict(float)
+        self._file_name = f"{self._pid}-{uuid.uuid4().hex}.json"
+        self._flushed_at = 0.0
+
+    def _check_fork(self) -> None:
+        # a forked worker starts empty instead of repeating the
+        # samples its parent counted
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def inc(self, name: str, labels: tuple, amount=1) -> None:
+        with self._lock:
+            self._check_fork()
+            self._samples[name, "", labels] += amount
+
+    def observe(
+        self, name: str, labels: tuple, value, buckets: tuple
+    ) -> None:
+        with self._lock:
+            self._check_fork()
+            for bound in (*buckets, float("inf")):
+                self._samples[
+                    name, "_bucket", (*labels, ("le", bound))
+                ] += value <= bound
+            self._samples[name, "_sum", labels] += value
+            self._samples[name, "_count", labels] += 1
+
+    def flush(self, force: bool = False) -> None:
+        """Write the samples to this process's file in METRICS_DIR."""
+        directory = getattr(settings, "METRICS_DIR", None)
+        if not directory:
+            return
+        now = time.monotonic()
+        interval = getattr(settings, "METRICS_FLUSH_SECONDS", 5)
+        with self._lock:
+            self._check_fork()
+            if not force and now - self._flushed_at < interval:
+                return
+            self._flushed_at = now
+            rows = [
+                [name, suffix, labels, value]
+                for (name, suffix, labels), value in self._samples.items()
+            ]
+            path = Path(directory) / self._file_name
+        temporary = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(rows))
+        os.replace(temporary, path)
+
+    def collect(self) -> dict:
+        """Samples of all processes: the METRICS_DIR files, this
+        process's one freshly written, or only this process."""
+        directory = getattr(settings, "METRICS_DIR", None)
+        if not directory:
+            with self._lock:
+                return dict(self._samples)
+        self.flush(force=True)
+        samples = defaultdict(float)
+        for path in Path(directory).glob("*.json"):
+            try:
+                rows = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, suffix, labels, value in rows:
+                samples[
+                    name, suffix, tuple(tuple(label) for label in labels)
+                ] += value
+        return samples
+
+
+store = MetricsStore()
+
+
+def _format_labels(labels: tuple) -> str:
+    def escape(value) -> str:
+        if not isinstance(value, str):
+            return _format_number(value)
+        return value.replace("\\", r"\\").replace('"', r"\"").replace(
+            "\n", r"\n"
+        )
+    return "{" + ",".join(
+        f'{name}="{escape(value)}"' for name, value in labels
+    ) + "}"
+
+
+def render(samples: dict) -> str:
+    """Samples in the Prometheus text exposition format."""
+    by_name = defaultdict(list)
+    # le bounds are numbers, so buckets sort in numeric order
+    for key in sorted(samples):
+        by_name[key[0]].append(key)
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for key in by_name[name]:
+            _, suffix, labels = key
+            lines.append(
+                f"{PREFIX}{name}{suffix}{_format_labels(labels)} "
+                f"{_format_number(samples[key])}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def view_name(request) -> str:
+    match = request.resolver_match
+    return match.view_name if match is not None else "<unresolved>"
+
+
+def current_request() -> RequestMetrics:
+    """Measurements of the request being served, None outside of a
+    request."""
+    return _current.get()
+
+
+def begin_request(request, task=None) -> contextvars.Token:
+    return _current.set(RequestMetrics(request, task))
+
+
+def end_request(token, request, response, elapsed: float) -> None:
+    metrics = _current.get()
+    _current.reset(token)
+    labels = (("view", view_name(request)),)
+    store.inc("requests_total", (
+        *labels,
+        ("method", request.method),
+        ("status", str(response.status_code)),
+    ))
+    store.observe(
+        "request_duration_seconds", labels, elapsed, DURATION_BUCKETS
+    )
+    store.observe(
+        "request_db_queries", labels, metrics.queries, QUERY_BUCKETS
+    )
+    store.inc("request_db_seconds_total", labels, metrics.db_seconds)
+    if not response.streaming:
+        store.observe(
+            "response_size_bytes", labels, len(response.content),
+            SIZE_BUCKETS
+        )
+    if metrics.template_seconds:
+        store.inc(
+            "template_render_seconds_total", labels,
+            metrics.template_seconds
+        )
+    store.flush()
+
+
+def time_template_response(response):
+    """Time the rendering of a template response."""
+    metrics = _current.get()
+    if metrics is not None:
+        start = time.perf_counter()
+
+        def rendered(response):
+            metrics.template_seconds += time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+    return response
+
+
+def metrics_view(request):
+    """Metrics of all worker processes, for addresses listed in
+    METRICS_ALLOWED_IPS only."""
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(
+        render(store.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from asyncio import iscoroutinefunction
+
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.deprecation import MiddlewareMixin
+
+from mentorizon import metrics
+from mentorizon.routers import begin_request, end_request
+
+PIN_COOKIE_NAME = "pin_primary"
+
+
+def _pin(response, state) -> None:
+    if state.written:
+        response.set_cookie(
+            PIN_COOKIE_NAME,
+            "1",
+            max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+            httponly=True,
+            samesite="Lax",
+        )
+
+
+@sync_and_async_middleware
+def replica_pinning_middleware(get_response):
+    """Route the reads of a request through PrimaryReplicaRouter: to the
+    primary while the pin cookie set after a write is alive, else to
+    the replica."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = begin_request(PIN_COOKIE_NAME in request.COOKIES)
+            try:
+                response = await get_response(request)
+            finally:
+                state = end_request(token)
+            _pin(response, state)
+            return response
+    else:
+        def middleware(request):
+            token = begin_request(PIN_COOKIE_NAME in request.COOKIES)
+            try:
+                response = get_response(request)
+            finally:
+                state = end_request(token)
+            _pin(response, state)
+            return response
+    return middleware
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """Record the metrics of mentorizon.metrics for every request."""
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        token = metrics.begin_request(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        metrics.end_request(
+            token, request, response, time.perf_counter() - start
+        )
+        return response
+
+    async def _acall(self, request):
+        token = metrics.begin_request(request, asyncio.current_task())
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        metrics.end_request(
+            token, request, response, time.perf_counter() - start
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        return metrics.time_template_response(response)
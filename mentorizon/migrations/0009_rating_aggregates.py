@@ -0,0 +1,46 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:53
+
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf, Round
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    Rating = apps.get_model("mentorizon", "Rating")
+    ratings = Rating.objects.annotate(
+        actual_count=Count("rating_votes"), actual_sum=Sum("rating_votes__rate")
+    ).filter(actual_count__gt=0)
+    for rating in ratings.iterator():
+        rating.votes_count = rating.actual_count
+        rating.votes_sum = rating.actual_sum
+        rating.save(update_fields=["votes_count", "votes_sum"])
+    Rating.objects.update(
+        average=Round(
+            Cast(F("votes_sum"), FloatField()) / NullIf(F("votes_count"), 0), 1
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0008_ratingvote_vote_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rating",
+            name="average",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="rating",
+            name="votes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="rating",
+            name="votes_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+    ]
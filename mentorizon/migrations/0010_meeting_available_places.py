@@ -0,0 +1,29 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:54
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_available_places(apps, schema_editor):
+    Meeting = apps.get_model("mentorizon", "Meeting")
+    meetings = Meeting.objects.annotate(num_participants=Count("participants"))
+    for meeting in meetings.iterator():
+        meeting.available_places = max(
+            meeting.limit_of_participants - meeting.num_participants, 0
+        )
+        meeting.save(update_fields=["available_places"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0009_rating_aggregates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="available_places",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_available_places, migrations.RunPython.noop),
+    ]
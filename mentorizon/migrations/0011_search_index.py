@@ -0,0 +1,99 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import mentorizon.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0010_meeting_available_places"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingSearchIndex",
+            fields=[
+                ("rank", models.FloatField()),
+                (
+                    "meeting",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="mentorizon.meeting",
+                    ),
+                ),
+                (
+                    "document",
+                    mentorizon.models.SearchDocumentField(
+                        db_column="mentorizon_meeting_fts"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "mentorizon_meeting_fts",
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="MentorSearchIndex",
+            fields=[
+                ("rank", models.FloatField()),
+                (
+                    "mentor",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "document",
+                    mentorizon.models.SearchDocumentField(
+                        db_column="mentorizon_user_fts"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "mentorizon_user_fts",
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="SphereSearchIndex",
+            fields=[
+                ("rank", models.FloatField()),
+                (
+                    "sphere",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="mentorizon.sphere",
+                    ),
+                ),
+                (
+                    "document",
+                    mentorizon.models.SearchDocumentField(
+                        db_column="mentorizon_sphere_fts"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "mentorizon_sphere_fts",
+                "abstract": False,
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0011_search_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="mentor_sphere",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="users",
+                to="mentorizon.sphere",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(fields=["date", "id"], name="meeting_date_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="sphere",
+            index=models.Index(fields=["name", "id"], name="sphere_name_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("mentor_sphere__isnull", False)),
+                fields=["last_name", "id"],
+                name="mentor_last_name_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["mentor_sphere", "last_name", "id"],
+                name="mentor_sphere_last_name_id_idx",
+            ),
+        ),
+    ]
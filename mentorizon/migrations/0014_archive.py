@@ -0,0 +1,81 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0013_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedMeeting",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("topic", models.CharField(max_length=150)),
+                ("date", models.DateTimeField()),
+                ("description", models.TextField()),
+                ("limit_of_participants", models.PositiveIntegerField()),
+                ("participants_count", models.PositiveIntegerField(default=0)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "mentor",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_mentor_meetings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedAttendance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendances",
+                        to="mentorizon.archivedmeeting",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_attendances",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedmeeting",
+            index=models.Index(
+                fields=["date", "id"], name="archived_meeting_date_id_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="archivedattendance",
+            constraint=models.UniqueConstraint(
+                fields=("user", "meeting"), name="archived_attendance_unique"
+            ),
+        ),
+    ]
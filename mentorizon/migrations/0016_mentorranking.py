@@ -0,0 +1,93 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:09
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def fill_rankings(apps, schema_editor):
+    Rating = apps.get_model("mentorizon", "Rating")
+    MentorRanking = apps.get_model("mentorizon", "MentorRanking")
+    ratings = Rating.objects.filter(mentor__mentor_sphere__isnull=False)
+    priors = {
+        row["mentor__mentor_sphere_id"]: (
+            row["votes_sum"] / row["votes_count"] if row["votes_count"] else 2.5
+        )
+        for row in ratings.values("mentor__mentor_sphere_id")
+        .annotate(votes_sum=Sum("votes_sum"), votes_count=Sum("votes_count"))
+        .order_by()
+    }
+    weight = settings.LEADERBOARD_PRIOR_VOTES
+    MentorRanking.objects.bulk_create(
+        [
+            MentorRanking(
+                mentor_id=mentor_id,
+                sphere_id=sphere_id,
+                votes_count=votes_count,
+                average=average,
+                score=(weight * priors[sphere_id] + votes_sum) / (weight + votes_count),
+            )
+            for mentor_id, sphere_id, votes_sum, votes_count, average in (
+                ratings.values_list(
+                    "mentor_id",
+                    "mentor__mentor_sphere_id",
+                    "votes_sum",
+                    "votes_count",
+                    "average",
+                ).iterator()
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0015_waitlist"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MentorRanking",
+            fields=[
+                (
+                    "mentor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="ranking",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("votes_count", models.PositiveIntegerField(default=0)),
+                ("average", models.FloatField(blank=True, null=True)),
+                ("score", models.FloatField()),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+                (
+                    "sphere",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rankings",
+                        to="mentorizon.sphere",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-score", "mentor"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="mentorranking",
+            index=models.Index(fields=["-score", "mentor"], name="ranking_score_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mentorranking",
+            index=models.Index(
+                fields=["sphere", "-score", "mentor"], name="ranking_sphere_score_idx"
+            ),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:15
+
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf, Round
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_sphere_stats(apps, schema_editor):
+    Sphere = apps.get_model("mentorizon", "Sphere")
+    SphereStats = apps.get_model("mentorizon", "SphereStats")
+    spheres = Sphere.objects.annotate(
+        mentors_count=Count("users", distinct=True),
+        votes_count=Sum("users__rating__votes_count"),
+        votes_sum=Sum("users__rating__votes_sum"),
+    )
+    meetings = dict(
+        Sphere.objects.filter(users__mentor_sessions__meeting__date__gt=timezone.now())
+        .annotate(count=Count("users__mentor_sessions"))
+        .values_list("id", "count")
+    )
+    SphereStats.objects.bulk_create(
+        [
+            SphereStats(
+                sphere_id=sphere.id,
+                mentors_count=sphere.mentors_count,
+                upcoming_meetings_count=meetings.get(sphere.id, 0),
+                votes_count=sphere.votes_count or 0,
+                votes_sum=sphere.votes_sum or 0,
+            )
+            for sphere in spheres.iterator()
+        ],
+        batch_size=1000,
+    )
+    SphereStats.objects.update(
+        average_rating=Round(
+            Cast(F("votes_sum"), FloatField()) / NullIf(F("votes_count"), 0), 1
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0016_mentorranking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SphereStats",
+            fields=[
+                (
+                    "sphere",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="mentorizon.sphere",
+                    ),
+                ),
+                ("mentors_count", models.PositiveIntegerField(default=0)),
+                ("upcoming_meetings_count", models.PositiveIntegerField(default=0)),
+                ("votes_count", models.PositiveIntegerField(default=0)),
+                ("votes_sum", models.PositiveIntegerField(default=0)),
+                ("average_rating", models.FloatField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                "verbose_name_plural": "sphere stats",
+            },
+        ),
+        migrations.RunPython(fill_sphere_stats, migrations.RunPython.noop),
+    ]
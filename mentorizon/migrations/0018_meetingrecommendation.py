@@ -0,0 +1,63 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mentorizon", "0017_spherestats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeetingRecommendation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommendations",
+                        to="mentorizon.meeting",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="meeting_recommendations",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["user", "-score"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="meetingrecommendation",
+            index=models.Index(
+                fields=["user", "-score", "meeting"],
+                name="recommendation_user_score_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="meetingrecommendation",
+            constraint=models.UniqueConstraint(
+                fields=("user", "meeting"), name="recommendation_unique"
+            ),
+        ),
+    ]
@@ -1,17 +1,23 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models.functions import Lower
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, F, FloatField, OuterRef
+from django.db.models.functions import Cast, Lower, NullIf, Round
+from django.dispatch import Signal
 from django.urls import reverse
 from django.utils import timezone
 
 
 class Sphere(models.Model):
     name = models.CharField(max_length=150)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name", "id"], name="sphere_name_id_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 Lower("name"),
@@ -35,12 +41,28 @@ class User(AbstractUser):
         on_delete=models.PROTECT,
         null=True,
         blank=True,
-        related_name="users"
+        related_name="users",
+        # covered by mentor_sphere_last_name_id_idx
+        db_index=False
     )
     experience_description = models.TextField(null=True, blank=True)
     years_of_experience = models.PositiveIntegerField(default=0)
     first_name = models.CharField(max_length=150, blank=False)
     last_name = models.CharField(max_length=150, blank=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=["last_name", "id"],
+                condition=models.Q(mentor_sphere__isnull=False),
+                name="mentor_last_name_id_idx",
+            ),
+            models.Index(
+                fields=["mentor_sphere", "last_name", "id"],
+                name="mentor_sphere_last_name_id_idx",
+            ),
+        ]
 
     def get_absolute_url(self):
         return reverse("mentorizon:user-detail", kwargs={"pk": self.pk})
@@ -52,7 +74,28 @@ class User(AbstractUser):
             Rating.objects.create(mentor=self)
 
 
-class MeetingManager(models.Manager):
+class MeetingQuerySet(models.QuerySet):
+    def with_booking_state(self, user):
+        """Annotate whether the given user participates in each meeting
+        and how many participants it has, without loading participants."""
+        return self.annotate(
+            is_participant=Exists(
+                Meeting.participants.through.objects.filter(
+                    meeting_id=OuterRef("pk"), user_id=user.id
+                )
+            ),
+            is_waiting=Exists(
+                WaitlistEntry.objects.filter(
+                    meeting_id=OuterRef("pk"), user_id=user.id
+                )
+            ),
+            participant_count=(
+                F("limit_of_participants") - F("available_places")
+            )
+        )
+
+
+class MeetingManager(models.Manager.from_queryset(MeetingQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(date__gt=timezone.now())
 
@@ -65,11 +108,16 @@ class Meeting(models.Model):
         settings.AUTH_USER_MODEL, related_name="meetings"
     )
     limit_of_participants = models.PositiveIntegerField()
+    available_places = models.PositiveIntegerField(default=0)
     link = models.URLField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     objects = MeetingManager()
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["date", "id"], name="meeting_date_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.topic} ({self.date})"
@@ -77,6 +125,170 @@ class Meeting(models.Model):
     def get_absolute_url(self):
         return reverse("mentorizon:meeting-detail", kwargs={"pk": self.pk})
 
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            self.available_places = self.limit_of_participants
+        return super().save(*args, **kwargs)
+
+    def book(self, user_id: int) -> bool:
+        """Reserve a seat with a single conditional update of the seat
+        counter. Returns False if the meeting is full, already past
+        or the user is already a participant."""
+        try:
+            with transaction.atomic():
+                reserved = Meeting.objects.filter(
+                    pk=self.pk, available_places__gt=0
+                ).update(
+                    available_places=F("available_places") - 1,
+                    updated_at=timezone.now()
+                )
+                if reserved:
+                    Meeting.participants.through.objects.create(
+                        meeting_id=self.pk, user_id=user_id
+                    )
+                    self.waitlist.filter(user_id=user_id).delete()
+        except IntegrityError:
+            return False
+        return bool(reserved)
+
+    def unbook(self, user_id: int) -> bool:
+        """Release the user's seat to the head of the waitlist, or to
+        anyone if nobody waits. Returns False if the user is not
+        a participant."""
+        with transaction.atomic():
+            removed, _ = Meeting.participants.through.objects.filter(
+                meeting_id=self.pk, user_id=user_id
+            ).delete()
+            if removed:
+                Meeting._base_manager.filter(pk=self.pk).update(
+                    available_places=F("available_places") + 1,
+                    updated_at=timezone.now()
+                )
+                self.promote_waitlist()
+        return bool(removed)
+
+    def change_limit(self, limit: int) -> bool:
+        """Change the limit of participants and the seat counter with
+        it in a single conditional update, giving new seats to the
+        waitlist. Returns False if the meeting has more participants
+        than the new limit."""
+        with transaction.atomic():
+            changed = Meeting._base_manager.filter(
+                pk=self.pk,
+                available_places__gte=F("limit_of_participants") - limit
+            ).update(
+                limit_of_participants=limit,
+                available_places=(
+                    F("available_places") + limit
+                    - F("limit_of_participants")
+                ),
+                updated_at=timezone.now()
+            )
+            if changed:
+                self.promote_waitlist()
+        return bool(changed)
+
+    def join_waitlist(self, user_id: int) -> bool:
+        """Queue the user for a seat of a full upcoming meeting.
+        Returns False if the meeting has free places or is past, or
+        the user is a participant or already waiting.
+
+        The transaction starts by writing the meeting row, so it queues
+        behind a concurrent unbook() and either sees the free seat or
+        is seen by the promotion."""
+        try:
+            with transaction.atomic():
+                full = Meeting.objects.filter(
+                    pk=self.pk, available_places=0
+                ).exclude(participants=user_id).update(
+                    updated_at=timezone.now()
+                )
+                if full:
+                    WaitlistEntry.objects.create(
+                        meeting_id=self.pk, user_id=user_id
+                    )
+        except IntegrityError:
+            return False
+        return bool(full)
+
+    def leave_waitlist(self, user_id: int) -> bool:
+        """Drop the user from the waitlist. The meeting is touched, so
+        the pages of the users behind them revalidate their position."""
+        with transaction.atomic():
+            removed, _ = self.waitlist.filter(user_id=user_id).delete()
+            if removed:
+                Meeting._base_manager.filter(pk=self.pk).update(
+                    updated_at=timezone.now()
+                )
+        return bool(removed)
+
+    def promote_waitlist(self) -> list:
+        """Give free seats to the head of the waitlist in the current
+        transaction and return the ids of the promoted users.
+
+        Every seat is reserved before the head is read, so concurrent
+        promotions queue on the meeting row and never promote the same
+        user twice."""
+        promoted = []
+        with transaction.atomic(savepoint=False):
+            while True:
+                reserved = Meeting.objects.filter(
+                    pk=self.pk, available_places__gt=0,
+                    waitlist__isnull=False
+                ).update(
+                    available_places=F("available_places") - 1,
+                    updated_at=timezone.now()
+                )
+                if not reserved:
+                    break
+                head = self.waitlist.order_by("id").first()
+                if head is None:
+                    Meeting._base_manager.filter(pk=self.pk).update(
+                        available_places=F("available_places") + 1
+                    )
+                    break
+                WaitlistEntry.objects.filter(pk=head.pk).delete()
+                Meeting.participants.through.objects.create(
+                    meeting_id=self.pk, user_id=head.user_id
+                )
+                promoted.append(head.user_id)
+        return promoted
+
+
+class WaitlistEntry(models.Model):
+    """Place of a user in the queue for a seat of a full meeting.
+    The queue is ordered by id."""
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+        # covered by waitlist_meeting_id_idx
+        db_index=False
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["meeting", "id"], name="waitlist_meeting_id_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["meeting", "user"],
+                name="waitlist_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} waiting for {self.meeting_id}"
+
 
 class MentorSessionManager(models.Manager):
     def get_queryset(self):
@@ -105,16 +317,122 @@ class MentorSession(models.Model):
         )
 
 
+class ArchivedMeeting(models.Model):
+    """Past meeting moved out of Meeting by the archive_meetings command,
+    keeping the id it had there."""
+    id = models.BigIntegerField(primary_key=True)
+    topic = models.CharField(max_length=150)
+    date = models.DateTimeField()
+    description = models.TextField()
+    mentor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="archived_mentor_meetings"
+    )
+    limit_of_participants = models.PositiveIntegerField()
+    participants_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-date"]
+        indexes = [
+            models.Index(
+                fields=["date", "id"], name="archived_meeting_date_id_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.topic} ({self.date})"
+
+
+class ArchivedAttendance(models.Model):
+    meeting = models.ForeignKey(
+        ArchivedMeeting,
+        on_delete=models.CASCADE,
+        related_name="attendances"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_attendances",
+        # covered by archived_attendance_unique
+        db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "meeting"],
+                name="archived_attendance_unique",
+            )
+        ]
+
+
+# sent by Rating.vote() inside its transaction with the changes of the
+# stored aggregates
+rating_voted = Signal()
+
+
+def average_rating(votes_sum, votes_count):
+    return Round(Cast(votes_sum, FloatField()) / NullIf(votes_count, 0), 1)
+
+
 class Rating(models.Model):
     mentor = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         related_name="rating",
         on_delete=models.CASCADE
     )
+    votes_count = models.PositiveIntegerField(default=0)
+    votes_sum = models.PositiveIntegerField(default=0)
+    average = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         return f"Rating of {self.mentor.username}"
 
+    def vote(self, voter_id: int, rate: int) -> None:
+        """Insert or change a vote and update the stored aggregates
+        in the same transaction.
+
+        The transaction starts by writing the rating row, so concurrent
+        votes for a mentor queue on its row lock. Reading the previous
+        vote first would let a SQLite transaction begin as a reader and
+        fail with "database is locked" when another writer commits
+        before it upgrades.
+        """
+        with transaction.atomic():
+            Rating.objects.filter(pk=self.pk).update(
+                updated_at=timezone.now()
+            )
+            previous = self.rating_votes.filter(
+                voter_id=voter_id
+            ).values_list("rate", flat=True).first()
+            if previous is None:
+                RatingVote.objects.create(
+                    rating=self, voter_id=voter_id, rate=rate
+                )
+                count_delta, sum_delta = 1, rate
+            else:
+                self.rating_votes.filter(voter_id=voter_id).update(rate=rate)
+                count_delta, sum_delta = 0, rate - previous
+            Rating.objects.filter(pk=self.pk).update(
+                votes_count=F("votes_count") + count_delta,
+                votes_sum=F("votes_sum") + sum_delta,
+                average=average_rating(
+                    F("votes_sum") + sum_delta,
+                    F("votes_count") + count_delta
+                ),
+                updated_at=timezone.now()
+            )
+            rating_voted.send(
+                sender=Rating,
+                rating=self,
+                count_delta=count_delta,
+                sum_delta=sum_delta
+            )
+
 
 class RatingVote(models.Model):
     rating = models.ForeignKey(
@@ -144,3 +462,164 @@ class RatingVote(models.Model):
 
     def __str__(self) -> str:
         return f"{self.rate} from {self.voter.username}"
+
+
+class MentorRanking(models.Model):
+    """Leaderboard row of a mentor, kept by mentorizon.leaderboard."""
+    mentor = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="ranking"
+    )
+    sphere = models.ForeignKey(
+        Sphere,
+        on_delete=models.CASCADE,
+        related_name="rankings",
+        # covered by ranking_sphere_score_idx
+        db_index=False
+    )
+    votes_count = models.PositiveIntegerField(default=0)
+    average = models.FloatField(null=True, blank=True)
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ["-score", "mentor"]
+        indexes = [
+            models.Index(
+                fields=["-score", "mentor"], name="ranking_score_idx"
+            ),
+            models.Index(
+                fields=["sphere", "-score", "mentor"],
+                name="ranking_sphere_score_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Ranking of {self.mentor_id}: {self.score:.2f}"
+
+
+class MeetingRecommendation(models.Model):
+    """Upcoming meeting suggested to a user, written by the
+    build_recommendations command (see mentorizon.recommendations)."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="meeting_recommendations",
+        # covered by recommendation_user_score_idx
+        db_index=False
+    )
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="recommendations"
+    )
+    score = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["user", "-score"]
+        indexes = [
+            models.Index(
+                fields=["user", "-score", "meeting"],
+                name="recommendation_user_score_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "meeting"],
+                name="recommendation_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.meeting_id} for {self.user_id}: {self.score:.2f}"
+
+
+class SphereStats(models.Model):
+    """Counters of a sphere, kept by mentorizon.spherestats. Meetings
+    stay counted after they start until the stats are rebuilt."""
+    sphere = models.OneToOneField(
+        Sphere,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="stats"
+    )
+    mentors_count = models.PositiveIntegerField(default=0)
+    upcoming_meetings_count = models.PositiveIntegerField(default=0)
+    votes_count = models.PositiveIntegerField(default=0)
+    votes_sum = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        verbose_name_plural = "sphere stats"
+
+    def __str__(self) -> str:
+        return f"Stats of {self.sphere_id}"
+
+
+class SearchDocumentField(models.TextField):
+    """Hidden FTS5 column named after its table, the target of MATCH."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+class SearchIndex(models.Model):
+    """FTS5 index created by mentorizon.search, joined by rowid."""
+    rank = models.FloatField()
+
+    class Meta:
+        abstract = True
+        managed = False
+
+
+class MentorSearchIndex(SearchIndex):
+    mentor = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index"
+    )
+    document = SearchDocumentField(db_column="mentorizon_user_fts")
+
+    class Meta(SearchIndex.Meta):
+        db_table = "mentorizon_user_fts"
+
+
+class MeetingSearchIndex(SearchIndex):
+    meeting = models.OneToOneField(
+        Meeting,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index"
+    )
+    document = SearchDocumentField(db_column="mentorizon_meeting_fts")
+
+    class Meta(SearchIndex.Meta):
+        db_table = "mentorizon_meeting_fts"
+
+
+class SphereSearchIndex(SearchIndex):
+    sphere = models.OneToOneField(
+        Sphere,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index"
+    )
+    document = SearchDocumentField(db_column="mentorizon_sphere_fts")
+
+    class Meta(SearchIndex.Meta):
+        db_table = "mentorizon_sphere_fts"
@@ -0,0 +1,202 @@
+import base64
+import binascii
+import datetime
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+class CursorPage:
+    """Page of a keyset pagination, compatible with the parts of
+    django.core.paginator.Page used by the templates."""
+
+    def __init__(
+        self, object_list: list, has_next: bool, has_previous: bool,
+        paginator: "KeysetPaginator"
+    ) -> None:
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.paginator = paginator
+        self.next_page_query = ""
+        self.previous_page_query = ""
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self) -> str:
+        return self.paginator.encode_cursor(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self) -> str:
+        return self.paginator.encode_cursor(self.object_list[0], "previous")
+
+
+class KeysetPaginator:
+    """Paginate a queryset by its ordering values instead of an offset,
+    so pages cost the same however deep they are and no COUNT(*) runs.
+    ordering must end with a unique field to be stable."""
+
+    def __init__(
+        self, queryset: QuerySet, per_page: int, ordering: tuple
+    ) -> None:
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+
+    def _fields(self) -> list:
+        return [field.lstrip("-") for field in self.ordering]
+
+    def _value_of(self, obj, field: str):
+        if isinstance(obj, dict):
+            return obj[field]
+        for attribute in field.split("__"):
+            obj = getattr(obj, attribute)
+        return obj
+
+    def _to_python(self, field: str, value):
+        model = self.queryset.model
+        try:
+            *relations, name = field.split("__")
+            for relation in relations:
+                model = model._meta.get_field(relation).related_model
+            return model._meta.get_field(name).to_python(value)
+        except FieldDoesNotExist:
+            return value
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        cursor = {
+            "values": [
+                _encode_value(self._value_of(obj, field))
+                for field in self._fields()
+            ],
+            "direction": direction,
+        }
+        return base64.urlsafe_b64encode(
+            json.dumps(cursor).encode()
+        ).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple:
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = [
+                self._to_python(field, value)
+                for field, value in zip(self._fields(), data["values"])
+            ]
+            direction = data["direction"]
+        except (
+            binascii.Error, ValueError, KeyError, TypeError, ValidationError
+        ):
+            raise Http404("Invalid cursor")
+        if len(values) != len(self.ordering) or direction not in (
+            "next", "previous"
+        ):
+            raise Http404("Invalid cursor")
+        return values, direction
+
+    def _after(self, values: list, backwards: bool) -> Q:
+        conditions = []
+        for position, ordering_field in enumerate(self.ordering):
+            field = ordering_field.lstrip("-")
+            descending = ordering_field.startswith("-") != backwards
+            equal = {
+                previous.lstrip("-"): value
+                for previous, value in zip(
+                    self.ordering[:position], values[:position]
+                )
+            }
+            lookup = f"{field}__{'lt' if descending else 'gt'}"
+            conditions.append(Q(**equal, **{lookup: values[position]}))
+        return reduce(or_, conditions)
+
+    def _page_queryset(self, cursor: str) -> tuple:
+        """Queryset of the requested page plus one row telling whether
+        there are more, and the direction it was fetched in."""
+        if not cursor:
+            return (
+                self.queryset.order_by(*self.ordering)[:self.per_page + 1],
+                None
+            )
+        values, direction = self.decode_cursor(cursor)
+        if direction == "next":
+            return self.queryset.filter(
+                self._after(values, backwards=False)
+            ).order_by(*self.ordering)[:self.per_page + 1], direction
+        reversed_ordering = [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+        return self.queryset.filter(
+            self._after(values, backwards=True)
+        ).order_by(*reversed_ordering)[:self.per_page + 1], direction
+
+    def _make_page(self, objects: list, direction: str) -> CursorPage:
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if direction == "previous":
+            return CursorPage(
+                objects[::-1],
+                has_next=True,
+                has_previous=has_more,
+                paginator=self
+            )
+        return CursorPage(
+            objects,
+            has_next=has_more,
+            has_previous=direction == "next",
+            paginator=self
+        )
+
+    def page(self, cursor: str = None) -> CursorPage:
+        queryset, direction = self._page_queryset(cursor)
+        return self._make_page(list(queryset), direction)
+
+
+class KeysetPaginationMixin:
+    """ListView mixin replacing offset pagination with KeysetPaginator.
+    Cursor links keep the other query parameters (search, filters)."""
+    keyset_ordering = ("id",)
+    cursor_query_param = "cursor"
+
+    def get_keyset_ordering(self, queryset: QuerySet) -> tuple:
+        if "search_rank" in queryset.query.annotations:
+            return ("search_rank",) + self.keyset_ordering
+        return self.keyset_ordering
+
+    def _page_query(self, cursor: str) -> str:
+        query = self.request.GET.copy()
+        query[self.cursor_query_param] = cursor
+        return query.urlencode()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, page_size, self.get_keyset_ordering(queryset)
+        )
+        page = paginator.page(self.request.GET.get(self.cursor_query_param))
+        if page.object_list:
+            page.next_page_query = self._page_query(page.next_cursor)
+            page.previous_page_query = self._page_query(page.previous_cursor)
+        return paginator, page, page.object_list, page.has_other_pages()
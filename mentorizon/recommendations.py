@@ -0,0 +1,296 @@
+"""Offline "recommended for you" meetings.
+
+The build_recommendations command loads every booking, archived
+attendance and rating vote into sparse matrices kept as dicts of sets
+and counters keyed by id, scores the bookable upcoming meetings for
+every user and stores the best RECOMMENDATIONS_PER_USER of them in
+MeetingRecommendation. Pages read them in one query of its
+(user, -score) index.
+
+A meeting scores by
+- co-participation: the cosine similarity of its participants with the
+  participants of the meetings the user booked, item to item over the
+  user x meeting matrix;
+- mentor affinity: meetings the user booked with its mentor plus the
+  votes they gave them, from the user x mentor matrix;
+- sphere affinity: the user's mentor sphere and the spheres of the
+  meetings they booked, adding the most booked meetings of the sphere
+  as candidates.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from mentorizon.models import (
+    ArchivedAttendance,
+    ArchivedMeeting,
+    Meeting,
+    MeetingRecommendation,
+    MentorSession,
+    RatingVote,
+)
+
+CO_PARTICIPATION_WEIGHT = 1.0
+MENTOR_WEIGHT = 0.5
+SPHERE_WEIGHT = 0.25
+# votes above it make a mentor more likely, below it less
+NEUTRAL_RATE = 3
+# bounds of the work per user and per meeting
+MAX_HISTORY = 50
+MAX_NEIGHBOURS = 20
+MAX_MENTORS = 10
+MEETINGS_PER_MENTOR = 10
+MAX_SPHERES = 3
+MEETINGS_PER_SPHERE = 20
+CHUNK_SIZE = 5000
+BATCH_SIZE = 500
+
+
+class Interactions:
+    """Sparse matrices of the interactions of users with meetings,
+    mentors and spheres, rows and columns keyed by id."""
+
+    def __init__(self) -> None:
+        # user x meeting bookings and its transpose
+        self.user_meetings = defaultdict(set)
+        self.meeting_users = defaultdict(set)
+        # user x mentor and user x sphere affinity
+        self.user_mentors = defaultdict(Counter)
+        self.user_spheres = defaultdict(Counter)
+        self.meeting_mentor = {}
+        self.mentor_sphere = {}
+        # bookable upcoming meeting: (mentor, date)
+        self.candidates = {}
+
+    def add_mentor(self, mentor_id: int, sphere_id: int) -> None:
+        self.mentor_sphere[mentor_id] = sphere_id
+        self.user_spheres[mentor_id][sphere_id] += 1
+
+    def add_meeting(self, meeting_id: int, mentor_id: int) -> None:
+        self.meeting_mentor[meeting_id] = mentor_id
+
+    def add_candidate(self, meeting_id: int, mentor_id: int, date) -> None:
+        self.meeting_mentor[meeting_id] = mentor_id
+        self.candidates[meeting_id] = (mentor_id, date)
+
+    def add_booking(self, user_id: int, meeting_id: int) -> None:
+        self.user_meetings[user_id].add(meeting_id)
+        self.meeting_users[meeting_id].add(user_id)
+
+    def add_vote(self, user_id: int, mentor_id: int, rate: int) -> None:
+        self.user_mentors[user_id][mentor_id] += rate - NEUTRAL_RATE
+
+    def finish(self) -> None:
+        """Derive the affinities of bookings, once everything is added."""
+        for user_id, meeting_ids in self.user_meetings.items():
+            for meeting_id in meeting_ids:
+                mentor_id = self.meeting_mentor.get(meeting_id)
+                if mentor_id is None:
+                    continue
+                self.user_mentors[user_id][mentor_id] += 1
+                sphere_id = self.mentor_sphere.get(mentor_id)
+                if sphere_id is not None:
+                    self.user_spheres[user_id][sphere_id] += 1
+
+
+def load_interactions() -> Interactions:
+    interactions = Interactions()
+    mentors = get_user_model().objects.filter(
+        mentor_sphere__isnull=False
+    ).values_list("id", "mentor_sphere_id").order_by()
+    for mentor_id, sphere_id in mentors.iterator(chunk_size=CHUNK_SIZE):
+        interactions.add_mentor(mentor_id, sphere_id)
+    sessions = MentorSession._base_manager.values_list(
+        "meeting_id", "mentor_id"
+    ).order_by()
+    for meeting_id, mentor_id in sessions.iterator(chunk_size=CHUNK_SIZE):
+        interactions.add_meeting(meeting_id, mentor_id)
+    archived = ArchivedMeeting.objects.filter(
+        mentor__isnull=False
+    ).values_list("id", "mentor_id").order_by()
+    for meeting_id, mentor_id in archived.iterator(chunk_size=CHUNK_SIZE):
+        interactions.add_meeting(meeting_id, mentor_id)
+    # Meeting.objects only has upcoming meetings
+    candidates = Meeting.objects.filter(
+        available_places__gt=0, mentor_session__isnull=False
+    ).values_list("id", "mentor_session__mentor_id", "date").order_by()
+    for meeting_id, mentor_id, date in candidates.iterator(
+        chunk_size=CHUNK_SIZE
+    ):
+        interactions.add_candidate(meeting_id, mentor_id, date)
+    for bookings in (
+        Meeting.participants.through.objects.all(),
+        ArchivedAttendance.objects.all(),
+    ):
+        for user_id, meeting_id in bookings.values_list(
+            "user_id", "meeting_id"
+        ).order_by().iterator(chunk_size=CHUNK_SIZE):
+            interactions.add_booking(user_id, meeting_id)
+    votes = RatingVote.objects.values_list(
+        "voter_id", "rating__mentor_id", "rate"
+    ).order_by()
+    for user_id, mentor_id, rate in votes.iterator(chunk_size=CHUNK_SIZE):
+        interactions.add_vote(user_id, mentor_id, rate)
+    interactions.finish()
+    return interactions
+
+
+def meeting_neighbours(interactions: Interactions) -> dict:
+    """Item-item cosine similarities of the user x meeting matrix from
+    any meeting to the candidates sharing participants with it, the
+    MAX_NEIGHBOURS most similar candidates per meeting."""
+    user_meetings = interactions.user_meetings
+    meeting_users = interactions.meeting_users
+    neighbours = defaultdict(list)
+    for candidate_id in interactions.candidates:
+        participants = meeting_users.get(candidate_id)
+        if not participants:
+            continue
+        shared = Counter()
+        for user_id in participants:
+            shared.update(user_meetings[user_id])
+        del shared[candidate_id]
+        norm = len(participants)
+        for meeting_id, count in shared.items():
+            neighbours[meeting_id].append((
+                count / math.sqrt(norm * len(meeting_users[meeting_id])),
+                candidate_id,
+            ))
+    return {
+        meeting_id: heapq.nlargest(MAX_NEIGHBOURS, similar)
+        for meeting_id, similar in neighbours.items()
+    }
+
+
+def _soonest(meeting_ids, interactions: Interactions, number: int) -> list:
+    return heapq.nsmallest(
+        number,
+        meeting_ids,
+        key=lambda meeting_id: interactions.candidates[meeting_id][1]
+    )
+
+
+def recommend(interactions: Interactions, top_k: int):
+    """Yield (user id, [(score, meeting id), ...]) with the best top_k
+    candidates of every user with any interaction."""
+    neighbours = meeting_neighbours(interactions)
+    own = defaultdict(list)
+    by_sphere = defaultdict(list)
+    for meeting_id, (mentor_id, _) in interactions.candidates.items():
+        own[mentor_id].append(meeting_id)
+        sphere_id = interactions.mentor_sphere.get(mentor_id)
+        if sphere_id is not None:
+            by_sphere[sphere_id].append(meeting_id)
+    by_mentor = {
+        mentor_id: _soonest(meeting_ids, interactions, MEETINGS_PER_MENTOR)
+        for mentor_id, meeting_ids in own.items()
+    }
+    meeting_users = interactions.meeting_users
+    by_sphere = {
+        sphere_id: heapq.nlargest(
+            MEETINGS_PER_SPHERE,
+            meeting_ids,
+            key=lambda meeting_id: len(meeting_users.get(meeting_id, ()))
+        )
+        for sphere_id, meeting_ids in by_sphere.items()
+    }
+    users = (
+        interactions.user_meetings.keys()
+        | interactions.user_mentors.keys()
+        | interactions.user_spheres.keys()
+    )
+    for user_id in sorted(users):
+        booked = interactions.user_meetings.get(user_id, set())
+        scores = Counter()
+        # the user's most recent bookings have the highest ids
+        for meeting_id in heapq.nlargest(MAX_HISTORY, booked):
+            for similarity, candidate_id in neighbours.get(meeting_id, ()):
+                scores[candidate_id] += CO_PARTICIPATION_WEIGHT * similarity
+        mentors = interactions.user_mentors.get(user_id)
+        if mentors:
+            favourites = mentors.most_common(MAX_MENTORS)
+            top_affinity = favourites[0][1]
+            for mentor_id, affinity in favourites:
+                if affinity <= 0:
+                    break
+                weight = MENTOR_WEIGHT * affinity / top_affinity
+                for candidate_id in by_mentor.get(mentor_id, ()):
+                    scores[candidate_id] += weight
+        spheres = interactions.user_spheres.get(user_id)
+        if spheres:
+            total = sum(spheres.values())
+            for sphere_id, affinity in spheres.most_common(MAX_SPHERES):
+                weight = SPHERE_WEIGHT * affinity / total
+                for candidate_id in by_sphere.get(sphere_id, ()):
+                    scores[candidate_id] += weight
+        for meeting_id in booked:
+            scores.pop(meeting_id, None)
+        # meetings the user mentors
+        for meeting_id in own.get(user_id, ()):
+            scores.pop(meeting_id, None)
+        best = [
+            (score, meeting_id) for meeting_id, score in heapq.nlargest(
+                top_k, scores.items(), key=itemgetter(1)
+            )
+        ]
+        if best:
+            yield user_id, best
+
+
+def _write(batch: list) -> None:
+    with transaction.atomic():
+        MeetingRecommendation.objects.filter(
+            user_id__in=[user_id for user_id, _ in batch]
+        ).delete()
+        MeetingRecommendation.objects.bulk_create(
+            MeetingRecommendation(
+                user_id=user_id, meeting_id=meeting_id, score=score
+            )
+            for user_id, best in batch
+            for score, meeting_id in best
+        )
+
+
+def build_recommendations(top_k: int = None) -> int:
+    """Replace the stored recommendations, a transaction per
+    BATCH_SIZE users. Returns the number of users with any."""
+    started = timezone.now()
+    interactions = load_interactions()
+    batch = []
+    number_of_users = 0
+    for user_recommendations in recommend(
+        interactions, top_k or settings.RECOMMENDATIONS_PER_USER
+    ):
+        batch.append(user_recommendations)
+        if len(batch) == BATCH_SIZE:
+            _write(batch)
+            number_of_users += len(batch)
+            batch = []
+    if batch:
+        _write(batch)
+        number_of_users += len(batch)
+    MeetingRecommendation.objects.filter(created_at__lt=started).delete()
+    return number_of_users
+
+
+def recommended_meetings(user, number: int = None):
+    """Queryset of the best stored recommendations for the user still
+    upcoming and not booked by them since."""
+    return MeetingRecommendation.objects.filter(
+        user_id=user.id, meeting__date__gt=timezone.now()
+    ).exclude(
+        Exists(Meeting.participants.through.objects.filter(
+            meeting_id=OuterRef("meeting_id"), user_id=user.id
+        ))
+    ).select_related(
+        "meeting__mentor_session__mentor"
+    ).order_by(
+        "-score", "meeting_id"
+    )[:number or settings.RECOMMENDATIONS_SHOWN]
@@ -0,0 +1,71 @@
+"""Send reads of the mentorizon models to a replica database.
+
+Active when settings.REPLICA_DATABASE names a database alias and
+PrimaryReplicaRouter is in settings.DATABASE_ROUTERS. Only reads made
+while serving a request go to the replica; management commands, reads
+inside a transaction and the models of other apps (sessions, groups
+and permissions) always use the primary. The user model is
+mentorizon.User, so its reads go to the replica too, except the
+lookups of mentorizon.auth.CachedModelBackend authenticating a user.
+
+A request that writes pins its reads to the primary for the rest of the
+request, and mentorizon.middleware.replica_pinning_middleware keeps the
+browser pinned for settings.REPLICA_PIN_SECONDS afterwards, so users
+read their own writes while the replica catches up.
+"""
+import contextvars
+
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+
+ROUTED_APP_LABEL = "mentorizon"
+
+
+class RoutingState:
+    """Per request state shared by the router and the middleware."""
+
+    def __init__(self, pinned: bool) -> None:
+        self.pinned = pinned
+        self.written = False
+
+
+_request_state = contextvars.ContextVar("replica_routing", default=None)
+
+
+def begin_request(pinned: bool) -> contextvars.Token:
+    return _request_state.set(RoutingState(pinned))
+
+
+def end_request(token: contextvars.Token) -> RoutingState:
+    state = _request_state.get()
+    _request_state.reset(token)
+    return state
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replica = getattr(settings, "REPLICA_DATABASE", None)
+        state = _request_state.get()
+        if (
+            replica is None
+            or state is None
+            or state.pinned
+            or model._meta.app_label != ROUTED_APP_LABEL
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None and model._meta.app_label == ROUTED_APP_LABEL:
+            state.pinned = state.written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != getattr(settings, "REPLICA_DATABASE", None)
@@ -0,0 +1,115 @@
+"""Full-text search over mentors, meetings and spheres.
+
+On SQLite every searchable table gets an external-content FTS5 index
+kept in sync by triggers. The index tables are mapped by the unmanaged
+*SearchIndex models, so matches are joined by rowid and ranked by the
+bm25 rank column of the index. Other database backends fall back to
+case-insensitive substring matching.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import F, Q, QuerySet, Value
+
+from mentorizon.models import Meeting, Sphere
+
+# model: (indexed columns, bm25 weight of each column)
+SEARCH_FIELDS = {
+    get_user_model(): (
+        ("first_name", "last_name", "experience_description"), (5, 10, 1)
+    ),
+    Meeting: (("topic", "description"), (10, 1)),
+    Sphere: (("name",), (1,)),
+}
+
+
+def _fts_table(model) -> str:
+    return f"{model._meta.db_table}_fts"
+
+
+def _index_sql(model) -> list:
+    table = model._meta.db_table
+    fts_table = _fts_table(model)
+    columns, _ = SEARCH_FIELDS[model]
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {fts_table}(rowid, {column_list}) "
+        f"VALUES (new.id, {new_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert "
+        f"AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete "
+        f"AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update "
+        f"AFTER UPDATE OF {column_list} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def install_search_index(using: str = "default") -> None:
+    """Create the FTS5 tables and triggers if they are missing.
+
+    SQLite migrations that rebuild a table drop its triggers, so this
+    runs after every migrate and rebuilds an index whose triggers had
+    to be recreated.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+        for model in SEARCH_FIELDS:
+            fts_table = _fts_table(model)
+            if {
+                f"{fts_table}_insert",
+                f"{fts_table}_delete",
+                f"{fts_table}_update",
+            } <= triggers:
+                continue
+            for statement in _index_sql(model):
+                cursor.execute(statement)
+            _, weights = SEARCH_FIELDS[model]
+            bm25_weights = ", ".join(f"{weight}.0" for weight in weights)
+            cursor.execute(
+                f"INSERT INTO {fts_table}({fts_table}, rank) "
+                f"VALUES ('rank', 'bm25({bm25_weights})')"
+            )
+            cursor.execute(
+                f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+            )
+
+
+def _match_expression(query: str) -> str:
+    """Turn user input into an FTS5 query matching every word
+    as a prefix, so no user input is parsed as FTS5 syntax."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
+
+def search(queryset: QuerySet, query: str) -> QuerySet:
+    """Restrict queryset to rows matching query and annotate
+    them with search_rank (lower is more relevant)."""
+    columns, _ = SEARCH_FIELDS[queryset.model]
+    match = _match_expression(query)
+    if not match:
+        return queryset.annotate(search_rank=Value(0.0))
+    if connections[queryset.db].vendor != "sqlite":
+        return queryset.filter(reduce(or_, (
+            Q(**{f"{column}__icontains": query.strip()})
+            for column in columns
+        ))).annotate(search_rank=Value(0.0))
+    return queryset.filter(
+        search_index__document__match=match
+    ).annotate(search_rank=F("search_index__rank"))
@@ -0,0 +1,284 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from mentorizon.auth import cache_user, invalidate_cached_user
+from mentorizon.caching import (
+    bump_card_version,
+    invalidate_collections,
+    invalidate_dashboard_counters,
+)
+from mentorizon.leaderboard import refresh_mentor_ranking
+from mentorizon.metrics import install_query_recorder
+from mentorizon.models import (
+    Meeting,
+    MentorSession,
+    Rating,
+    rating_voted,
+    Sphere,
+    SphereStats,
+)
+from mentorizon.search import install_search_index
+from mentorizon.slowqueries import install_slow_query_log
+from mentorizon.spherestats import (
+    adjust_mentor_sphere_stats,
+    adjust_sphere_stats,
+    mentor_totals,
+    move_mentor,
+    upcoming_meeting_sphere,
+)
+
+
+def _adjust_available_places(places_by_meeting: Counter, sign: int) -> None:
+    meetings_by_delta = {}
+    for meeting_id, places in places_by_meeting.items():
+        meetings_by_delta.setdefault(places, []).append(meeting_id)
+    for places, meeting_ids in meetings_by_delta.items():
+        Meeting._base_manager.filter(pk__in=meeting_ids).update(
+            available_places=F("available_places") + sign * places,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def sync_available_places(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Keep Meeting.available_places in sync when participants are
+    changed through the related managers (admin, shell) instead of
+    Meeting.book() and Meeting.unbook()."""
+    if action in ("pre_remove", "pre_clear"):
+        rows = sender.objects.filter(
+            **{"user_id" if reverse else "meeting_id": instance.pk}
+        )
+        if pk_set is not None:
+            rows = rows.filter(
+                **{"meeting_id__in" if reverse else "user_id__in": pk_set}
+            )
+        instance._released_places = Counter(
+            rows.values_list("meeting_id", flat=True)
+        )
+    elif action in ("post_remove", "post_clear"):
+        _adjust_available_places(instance.__dict__.pop(
+            "_released_places", Counter()
+        ), 1)
+    elif action == "post_add" and pk_set:
+        if reverse:
+            _adjust_available_places(Counter(pk_set), -1)
+        else:
+            _adjust_available_places(Counter({instance.pk: len(pk_set)}), -1)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_mentors_counter(sender, update_fields=None, **kwargs):
+    if update_fields is None or "mentor_sphere" in update_fields:
+        transaction.on_commit(
+            lambda: invalidate_dashboard_counters("num_mentors")
+        )
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def drop_cached_user(sender, instance, **kwargs):
+    """Drop the user right away and again on commit, so that a request
+    reading the old row meanwhile cannot cache it back."""
+    invalidate_cached_user(instance.pk)
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
+
+
+@receiver(user_logged_in)
+def cache_logged_in_user(sender, user, **kwargs):
+    # connected after update_last_login, which saves the user
+    cache_user(user)
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_ranking(sender, instance, created, update_fields=None, **kwargs):
+    """Move a mentor to the leaderboard of their new sphere. Runs on
+    commit, when the rating of a new user exists."""
+    if instance.mentor_sphere_id is None and created:
+        return
+    if update_fields is None or "mentor_sphere" in update_fields:
+        transaction.on_commit(lambda: refresh_mentor_ranking(instance.pk))
+
+
+@receiver(post_save, sender=Sphere)
+def create_sphere_stats(sender, instance, created, **kwargs):
+    if created:
+        SphereStats.objects.create(sphere=instance)
+
+
+@receiver(pre_save, sender=get_user_model())
+def remember_mentor_sphere(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is not None and (
+        update_fields is None or "mentor_sphere" in update_fields
+    ):
+        instance._previous_mentor_sphere_id = sender._base_manager.filter(
+            pk=instance.pk
+        ).values_list("mentor_sphere_id", flat=True).first()
+
+
+@receiver(post_save, sender=get_user_model())
+def update_sphere_mentors(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "mentor_sphere" in update_fields:
+        move_mentor(
+            instance.pk,
+            instance.__dict__.pop("_previous_mentor_sphere_id", None),
+            instance.mentor_sphere_id
+        )
+
+
+@receiver(pre_delete, sender=get_user_model())
+def remove_sphere_mentor(sender, instance, **kwargs):
+    if instance.mentor_sphere_id is not None:
+        totals = mentor_totals(instance.pk)
+        # the deletion of their mentor sessions subtracts the meetings
+        totals["meetings"] = 0
+        adjust_sphere_stats(
+            instance.mentor_sphere_id,
+            **{name: -value for name, value in totals.items()}
+        )
+
+
+@receiver(post_save, sender=MentorSession)
+def count_sphere_meeting(sender, instance, created, **kwargs):
+    if created:
+        adjust_sphere_stats(
+            upcoming_meeting_sphere(instance.meeting_id), meetings=1
+        )
+
+
+@receiver(pre_delete, sender=MentorSession)
+def uncount_sphere_meeting(sender, instance, **kwargs):
+    adjust_sphere_stats(
+        upcoming_meeting_sphere(instance.meeting_id), meetings=-1
+    )
+
+
+@receiver(rating_voted, sender=Rating)
+def count_sphere_vote(sender, rating, count_delta, sum_delta, **kwargs):
+    adjust_mentor_sphere_stats(
+        rating.mentor_id, votes_count=count_delta, votes_sum=sum_delta
+    )
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+def invalidate_meetings_counter(sender, **kwargs):
+    transaction.on_commit(
+        lambda: invalidate_dashboard_counters("num_meetings")
+    )
+
+
+@receiver(post_save, sender=Sphere)
+@receiver(post_delete, sender=Sphere)
+def invalidate_spheres_counter(sender, **kwargs):
+    transaction.on_commit(
+        lambda: invalidate_dashboard_counters("num_spheres")
+    )
+
+
+@receiver(connection_created)
+def instrument_queries(sender, connection, **kwargs):
+    install_query_recorder(connection)
+    install_slow_query_log(connection)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply settings.SQLITE_PRAGMAS to new SQLite connections."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+@receiver(post_migrate)
+def install_search(sender, using, **kwargs):
+    if sender.name == "mentorizon":
+        install_search_index(using)
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+@receiver(post_save, sender=Sphere)
+@receiver(post_delete, sender=Sphere)
+def bump_card(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_card_version(sender, instance.pk))
+
+
+@receiver(post_save, sender=get_user_model())
+def bump_mentor_card(sender, instance, update_fields=None, **kwargs):
+    card_fields = {"first_name", "last_name", "mentor_sphere"}
+    if update_fields is None or card_fields & set(update_fields):
+        transaction.on_commit(lambda: bump_card_version(sender, instance.pk))
+
+
+@receiver(post_save, sender=MentorSession)
+@receiver(post_delete, sender=MentorSession)
+def bump_session_meeting_card(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: bump_card_version(Meeting, instance.meeting_id)
+    )
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def bump_participants_meeting_cards(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    meeting_ids = (pk_set or ()) if reverse else (instance.pk,)
+    for meeting_id in meeting_ids:
+        transaction.on_commit(
+            lambda meeting_id=meeting_id: bump_card_version(
+                Meeting, meeting_id
+            )
+        )
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_mentor_collections(sender, update_fields=None, **kwargs):
+    api_fields = {
+        "first_name", "last_name", "experience_description", "mentor_sphere"
+    }
+    if update_fields is None or api_fields & set(update_fields):
+        transaction.on_commit(
+            lambda: invalidate_collections("mentors", "meetings")
+        )
+
+
+@receiver(post_save, sender=Sphere)
+@receiver(post_delete, sender=Sphere)
+def invalidate_sphere_collections(sender, **kwargs):
+    transaction.on_commit(
+        lambda: invalidate_collections("spheres", "mentors", "meetings")
+    )
+
+
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+@receiver(post_save, sender=MentorSession)
+@receiver(post_delete, sender=MentorSession)
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def invalidate_meeting_collection(sender, action=None, **kwargs):
+    if action is None or action.startswith("post_"):
+        transaction.on_commit(lambda: invalidate_collections("meetings"))
@@ -0,0 +1,179 @@
+"""Opt-in log of slow SQL queries.
+
+With settings.SLOW_QUERY_LOG set to a file, log_slow_query() is
+installed as an execute wrapper on every database connection and logs
+queries slower than SLOW_QUERY_THRESHOLD_MS to the
+"mentorizon.slow_queries" logger, one JSON object per line. An entry
+names the view being served, the lines of the mentorizon code and of
+the template that ran the query, and with SLOW_QUERY_EXPLAIN
+the query plan. Query parameters are not logged.
+
+Timing a query costs two clock reads; only the slow queries are
+attributed and explained, and only a SLOW_QUERY_SAMPLE_RATE fraction
+of them, so the log can stay on in production.
+"""
+import contextvars
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from mentorizon import metrics
+
+logger = logging.getLogger("mentorizon.slow_queries")
+
+APP_DIRECTORY = Path(__file__).resolve().parent
+# wrap every query, never its origin
+INSTRUMENTATION_FILES = {
+    str(APP_DIRECTORY / name)
+    for name in ("slowqueries.py", "metrics.py", "middleware.py")
+}
+MAX_SOURCE_FRAMES = 8
+
+_explaining = contextvars.ContextVar("explaining_query", default=False)
+
+
+def _thread_frames():
+    frame = sys._getframe(1)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def _task_frames(task) -> list:
+    """Frames of the coroutines a suspended task is awaiting through,
+    innermost first. Task.get_stack() only returns the outermost one."""
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        for frame_attribute, await_attribute in (
+            ("cr_frame", "cr_await"),
+            ("ag_frame", "ag_await"),
+            ("gi_frame", "gi_yieldfrom"),
+        ):
+            if hasattr(awaitable, frame_attribute):
+                break
+        else:
+            # a future
+            break
+        frame = getattr(awaitable, frame_attribute)
+        if frame is not None:
+            frames.append(frame)
+        awaitable = getattr(awaitable, await_attribute)
+    return frames[::-1]
+
+
+def _template_line(frames) -> str:
+    """Template line of the innermost node being rendered."""
+    for frame in frames:
+        if frame.f_code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            origin = getattr(node, "origin", None)
+            if origin is not None:
+                return (
+                    f"{origin.template_name or origin.name}:"
+                    f"{node.token.lineno}"
+                )
+    return None
+
+
+def _source_lines(frames) -> list:
+    """Lines of the mentorizon code on the stack, innermost first."""
+    lines = []
+    for frame in frames:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(str(APP_DIRECTORY))
+            and filename not in INSTRUMENTATION_FILES
+        ):
+            path = Path(filename).relative_to(settings.BASE_DIR)
+            lines.append(
+                f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+            )
+            if len(lines) == MAX_SOURCE_FRAMES:
+                break
+    return lines
+
+
+def _call_site(request_metrics) -> tuple:
+    """(mentorizon code lines, template line) running the current query.
+    Under ASGI the view runs in a worker thread, so the stack of the
+    suspended task serving the request follows the thread's own."""
+    frames = list(_thread_frames())
+    if request_metrics is not None and request_metrics.task is not None:
+        frames.extend(_task_frames(request_metrics.task))
+    return _source_lines(frames), _template_line(frames)
+
+
+def _explain(connection, sql: str, params) -> list:
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{connection.ops.explain_query_prefix()} {sql}", params
+            )
+            return [
+                " ".join(str(column) for column in row)
+                for row in cursor.fetchall()
+            ]
+    except DatabaseError as error:
+        return [f"EXPLAIN failed: {error}"]
+    finally:
+        _explaining.reset(token)
+
+
+def log_slow_query(execute, sql, params, many, context):
+    if _explaining.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    succeeded = False
+    try:
+        result = execute(sql, params, many, context)
+        succeeded = True
+        return result
+    finally:
+        duration = time.perf_counter() - start
+        if (
+            duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS
+            and random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+        ):
+            _log(sql, params, many, context, duration, succeeded)
+
+
+def _log(sql, params, many, context, duration, succeeded) -> None:
+    request_metrics = metrics.current_request()
+    source, template = _call_site(request_metrics)
+    entry = {
+        "time": timezone.now().isoformat(),
+        "duration_ms": round(duration * 1000, 3),
+        "database": context["connection"].alias,
+        "view": (
+            metrics.view_name(request_metrics.request)
+            if request_metrics else None
+        ),
+        "source": source,
+        "template": template,
+        "sql": sql,
+    }
+    if many:
+        entry["many"] = True
+    if not succeeded:
+        # a failed statement may have broken the transaction
+        entry["failed"] = True
+    elif settings.SLOW_QUERY_EXPLAIN and not many:
+        entry["explain"] = _explain(context["connection"], sql, params)
+    logger.warning(json.dumps(entry))
+
+
+def install_slow_query_log(connection) -> None:
+    if (
+        settings.SLOW_QUERY_LOG
+        and log_slow_query not in connection.execute_wrappers
+    ):
+        connection.execute_wrappers.append(log_slow_query)
@@ -0,0 +1,154 @@
+"""Per-sphere statistics kept as a read model.
+
+SphereStats stores the number of mentors and upcoming meetings and the
+rating aggregates of the mentors of each sphere, so pages listing
+spheres read one row per sphere instead of counting users, meetings
+and votes. The receivers in mentorizon.signals apply every change as
+a delta in the transaction making it. Meetings cannot be told apart
+from past ones when they start, so the rebuild_sphere_stats command
+recounts everything and should run periodically.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, QuerySet, Sum
+from django.utils import timezone
+
+from mentorizon.models import (
+    average_rating,
+    MentorSession,
+    Rating,
+    Sphere,
+    SphereStats,
+)
+
+BATCH_SIZE = 1000
+STATS_FIELDS = [
+    "mentors_count",
+    "upcoming_meetings_count",
+    "votes_count",
+    "votes_sum",
+    "updated_at",
+]
+
+
+def _adjust(
+    stats: QuerySet,
+    mentors: int = 0,
+    meetings: int = 0,
+    votes_count: int = 0,
+    votes_sum: int = 0
+) -> None:
+    stats.update(
+        mentors_count=F("mentors_count") + mentors,
+        upcoming_meetings_count=F("upcoming_meetings_count") + meetings,
+        votes_count=F("votes_count") + votes_count,
+        votes_sum=F("votes_sum") + votes_sum,
+        average_rating=average_rating(
+            F("votes_sum") + votes_sum, F("votes_count") + votes_count
+        ),
+        updated_at=timezone.now()
+    )
+
+
+def adjust_sphere_stats(sphere_id, **deltas) -> None:
+    """Add deltas to the counters of a sphere, nothing for None."""
+    if sphere_id is not None:
+        _adjust(SphereStats.objects.filter(sphere_id=sphere_id), **deltas)
+
+
+def adjust_mentor_sphere_stats(mentor_id: int, **deltas) -> None:
+    """Add deltas to the counters of the sphere of a mentor."""
+    _adjust(
+        SphereStats.objects.filter(
+            sphere_id__in=get_user_model().objects.filter(
+                pk=mentor_id
+            ).values("mentor_sphere_id")
+        ),
+        **deltas
+    )
+
+
+def upcoming_meeting_sphere(meeting_id: int):
+    """Sphere of the mentor of a meeting, None if the meeting took
+    place or has no mentor."""
+    return MentorSession.objects.filter(meeting_id=meeting_id).values_list(
+        "mentor__mentor_sphere_id", flat=True
+    ).first()
+
+
+def mentor_totals(mentor_id: int) -> dict:
+    """Deltas a mentor adds to the counters of their sphere."""
+    votes_count, votes_sum = Rating.objects.filter(
+        mentor_id=mentor_id
+    ).values_list("votes_count", "votes_sum").first() or (0, 0)
+    return {
+        "mentors": 1,
+        "meetings": MentorSession.objects.filter(mentor_id=mentor_id).count(),
+        "votes_count": votes_count,
+        "votes_sum": votes_sum,
+    }
+
+
+def move_mentor(mentor_id: int, old_sphere_id, new_sphere_id) -> None:
+    """Move the counters of a mentor between spheres, None standing for
+    a user who is no mentor."""
+    if old_sphere_id == new_sphere_id:
+        return
+    totals = mentor_totals(mentor_id)
+    adjust_sphere_stats(
+        old_sphere_id, **{name: -value for name, value in totals.items()}
+    )
+    adjust_sphere_stats(new_sphere_id, **totals)
+
+
+def rebuild_sphere_stats() -> int:
+    """Recount the statistics of every sphere. Returns the number of
+    spheres."""
+    with transaction.atomic():
+        # like Rating.vote(), start by writing so that concurrent
+        # deltas wait for the recount instead of getting lost
+        SphereStats.objects.update(updated_at=timezone.now())
+        mentors = dict(
+            get_user_model().objects.filter(
+                mentor_sphere__isnull=False
+            ).values("mentor_sphere_id").annotate(
+                count=Count("id")
+            ).order_by().values_list("mentor_sphere_id", "count")
+        )
+        meetings = dict(
+            MentorSession.objects.filter(
+                mentor__mentor_sphere__isnull=False
+            ).values("mentor__mentor_sphere_id").annotate(
+                count=Count("id")
+            ).order_by().values_list("mentor__mentor_sphere_id", "count")
+        )
+        votes = {
+            row["mentor__mentor_sphere_id"]: row
+            for row in Rating.objects.filter(
+                mentor__mentor_sphere__isnull=False
+            ).values("mentor__mentor_sphere_id").annotate(
+                votes_count=Sum("votes_count"), votes_sum=Sum("votes_sum")
+            ).order_by()
+        }
+        empty = {"votes_count": 0, "votes_sum": 0}
+        stats = [
+            SphereStats(
+                sphere_id=sphere_id,
+                mentors_count=mentors.get(sphere_id, 0),
+                upcoming_meetings_count=meetings.get(sphere_id, 0),
+                votes_count=votes.get(sphere_id, empty)["votes_count"],
+                votes_sum=votes.get(sphere_id, empty)["votes_sum"],
+            )
+            for sphere_id in Sphere.objects.values_list("id", flat=True)
+        ]
+        SphereStats.objects.bulk_create(
+            stats,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["sphere"],
+            update_fields=STATS_FIELDS,
+        )
+        SphereStats.objects.update(
+            average_rating=average_rating(F("votes_sum"), F("votes_count"))
+        )
+    return len(stats)
@@ -0,0 +1,15 @@
+from django import template
+
+from mentorizon import caching, feeds
+
+register = template.Library()
+
+
+@register.simple_tag
+def card_key(*objects) -> str:
+    return caching.card_key(*objects)
+
+
+@register.simple_tag(takes_context=True)
+def calendar_feed_url(context, mentor=None) -> str:
+    return feeds.calendar_feed_url(context["request"], mentor)
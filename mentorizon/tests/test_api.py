@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import Meeting, MentorSession, Sphere
+
+
+class ApiTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.sphere = Sphere.objects.create(name="Art")
+        self.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=self.sphere
+        )
+        self.meetings = []
+        for index in range(5):
+            meeting = Meeting.objects.create(
+                topic=f"Painting {index}",
+                date=timezone.now() + timezone.timedelta(days=index + 1),
+                description="Test meeting",
+                limit_of_participants=2,
+                link="google.com"
+            )
+            MentorSession.objects.create(mentor=self.mentor, meeting=meeting)
+            self.meetings.append(meeting)
+        self.client.force_login(self.mentor)
+
+    def test_login_required(self):
+        self.client.logout()
+
+        response = self.client.get(reverse("mentorizon:api-meeting-list"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_cursor_pagination_and_fields(self):
+        url = reverse("mentorizon:api-meeting-list")
+        response = self.client.get(url, {"limit": 3, "fields": "id,topic"})
+        data = response.json()
+
+        self.assertEqual(
+            data["results"],
+            [
+                {"id": meeting.id, "topic": meeting.topic}
+                for meeting in self.meetings[:3]
+            ]
+        )
+        self.assertIsNone(data["previous"])
+        data = self.client.get(data["next"]).json()
+        self.assertEqual(
+            [meeting["id"] for meeting in data["results"]],
+            [meeting.id for meeting in self.meetings[3:]]
+        )
+        self.assertIsNone(data["next"])
+
+    def test_unknown_field(self):
+        response = self.client.get(
+            reverse("mentorizon:api-mentor-list"), {"fields": "password"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_mentor_list_includes_rating_and_sphere(self):
+        response = self.client.get(reverse("mentorizon:api-mentor-list"))
+
+        self.assertEqual(response.json()["results"], [{
+            "id": self.mentor.id,
+            "first_name": "Ivan",
+            "last_name": "Ivanenko",
+            "experience_description": None,
+            "sphere": "Art",
+            "rating": None,
+            "votes_count": 0,
+        }])
+
+    def test_batch_keeps_requested_order(self):
+        ids = [self.meetings[2].id, 0, self.meetings[0].id]
+        response = self.client.get(
+            reverse("mentorizon:api-meeting-batch"),
+            {"ids": ",".join(map(str, ids)), "fields": "id"}
+        )
+
+        self.assertEqual(response.json(), {
+            "results": [{"id": ids[0]}, {"id": ids[2]}],
+            "missing": [0],
+        })
+
+    def test_not_modified_without_querying_meetings(self):
+        url = reverse("mentorizon:api-meeting-list")
+        etag = self.client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([
+            query for query in queries
+            if "mentorizon_meeting" in query["sql"]
+        ])
+
+    def test_etag_changes_on_commit(self):
+        url = reverse("mentorizon:api-meeting-list")
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meetings[0].participants.add(
+                get_user_model().objects.create_user(
+                    username="user", password="test12345"
+                )
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["available_places"], 1)
@@ -0,0 +1,146 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import (
+    ArchivedAttendance,
+    ArchivedMeeting,
+    Meeting,
+    MeetingRecommendation,
+    MentorSession,
+)
+from mentorizon.search import search
+
+
+class ArchiveMeetingsTest(TestCase):
+
+    def setUp(self) -> None:
+        self.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko"
+        )
+        self.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+        self.past_meetings = [
+            self.create_meeting(f"Past {index}", days=-10 - index)
+            for index in range(5)
+        ]
+        self.upcoming_meeting = self.create_meeting("Upcoming", days=1)
+
+    def create_meeting(self, topic: str, days: int) -> Meeting:
+        meeting = Meeting.objects.create(
+            topic=topic,
+            date=timezone.now() + timezone.timedelta(days=days),
+            description="Test meeting",
+            limit_of_participants=3,
+            link="google.com"
+        )
+        MentorSession.objects.create(mentor=self.mentor, meeting=meeting)
+        meeting.participants.add(self.user)
+        return meeting
+
+    def archive(self, **options) -> None:
+        call_command(
+            "archive_meetings", sleep=0, stdout=StringIO(), **options
+        )
+
+    def test_moves_past_meetings_in_batches(self):
+        self.archive(batch_size=2)
+
+        self.assertEqual(
+            list(Meeting._base_manager.all()), [self.upcoming_meeting]
+        )
+        self.assertEqual(
+            list(MentorSession._base_manager.values_list(
+                "meeting_id", flat=True
+            )),
+            [self.upcoming_meeting.id]
+        )
+        self.assertEqual(
+            list(Meeting.participants.through.objects.values_list(
+                "meeting_id", flat=True
+            )),
+            [self.upcoming_meeting.id]
+        )
+        archived = ArchivedMeeting.objects.get(id=self.past_meetings[0].id)
+        self.assertEqual(archived.topic, "Past 0")
+        self.assertEqual(archived.mentor, self.mentor)
+        self.assertEqual(archived.participants_count, 1)
+        self.assertEqual(ArchivedMeeting.objects.count(), 5)
+        self.assertEqual(
+            ArchivedAttendance.objects.filter(user=self.user).count(), 5
+        )
+
+    def test_recent_meetings_are_kept(self):
+        self.archive(days=11)
+
+        self.assertEqual(
+            set(ArchivedMeeting.objects.values_list("topic", flat=True)),
+            {"Past 1", "Past 2", "Past 3", "Past 4"}
+        )
+        self.assertTrue(
+            Meeting._base_manager.filter(topic="Past 0").exists()
+        )
+
+    def test_recommended_meetings_are_archived(self):
+        MeetingRecommendation.objects.create(
+            user=self.mentor, meeting=self.past_meetings[0], score=1
+        )
+        MeetingRecommendation.objects.create(
+            user=self.mentor, meeting=self.upcoming_meeting, score=1
+        )
+
+        self.archive()
+
+        self.assertEqual(
+            list(MeetingRecommendation.objects.values_list(
+                "meeting_id", flat=True
+            )),
+            [self.upcoming_meeting.id]
+        )
+        # foreign keys are only checked on commit, which TestCase skips
+        connection.check_constraints()
+
+    def test_archived_meetings_leave_search_index(self):
+        self.archive()
+
+        self.assertFalse(
+            search(Meeting._base_manager.all(), "Past").exists()
+        )
+
+    def test_past_meetings_view(self):
+        self.archive(days=11)
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("mentorizon:past-meetings"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [meeting.topic for meeting in response.context["meeting_list"]],
+            ["Past 1", "Past 2", "Past 3", "Past 4"]
+        )
+        # not archived yet
+        self.assertEqual(
+            [meeting.topic for meeting in response.context["recent_meetings"]],
+            ["Past 0"]
+        )
+        self.assertNotContains(response, "Upcoming")
+
+    def test_past_meetings_of_other_users_hidden(self):
+        self.archive()
+        other_user = get_user_model().objects.create_user(
+            username="other", password="test12345"
+        )
+        self.client.force_login(other_user)
+
+        response = self.client.get(reverse("mentorizon:past-meetings"))
+
+        self.assertContains(response, "You have no past meetings yet.")
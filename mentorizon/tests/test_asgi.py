@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import Meeting, MentorSession, Sphere
+
+
+class AsgiTest(TestCase):
+    """The views are sync; exercise them through the ASGI request
+    handler, which runs them in a thread."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=Sphere.objects.create(name="Art")
+        )
+        cls.meeting = Meeting.objects.create(
+            topic="Painting",
+            date=timezone.now() + timezone.timedelta(days=1),
+            description="Test meeting",
+            limit_of_participants=2,
+            link="google.com"
+        )
+        MentorSession.objects.create(mentor=cls.mentor, meeting=cls.meeting)
+        cls.meeting.participants.add(cls.mentor)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    async def test_login_required(self):
+        for url in (
+            reverse("mentorizon:index"),
+            reverse("mentorizon:meeting-list"),
+            reverse("mentorizon:mentor-detail", kwargs={"pk": 1}),
+        ):
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response.url.startswith(reverse("login")))
+
+    async def test_read_views(self):
+        await sync_to_async(self.async_client.force_login)(self.mentor)
+        pages = {
+            reverse("mentorizon:index"): "Spheres",
+            reverse("mentorizon:meeting-list"): "Painting",
+            reverse("mentorizon:mentor-list"): "Ivanenko",
+            reverse("mentorizon:sphere-list"): "Art",
+            reverse(
+                "mentorizon:meeting-detail", kwargs={"pk": self.meeting.id}
+            ): "Painting",
+            reverse(
+                "mentorizon:mentor-detail", kwargs={"pk": self.mentor.id}
+            ): "Painting",
+            reverse(
+                "mentorizon:user-detail", kwargs={"pk": self.mentor.id}
+            ): "Painting",
+        }
+        for url, text in pages.items():
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertContains(response, text)
+
+    async def test_missing_object(self):
+        await sync_to_async(self.async_client.force_login)(self.mentor)
+
+        response = await self.async_client.get(
+            reverse("mentorizon:meeting-detail", kwargs={"pk": 0})
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mentorizon.auth import CachedModelBackend
+
+
+@override_settings(
+    AUTH_USER_CACHE=True,
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+)
+class CachedAuthenticationTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="user",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko"
+        )
+        self.backend = CachedModelBackend()
+
+    def test_authenticated_request_queries_no_session_nor_user(self):
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("mentorizon:index"))
+
+        self.assertEqual(response.status_code, 200)
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertNotIn("django_session", sql)
+        self.assertNotIn(
+            f'WHERE "mentorizon_user"."id" = {self.user.id}', sql
+        )
+
+    def test_falls_back_to_database(self):
+        self.client.force_login(self.user)
+        cache.clear()
+
+        response = self.client.get(reverse("mentorizon:index"))
+
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            self.backend.get_user(self.user.id)
+
+    def test_saving_user_drops_cached_user(self):
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("mentorizon:user-update", args=[self.user.id]),
+            {
+                "first_name": "Petro",
+                "last_name": "Ivanenko",
+                "years_of_experience": 0,
+            }
+        )
+
+        self.assertEqual(
+            self.backend.get_user(self.user.id).first_name, "Petro"
+        )
+
+    def test_cached_user_has_no_related_objects(self):
+        self.user.rating
+        self.client.force_login(self.user)
+
+        with self.assertNumQueries(1):
+            self.backend.get_user(self.user.id).rating
+
+    def test_password_change_logs_sessions_out(self):
+        self.client.force_login(self.user)
+        self.user.set_password("new12345")
+        self.user.save()
+
+        response = self.client.get(reverse("mentorizon:index"))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_inactive_user_is_not_authenticated(self):
+        self.client.force_login(self.user)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+        cached = self.backend.get_user(self.user.id)
+        cached.is_active = False
+        cache.set(f"auth:user:{self.user.id}", cached)
+
+        self.assertIsNone(self.backend.get_user(self.user.id))
+
+    def test_sessions_of_model_backend_stay_logged_in(self):
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+
+        response = self.client.get(reverse("mentorizon:index"))
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(AUTH_USER_CACHE=False)
+    def test_user_not_cached_in_process_local_cache(self):
+        self.client.force_login(self.user)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.user.id), self.user)
+        self.assertIsNone(cache.get(f"auth:user:{self.user.id}"))
@@ -0,0 +1,387 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, OperationalError
+from django.test import override_settings, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.forms import MeetingUpdateForm
+from mentorizon.models import (
+    Meeting,
+    MentorSession,
+    Sphere,
+    WaitlistEntry,
+)
+
+
+def create_meeting(limit_of_participants: int) -> Meeting:
+    return Meeting.objects.create(
+        topic="Test meeting",
+        date=timezone.now() + timezone.timedelta(days=1),
+        description="This is a test",
+        limit_of_participants=limit_of_participants,
+        link="google.com"
+    )
+
+
+def create_users(number: int) -> list:
+    return [
+        get_user_model().objects.create_user(
+            username=f"user{index}",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko"
+        )
+        for index in range(number)
+    ]
+
+
+class BookingTest(TestCase):
+
+    def setUp(self) -> None:
+        self.meeting = create_meeting(limit_of_participants=1)
+        self.user, self.other_user = create_users(2)
+
+    def test_book_until_full(self):
+        self.assertTrue(self.meeting.book(self.user.id))
+        self.assertFalse(self.meeting.book(self.other_user.id))
+        self.meeting.refresh_from_db()
+
+        self.assertEqual(self.meeting.available_places, 0)
+        self.assertEqual(self.meeting.participants.count(), 1)
+
+    def test_book_twice(self):
+        self.meeting.limit_of_participants = 2
+        self.meeting.available_places = 2
+        self.meeting.save()
+
+        self.assertTrue(self.meeting.book(self.user.id))
+        self.assertFalse(self.meeting.book(self.user.id))
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.available_places, 1)
+
+    def test_unbook_releases_place(self):
+        self.meeting.book(self.user.id)
+
+        self.assertTrue(self.meeting.unbook(self.user.id))
+        self.assertFalse(self.meeting.unbook(self.user.id))
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.available_places, 1)
+
+    def test_related_manager_changes_keep_counter(self):
+        self.meeting.participants.add(self.user)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.available_places, 0)
+
+        self.user.meetings.remove(self.meeting)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.available_places, 1)
+
+
+class MeetingUpdateTest(TestCase):
+
+    def setUp(self) -> None:
+        self.meeting = create_meeting(limit_of_participants=3)
+        self.mentor, self.first, self.second = create_users(3)
+        self.mentor.mentor_sphere = Sphere.objects.create(name="Art")
+        self.mentor.save()
+        MentorSession.objects.create(mentor=self.mentor, meeting=self.meeting)
+        self.meeting.book(self.first.id)
+        self.client.force_login(self.mentor)
+
+    def test_lowering_limit_below_late_booking(self):
+        clean = MeetingUpdateForm.clean_limit_of_participants
+
+        def clean_then_book(form):
+            # a booking landing after the form counted the participants
+            limit = clean(form)
+            self.meeting.book(self.second.id)
+            return limit
+
+        with mock.patch.object(
+            MeetingUpdateForm, "clean_limit_of_participants", clean_then_book
+        ):
+            response = self.client.post(
+                reverse("mentorizon:meeting-update", args=[self.meeting.id]),
+                {
+                    "topic": "New topic",
+                    "date": self.meeting.date.strftime("%Y-%m-%d %H:%M"),
+                    "description": self.meeting.description,
+                    "limit_of_participants": 1,
+                    "link": "https://google.com",
+                }
+            )
+
+        self.assertContains(
+            response, "current number of participants: 2"
+        )
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.topic, "Test meeting")
+        self.assertEqual(self.meeting.limit_of_participants, 3)
+        self.assertEqual(self.meeting.available_places, 1)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class ConcurrentBookingTest(TransactionTestCase):
+    limit_of_participants = 5
+    number_of_users = 40
+
+    def book_with_retries(self, meeting_id, user_id, barrier, results):
+        barrier.wait()
+        meeting = Meeting(pk=meeting_id)
+        try:
+            for _ in range(200):
+                try:
+                    results.append(meeting.book(user_id))
+                    return
+                except OperationalError:
+                    # SQLite reports lock contention instead of waiting
+                    continue
+        finally:
+            connection.close()
+
+    def test_limit_is_never_exceeded(self):
+        meeting = create_meeting(self.limit_of_participants)
+        users = create_users(self.number_of_users)
+        barrier = threading.Barrier(self.number_of_users)
+        results = []
+        threads = [
+            threading.Thread(
+                target=self.book_with_retries,
+                args=(meeting.id, user.id, barrier, results)
+            )
+            for user in users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        meeting.refresh_from_db()
+
+        self.assertEqual(len(results), self.number_of_users)
+        self.assertEqual(results.count(True), self.limit_of_participants)
+        self.assertEqual(
+            meeting.participants.count(), self.limit_of_participants
+        )
+        self.assertEqual(meeting.available_places, 0)
+
+
+class WaitlistTest(TestCase):
+
+    def setUp(self) -> None:
+        self.meeting = create_meeting(limit_of_participants=1)
+        self.participant, self.first, self.second = create_users(3)
+        self.meeting.book(self.participant.id)
+
+    def waiting_user_ids(self) -> list:
+        return list(
+            self.meeting.waitlist.values_list("user_id", flat=True)
+        )
+
+    def test_join_full_meeting_only(self):
+        self.assertFalse(self.meeting.join_waitlist(self.participant.id))
+        self.assertTrue(self.meeting.join_waitlist(self.first.id))
+        self.assertFalse(self.meeting.join_waitlist(self.first.id))
+        self.meeting.leave_waitlist(self.first.id)
+        self.meeting.unbook(self.participant.id)
+
+        self.assertFalse(self.meeting.join_waitlist(self.second.id))
+        self.assertEqual(self.waiting_user_ids(), [])
+
+    def test_unbook_promotes_head(self):
+        self.meeting.join_waitlist(self.first.id)
+        self.meeting.join_waitlist(self.second.id)
+
+        self.meeting.unbook(self.participant.id)
+
+        self.meeting.refresh_from_db()
+        self.assertEqual(
+            list(self.meeting.participants.values_list("id", flat=True)),
+            [self.first.id]
+        )
+        self.assertEqual(self.meeting.available_places, 0)
+        self.assertEqual(self.waiting_user_ids(), [self.second.id])
+
+    def test_leave_waitlist(self):
+        self.meeting.join_waitlist(self.first.id)
+
+        self.assertTrue(self.meeting.leave_waitlist(self.first.id))
+        self.assertFalse(self.meeting.leave_waitlist(self.first.id))
+        self.meeting.unbook(self.participant.id)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.available_places, 1)
+
+    def test_raising_limit_promotes(self):
+        mentor = get_user_model().objects.create_user(
+            username="mentor", password="test12345"
+        )
+        MentorSession.objects.create(mentor=mentor, meeting=self.meeting)
+        self.meeting.join_waitlist(self.first.id)
+        self.meeting.join_waitlist(self.second.id)
+        self.client.force_login(mentor)
+
+        self.client.post(
+            reverse("mentorizon:meeting-update", args=[self.meeting.id]),
+            {
+                "topic": self.meeting.topic,
+                "date": self.meeting.date.strftime("%Y-%m-%d %H:%M"),
+                "description": self.meeting.description,
+                "limit_of_participants": 2,
+                "link": "https://google.com",
+            }
+        )
+
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.limit_of_participants, 2)
+        self.assertEqual(self.meeting.available_places, 0)
+        self.assertEqual(self.waiting_user_ids(), [self.second.id])
+
+    def admin_change(self, limit: int, **data):
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="test12345"
+        )
+        self.client.force_login(admin)
+        return self.client.post(
+            reverse("admin:mentorizon_meeting_change", args=[self.meeting.id]),
+            {
+                "topic": self.meeting.topic,
+                "date_0": self.meeting.date.strftime("%Y-%m-%d"),
+                "date_1": self.meeting.date.strftime("%H:%M:%S"),
+                "description": self.meeting.description,
+                "participants": [
+                    user.id for user in self.meeting.participants.all()
+                ],
+                "limit_of_participants": limit,
+                "link": "https://google.com",
+                **data
+            }
+        )
+
+    def test_admin_limit_change_promotes(self):
+        self.meeting.join_waitlist(self.first.id)
+        self.meeting.join_waitlist(self.second.id)
+
+        self.admin_change(limit=2, available_places=100)
+
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.limit_of_participants, 2)
+        self.assertEqual(self.meeting.available_places, 0)
+        self.assertEqual(
+            set(self.meeting.participants.values_list("id", flat=True)),
+            {self.participant.id, self.first.id}
+        )
+        self.assertEqual(self.waiting_user_ids(), [self.second.id])
+
+    def test_admin_limit_below_participants(self):
+        self.meeting.change_limit(2)
+        self.meeting.book(self.first.id)
+
+        response = self.admin_change(limit=1)
+
+        self.assertContains(response, "number of participants: 2")
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.limit_of_participants, 2)
+        self.assertEqual(self.meeting.available_places, 0)
+
+    def test_book_button_toggles_waitlist(self):
+        MentorSession.objects.create(
+            mentor=get_user_model().objects.create_user(
+                username="mentor", password="test12345"
+            ),
+            meeting=self.meeting
+        )
+        self.client.force_login(self.first)
+        url = reverse("mentorizon:book-meeting", args=[self.meeting.id])
+
+        self.client.post(url)
+        self.assertEqual(self.waiting_user_ids(), [self.first.id])
+        response = self.client.get(
+            reverse("mentorizon:meeting-detail", args=[self.meeting.id])
+        )
+        self.assertContains(response, "You are number 1 on the waitlist.")
+
+        self.client.post(url)
+        self.assertEqual(self.waiting_user_ids(), [])
+
+    def test_detail_revalidates_waitlist_position(self):
+        MentorSession.objects.create(
+            mentor=get_user_model().objects.create_user(
+                username="mentor", password="test12345"
+            ),
+            meeting=self.meeting
+        )
+        self.meeting.join_waitlist(self.first.id)
+        self.meeting.join_waitlist(self.second.id)
+        self.client.force_login(self.second)
+        url = reverse("mentorizon:meeting-detail", args=[self.meeting.id])
+        # the first visit sets the CSRF cookie, part of the ETag
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertContains(response, "You are number 2 on the waitlist.")
+
+        self.meeting.leave_waitlist(self.first.id)
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertContains(response, "You are number 1 on the waitlist.")
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class ConcurrentPromotionTest(TransactionTestCase):
+    limit_of_participants = 5
+    number_waiting = 8
+
+    def unbook_with_retries(self, meeting_id, user_id, barrier):
+        barrier.wait()
+        meeting = Meeting(pk=meeting_id)
+        try:
+            for _ in range(200):
+                try:
+                    meeting.unbook(user_id)
+                    return
+                except OperationalError:
+                    # SQLite reports lock contention instead of waiting
+                    continue
+        finally:
+            connection.close()
+
+    def test_no_double_promotions(self):
+        meeting = create_meeting(self.limit_of_participants)
+        users = create_users(self.limit_of_participants + self.number_waiting)
+        participants = users[:self.limit_of_participants]
+        waiting = users[self.limit_of_participants:]
+        for user in participants:
+            meeting.book(user.id)
+        for user in waiting:
+            meeting.join_waitlist(user.id)
+        barrier = threading.Barrier(len(participants))
+        threads = [
+            threading.Thread(
+                target=self.unbook_with_retries,
+                args=(meeting.id, user.id, barrier)
+            )
+            for user in participants
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        meeting.refresh_from_db()
+
+        # the seats went to the head of the queue, once each
+        self.assertEqual(
+            sorted(meeting.participants.values_list("id", flat=True)),
+            [user.id for user in waiting[:self.limit_of_participants]]
+        )
+        self.assertEqual(meeting.available_places, 0)
+        self.assertEqual(
+            list(WaitlistEntry.objects.values_list("user_id", flat=True)),
+            [user.id for user in waiting[self.limit_of_participants:]]
+        )
@@ -0,0 +1,141 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon import caching
+from mentorizon.models import Meeting, MentorSession, Sphere
+
+
+class DashboardCountersTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.sphere = Sphere.objects.create(name="Art")
+        get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=self.sphere
+        )
+
+    def test_counters_are_cached(self):
+        counters = caching.get_dashboard_counters()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(caching.get_dashboard_counters(), counters)
+        self.assertEqual(
+            counters,
+            {"num_mentors": 1, "num_meetings": 0, "num_spheres": 1}
+        )
+
+    def test_counters_invalidated_on_commit(self):
+        caching.get_dashboard_counters()
+        with self.captureOnCommitCallbacks(execute=True):
+            Sphere.objects.create(name="Languages")
+
+        self.assertEqual(caching.get_dashboard_counters()["num_spheres"], 2)
+
+    def test_login_does_not_invalidate_mentors_counter(self):
+        caching.get_dashboard_counters()
+        user = get_user_model().objects.get(username="mentor")
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(update_fields=["last_login"])
+
+        with self.assertNumQueries(0):
+            caching.get_dashboard_counters()
+
+    def test_meetings_counter_expires_when_next_meeting_starts(self):
+        Meeting.objects.create(
+            topic="Test",
+            date=timezone.now() + timezone.timedelta(seconds=90),
+            description="Test meeting",
+            limit_of_participants=2,
+            link="google.com"
+        )
+        count, timeout = caching._count_meetings()
+
+        self.assertEqual(count, 1)
+        self.assertLessEqual(timeout, 91)
+
+    def test_concurrent_miss_serves_stale_value(self):
+        caching.get_dashboard_counters()
+        caching.invalidate_dashboard_counters("num_spheres")
+        cache.add("dashboard:num_spheres:lock", True)
+
+        with mock.patch.dict(
+            caching.DASHBOARD_COUNTERS, num_spheres=mock.Mock()
+        ) as counters:
+            self.assertEqual(
+                caching.get_dashboard_counters()["num_spheres"], 1
+            )
+            counters["num_spheres"].assert_not_called()
+
+
+class CardFragmentCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        sphere = Sphere.objects.create(name="Art")
+        self.mentor, self.user = (
+            get_user_model().objects.create_user(
+                username=username,
+                password="test12345",
+                first_name="Ivan",
+                last_name=last_name,
+                mentor_sphere=sphere
+            )
+            for username, last_name in (
+                ("mentor", "Ivanenko"), ("user", "Petrenko")
+            )
+        )
+        self.meeting = Meeting.objects.create(
+            topic="Painting",
+            date=timezone.now() + timezone.timedelta(days=1),
+            description="Test meeting",
+            limit_of_participants=2,
+            link="google.com"
+        )
+        MentorSession.objects.create(mentor=self.mentor, meeting=self.meeting)
+        self.client.force_login(self.user)
+
+    def test_card_cached_until_version_bump(self):
+        url = reverse("mentorizon:meeting-list")
+        self.client.get(url)
+        Meeting.objects.filter(pk=self.meeting.pk).update(topic="Drawing")
+
+        self.assertContains(self.client.get(url), "Painting")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor.last_name = "Sydorenko"
+            self.mentor.save()
+        response = self.client.get(url)
+        self.assertContains(response, "Drawing")
+        self.assertContains(response, "Sydorenko")
+
+    @override_settings(CACHE_VERSION_TIMEOUT=60)
+    def test_versions_expire(self):
+        names = ("meetings", "mentors", "spheres")
+        versions = caching.collection_versions(*names)
+        key = caching.card_key(self.meeting)
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            later_versions = caching.collection_versions(*names)
+            later_key = caching.card_key(self.meeting)
+
+        for name in names:
+            self.assertNotEqual(later_versions[name], versions[name])
+        self.assertNotEqual(later_key, key)
+
+    def test_viewer_specific_parts_not_cached(self):
+        url = reverse("mentorizon:meeting-list")
+
+        self.assertContains(self.client.get(url), "Book")
+        self.client.force_login(self.mentor)
+        response = self.client.get(url)
+        self.assertContains(response, "You are the mentor!")
+        self.assertNotContains(response, ">Book<")
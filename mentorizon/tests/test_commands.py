@@ -0,0 +1,110 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+from django.test import TestCase
+
+from mentorizon.models import (
+    Meeting,
+    MentorRanking,
+    Rating,
+    RatingVote,
+    Sphere,
+    SphereStats,
+)
+
+
+class RebuildRatingsCommandTest(TestCase):
+
+    def setUp(self) -> None:
+        self.sphere = Sphere.objects.create(name="Art")
+        self.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=self.sphere
+        )
+        self.voter = get_user_model().objects.create_user(
+            username="voter",
+            password="test12345",
+            first_name="Vasyl",
+            last_name="Vasylenko"
+        )
+        RatingVote.objects.create(
+            rating=self.mentor.rating, voter=self.voter, rate=3
+        )
+
+    def test_check_reports_drift(self):
+        with self.assertRaises(CommandError):
+            call_command("rebuild_ratings", "--check", stdout=StringIO())
+
+    def test_rebuild_fixes_drift(self):
+        call_command("rebuild_ratings", stdout=StringIO())
+        rating = Rating.objects.get(mentor=self.mentor)
+
+        self.assertEqual(rating.votes_count, 1)
+        self.assertEqual(rating.votes_sum, 3)
+        self.assertEqual(rating.average, 3.0)
+        call_command("rebuild_ratings", "--check", stdout=StringIO())
+
+    def test_rebuild_refreshes_stats_and_leaderboard(self):
+        call_command("rebuild_ratings", stdout=StringIO())
+
+        stats = SphereStats.objects.get(sphere=self.sphere)
+        self.assertEqual((stats.votes_count, stats.votes_sum), (1, 3))
+        ranking = MentorRanking.objects.get(mentor=self.mentor)
+        self.assertEqual((ranking.votes_count, ranking.average), (1, 3.0))
+
+
+class GenerateLoadCommandTest(TestCase):
+    options = {
+        "spheres": 3,
+        "mentors": 10,
+        "users": 15,
+        "meetings": 40,
+        "votes": 100,
+        "batch_size": 7,
+        "stdout": StringIO(),
+    }
+
+    def test_generates_consistent_dataset(self):
+        call_command("generate_load", **self.options)
+
+        self.assertEqual(
+            get_user_model().objects.filter(
+                mentor_sphere__isnull=False
+            ).count(),
+            10
+        )
+        self.assertEqual(Rating.objects.count(), 25)
+        self.assertEqual(RatingVote.objects.count(), 100)
+        self.assertEqual(Meeting._base_manager.count(), 40)
+        call_command("rebuild_ratings", "--check", stdout=StringIO())
+        self.assertFalse(
+            Meeting._base_manager.annotate(
+                number_of_participants=Count("participants")
+            ).exclude(
+                available_places=F("limit_of_participants")
+                - F("number_of_participants")
+            ).exists()
+        )
+
+    def test_deterministic_for_seed(self):
+        call_command("generate_load", prefix="first", **self.options)
+        call_command("generate_load", prefix="second", **self.options)
+
+        def votes(prefix):
+            return list(RatingVote.objects.filter(
+                voter__username__startswith=prefix
+            ).order_by("id").values_list("rate", flat=True))
+
+        self.assertEqual(votes("first_"), votes("second_"))
+
+    def test_refuses_existing_prefix(self):
+        call_command("generate_load", **self.options)
+
+        with self.assertRaises(CommandError):
+            call_command("generate_load", **self.options)
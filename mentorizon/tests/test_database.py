@@ -0,0 +1,85 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, OperationalError
+from django.db.models import Sum
+from django.test import override_settings, TestCase, TransactionTestCase
+
+from mentorizon.models import Rating, RatingVote
+
+
+class SqlitePragmasTest(TestCase):
+
+    def test_pragmas_applied_to_connection(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite pragmas")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            busy_timeout = cursor.fetchone()[0]
+            cursor.execute("PRAGMA synchronous")
+            synchronous = cursor.fetchone()[0]
+
+        self.assertEqual(
+            busy_timeout, settings.SQLITE_PRAGMAS["busy_timeout"]
+        )
+        # 1 is NORMAL
+        self.assertEqual(synchronous, 1)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class ConcurrentVotingTest(TransactionTestCase):
+    number_of_voters = 10
+
+    def vote_with_retries(self, rating_id, voter_id, rate, barrier):
+        barrier.wait()
+        rating = Rating(pk=rating_id)
+        try:
+            for _ in range(200):
+                try:
+                    rating.vote(voter_id=voter_id, rate=rate)
+                    return
+                except OperationalError:
+                    # the in-memory test database reports lock
+                    # contention instead of waiting
+                    continue
+        finally:
+            connection.close()
+
+    def test_aggregates_match_votes(self):
+        mentor = get_user_model().objects.create_user(
+            username="mentor", password="test12345"
+        )
+        voters = [
+            get_user_model().objects.create_user(
+                username=f"voter{number}", password="test12345"
+            )
+            for number in range(self.number_of_voters)
+        ]
+        # every voter votes twice at the same time
+        votes = [
+            (voter.id, rate) for voter in voters for rate in (1, 5)
+        ]
+        barrier = threading.Barrier(len(votes))
+        threads = [
+            threading.Thread(
+                target=self.vote_with_retries,
+                args=(mentor.rating.id, *vote, barrier)
+            )
+            for vote in votes
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        rating = Rating.objects.get(mentor=mentor)
+
+        self.assertEqual(rating.votes_count, self.number_of_voters)
+        self.assertEqual(
+            rating.votes_sum,
+            RatingVote.objects.filter(rating=rating).aggregate(
+                total=Sum("rate")
+            )["total"]
+        )
@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon import feeds
+from mentorizon.feeds import calendar_token
+from mentorizon.models import Meeting, MentorSession, Sphere
+
+
+class CalendarFeedTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=Sphere.objects.create(name="Art")
+        )
+        cls.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+        cls.attended = cls.create_meeting("Painting, oils", days=2)
+        cls.attended.participants.add(cls.user)
+        cls.other = cls.create_meeting("Sculpture", days=3)
+        cls.create_meeting("Past drawing", days=-1)
+
+    @classmethod
+    def create_meeting(cls, topic: str, days: int) -> Meeting:
+        meeting = Meeting.objects.create(
+            topic=topic,
+            date=timezone.now() + timezone.timedelta(days=days),
+            description="Bring brushes;\nand paper",
+            limit_of_participants=3,
+            link="https://example.com/room"
+        )
+        MentorSession.objects.create(mentor=cls.mentor, meeting=meeting)
+        return meeting
+
+    def feed_url(self, user, mentor=None, token=None) -> str:
+        kwargs = {"pk": user.id, "token": token or calendar_token(user)}
+        if mentor is None:
+            return reverse("mentorizon:user-calendar", kwargs=kwargs)
+        return reverse(
+            "mentorizon:mentor-calendar",
+            kwargs={**kwargs, "mentor_pk": mentor.id}
+        )
+
+    def get_feed(self, url: str, **headers) -> tuple:
+        response = self.client.get(url, **headers)
+        content = b"".join(response.streaming_content).decode()
+        return response, content
+
+    def test_user_feed_lists_attended_meetings(self):
+        response, content = self.get_feed(self.feed_url(self.user))
+
+        self.assertEqual(
+            response["Content-Type"], "text/calendar; charset=utf-8"
+        )
+        self.assertTrue(content.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(content.endswith("END:VCALENDAR\r\n"))
+        self.assertIn(f"UID:meeting-{self.attended.id}@testserver", content)
+        self.assertIn(r"SUMMARY:Painting\, oils", content)
+        self.assertIn(
+            r"DESCRIPTION:by Ivan Ivanenko\n\nBring brushes\;\nand paper",
+            content
+        )
+        self.assertNotIn("Sculpture", content)
+        self.assertNotIn("Past drawing", content)
+
+    def test_mentor_feeds_list_mentored_meetings(self):
+        for url in (
+            self.feed_url(self.mentor),
+            self.feed_url(self.user, mentor=self.mentor),
+        ):
+            with self.subTest(url=url):
+                _, content = self.get_feed(url)
+
+                self.assertEqual(content.count("BEGIN:VEVENT"), 2)
+
+    def test_link_only_for_participants(self):
+        _, content = self.get_feed(self.feed_url(self.user, self.mentor))
+
+        self.assertEqual(content.count("LOCATION:https://example.com/room"), 1)
+        self.assertIn(
+            f"URL:http://testserver/meeting/{self.other.id}/", content
+        )
+
+    def test_events_are_streamed_in_chunks(self):
+        original_chunk_size = feeds.CHUNK_SIZE
+        feeds.CHUNK_SIZE = 1
+        self.addCleanup(setattr, feeds, "CHUNK_SIZE", original_chunk_size)
+
+        response = self.client.get(self.feed_url(self.mentor))
+
+        self.assertTrue(response.streaming)
+        # header, one chunk per event, footer
+        self.assertEqual(len(list(response.streaming_content)), 4)
+
+    async def test_asgi_feed_is_built_in_the_view(self):
+        response = await self.async_client.get(self.feed_url(self.mentor))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        content = response.content.decode()
+        self.assertEqual(content.count("BEGIN:VEVENT"), 2)
+        self.assertTrue(content.endswith("END:VCALENDAR\r\n"))
+
+    def test_wrong_token(self):
+        response = self.client.get(self.feed_url(self.user, token="0" * 64))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_password_change_revokes_token(self):
+        url = self.feed_url(self.user)
+        self.user.set_password("new12345")
+        self.user.save()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_revalidation(self):
+        url = self.feed_url(self.user)
+        response, _ = self.get_feed(url)
+        etag = response["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.attended.unbook(self.user.id)
+        response, content = self.get_feed(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("BEGIN:VEVENT", content)
+
+    def test_long_lines_are_folded(self):
+        line = feeds._fold("DESCRIPTION:" + "é" * 100)
+
+        physical_lines = line.split(b"\r\n")[:-1]
+        self.assertTrue(all(
+            len(physical_line) <= feeds.MAX_LINE_OCTETS
+            for physical_line in physical_lines
+        ))
+        self.assertEqual(
+            b"".join(
+                physical_line.removeprefix(b" ")
+                for physical_line in physical_lines
+            ).decode(),
+            "DESCRIPTION:" + "é" * 100
+        )
@@ -0,0 +1,129 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings, TestCase
+from django.urls import reverse
+
+from mentorizon.leaderboard import sphere_prior
+from mentorizon.models import MentorRanking, Sphere
+
+
+@override_settings(
+    LEADERBOARD_PRIOR_VOTES=10,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class LeaderboardTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.art, cls.music = (
+            Sphere.objects.create(name="Art"),
+            Sphere.objects.create(name="Music"),
+        )
+        cls.newcomer, cls.veteran, cls.novice, cls.musician = (
+            get_user_model().objects.create_user(
+                username=username,
+                password="test12345",
+                first_name="Ivan",
+                last_name=username.capitalize(),
+                mentor_sphere=sphere
+            )
+            for username, sphere in (
+                ("newcomer", cls.art),
+                ("veteran", cls.art),
+                ("novice", cls.art),
+                ("musician", cls.music),
+            )
+        )
+        cls.voters = [
+            get_user_model().objects.create_user(
+                username=f"voter{index}", password="test12345"
+            )
+            for index in range(30)
+        ]
+        for voter in cls.voters[:2]:
+            cls.newcomer.rating.vote(voter_id=voter.id, rate=5)
+        for voter in cls.voters:
+            cls.veteran.rating.vote(voter_id=voter.id, rate=4)
+            cls.novice.rating.vote(voter_id=voter.id, rate=3)
+            cls.musician.rating.vote(voter_id=voter.id, rate=3)
+
+    def setUp(self) -> None:
+        cache.clear()
+        call_command("rebuild_leaderboard", stdout=StringIO())
+
+    def test_smoothed_score(self):
+        ranking = MentorRanking.objects.get(mentor=self.newcomer)
+        # the art prior is (2 * 5 + 30 * 4 + 30 * 3) / 62
+        prior = 220 / 62
+
+        self.assertEqual(sphere_prior(self.art.id), prior)
+        self.assertAlmostEqual(ranking.score, (10 * prior + 10) / 12)
+        self.assertEqual(ranking.average, 5.0)
+        self.assertEqual(
+            list(MentorRanking.objects.values_list("mentor", flat=True)),
+            [
+                self.veteran.id,
+                self.newcomer.id,
+                self.novice.id,
+                self.musician.id,
+            ]
+        )
+
+    def test_vote_refreshes_ranking(self):
+        for voter in self.voters[2:]:
+            self.client.force_login(voter)
+            self.client.post(
+                reverse("mentorizon:mentor-rate", args=[self.newcomer.id]),
+                {"rate": 5}
+            )
+
+        ranking = MentorRanking.objects.get(mentor=self.newcomer)
+        self.assertEqual(ranking.votes_count, 30)
+        self.assertEqual(MentorRanking.objects.first(), ranking)
+
+    def test_sphere_change_moves_ranking(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.musician.mentor_sphere = self.art
+            self.musician.save()
+
+        self.assertEqual(
+            MentorRanking.objects.get(mentor=self.musician).sphere, self.art
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.musician.mentor_sphere = None
+            self.musician.save()
+
+        self.assertFalse(
+            MentorRanking.objects.filter(mentor=self.musician).exists()
+        )
+
+    def test_mentor_list_sorted_by_rating(self):
+        self.client.force_login(self.voters[0])
+        url = reverse("mentorizon:mentor-list")
+
+        response = self.client.get(url, {"sort": "rating"})
+        self.assertEqual(
+            list(response.context["mentor_list"]),
+            [self.veteran, self.newcomer, self.novice, self.musician]
+        )
+        self.assertContains(response, "Leaderboard score: 3.89")
+
+        response = self.client.get(url, {"sort": "rating", "name": "Music"})
+        self.assertEqual(
+            list(response.context["mentor_list"]), [self.musician]
+        )
+
+    def test_top_mentors_on_index(self):
+        self.client.force_login(self.voters[0])
+
+        with self.settings(LEADERBOARD_SIZE=2):
+            response = self.client.get(reverse("mentorizon:index"))
+
+        self.assertEqual(
+            [ranking.mentor for ranking in response.context["top_mentors"]],
+            [self.veteran, self.newcomer]
+        )
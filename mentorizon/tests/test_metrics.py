@@ -0,0 +1,108 @@
+import re
+import tempfile
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mentorizon import metrics
+from mentorizon.metrics import MetricsStore, render
+
+
+def sample(text: str, line_start: str) -> float:
+    match = re.search(rf"^{re.escape(line_start)} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else None
+
+
+class MetricsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        patcher = mock.patch.object(metrics, "store", MetricsStore())
+        self.store = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_login(self.user)
+
+    def get_metrics(self) -> str:
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_request_metrics(self):
+        url = reverse("mentorizon:sphere-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        # read before the next request resets the query log
+        number_of_queries = len(queries)
+        text = self.get_metrics()
+        view = 'view="mentorizon:sphere-list"'
+
+        self.assertEqual(sample(
+            text,
+            f'mentorizon_requests_total{{{view},method="GET",status="200"}}'
+        ), 1)
+        self.assertEqual(sample(
+            text, f'mentorizon_request_duration_seconds_count{{{view}}}'
+        ), 1)
+        self.assertEqual(sample(
+            text, f'mentorizon_request_db_queries_sum{{{view}}}'
+        ), number_of_queries)
+        self.assertEqual(sample(
+            text, f'mentorizon_response_size_bytes_sum{{{view}}}'
+        ), len(response.content))
+        self.assertGreater(sample(
+            text, f'mentorizon_template_render_seconds_total{{{view}}}'
+        ), 0)
+
+    async def test_async_view_queries_counted(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+
+        await self.async_client.get(reverse("mentorizon:meeting-list"))
+
+        text = render(self.store.collect())
+        self.assertGreater(sample(
+            text,
+            'mentorizon_request_db_queries_sum'
+            '{view="mentorizon:meeting-list"}'
+        ), 0)
+
+    def test_histogram_buckets_are_cumulative(self):
+        self.store.observe("request_db_queries", (("view", "v"),), 3, (1, 5))
+        text = render(self.store.collect())
+
+        self.assertIn(
+            'mentorizon_request_db_queries_bucket{view="v",le="1"} 0\n'
+            'mentorizon_request_db_queries_bucket{view="v",le="5"} 1\n'
+            'mentorizon_request_db_queries_bucket{view="v",le="+Inf"} 1\n',
+            text
+        )
+
+    def test_processes_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_DIR=directory):
+                other_process = MetricsStore()
+                other_process.inc("request_db_seconds_total", (), 1.5)
+                other_process.flush(force=True)
+                self.store.inc("request_db_seconds_total", (), 2)
+
+                text = render(self.store.collect())
+
+        self.assertEqual(
+            sample(text, "mentorizon_request_db_seconds_total{}"), 3.5
+        )
+
+    def test_only_allowed_addresses(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.1")
+
+        self.assertEqual(response.status_code, 404)
@@ -35,6 +35,32 @@ class MeetingModelTest(TestCase):
 
         self.assertEqual(Meeting.objects.count(), 1)
 
+    def test_with_booking_state(self):
+        meeting = Meeting.objects.create(
+            topic="Test",
+            date=timezone.now() + timezone.timedelta(days=1),
+            description="Test meeting",
+            limit_of_participants=3,
+            link="google.com"
+        )
+        participant, viewer = (
+            get_user_model().objects.create_user(
+                username=username,
+                password="test12345",
+                first_name="Ivan",
+                last_name="Ivanenko"
+            )
+            for username in ("participant", "viewer")
+        )
+        meeting.participants.add(participant)
+
+        as_participant = Meeting.objects.with_booking_state(participant).get()
+        as_viewer = Meeting.objects.with_booking_state(viewer).get()
+
+        self.assertTrue(as_participant.is_participant)
+        self.assertFalse(as_viewer.is_participant)
+        self.assertEqual(as_viewer.participant_count, 1)
+
 
 class MentorSessionModelTest(TestCase):
 
@@ -82,3 +108,41 @@ class UserModelTest(TestCase):
         )
 
         self.assertTrue(Rating.objects.count(), 1)
+
+
+class RatingModelTest(TestCase):
+
+    def setUp(self) -> None:
+        self.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko"
+        )
+        self.voters = [
+            get_user_model().objects.create_user(
+                username=f"voter{number}",
+                password="test12345",
+                first_name="Vasyl",
+                last_name="Vasylenko"
+            )
+            for number in range(2)
+        ]
+
+    def test_vote_updates_aggregates(self):
+        self.mentor.rating.vote(voter_id=self.voters[0].id, rate=5)
+        self.mentor.rating.vote(voter_id=self.voters[1].id, rate=4)
+        rating = Rating.objects.get(mentor=self.mentor)
+
+        self.assertEqual(rating.votes_count, 2)
+        self.assertEqual(rating.votes_sum, 9)
+        self.assertEqual(rating.average, 4.5)
+
+    def test_changed_vote_updates_aggregates(self):
+        self.mentor.rating.vote(voter_id=self.voters[0].id, rate=5)
+        self.mentor.rating.vote(voter_id=self.voters[0].id, rate=2)
+        rating = Rating.objects.get(mentor=self.mentor)
+
+        self.assertEqual(rating.votes_count, 1)
+        self.assertEqual(rating.votes_sum, 2)
+        self.assertEqual(rating.average, 2.0)
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import Meeting, MentorSession, Sphere
+from mentorizon.pagination import KeysetPaginator
+
+
+class KeysetPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        date = timezone.now() + timezone.timedelta(days=1)
+        for index in range(14):
+            Meeting.objects.create(
+                topic=f"Meeting {index}",
+                # pairs of meetings share a date to exercise the id tiebreak
+                date=date + timezone.timedelta(hours=index // 2),
+                description="Test meeting",
+                limit_of_participants=2,
+                link="google.com"
+            )
+
+    def setUp(self) -> None:
+        self.paginator = KeysetPaginator(
+            Meeting.objects.all(), 6, ("date", "id")
+        )
+
+    def test_pages_cover_all_rows_in_order(self):
+        page = self.paginator.page()
+        seen = list(page)
+        while page.has_next():
+            page = self.paginator.page(page.next_cursor)
+            seen.extend(page)
+
+        self.assertEqual(
+            seen, list(Meeting.objects.order_by("date", "id"))
+        )
+
+    def test_previous_page(self):
+        first = self.paginator.page()
+        second = self.paginator.page(first.next_cursor)
+        back = self.paginator.page(second.previous_cursor)
+
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_no_count_query(self):
+        with self.assertNumQueries(1):
+            self.paginator.page()
+
+
+class ListViewPaginationTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        sphere = Sphere.objects.create(name="Art")
+        self.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=sphere
+        )
+        for index in range(8):
+            meeting = Meeting.objects.create(
+                topic=f"Painting {index}",
+                date=timezone.now() + timezone.timedelta(days=index + 1),
+                description="Test meeting",
+                limit_of_participants=2,
+                link="google.com"
+            )
+            MentorSession.objects.create(mentor=self.mentor, meeting=meeting)
+        self.client.force_login(self.mentor)
+
+    def test_cursor_links_keep_search_and_filter(self):
+        url = reverse("mentorizon:meeting-list")
+        response = self.client.get(url, {"topic": "painting", "name": "Art"})
+        next_query = response.context["page_obj"].next_page_query
+
+        self.assertIn("topic=painting", next_query)
+        self.assertIn("name=Art", next_query)
+        next_response = self.client.get(f"{url}?{next_query}")
+        self.assertEqual(len(next_response.context["meeting_list"]), 2)
+        self.assertFalse(next_response.context["page_obj"].has_next())
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            reverse("mentorizon:sphere-list"), {"cursor": "not-a-cursor"}
+        )
+
+        self.assertEqual(response.status_code, 404)
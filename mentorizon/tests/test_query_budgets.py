@@ -0,0 +1,197 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.feeds import calendar_token
+from mentorizon.models import Meeting, MentorSession, Sphere
+from mentorizon.urls import urlpatterns
+
+NUMBER_OF_SPHERES = 5
+NUMBER_OF_MENTORS = 40
+NUMBER_OF_MEETINGS = 120
+PARTICIPANTS_PER_MEETING = 8
+MAX_SECONDS = 0.5
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    AUTH_USER_CACHE=True,
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+)
+class QueryBudgetTest(TestCase):
+    """Every route of the app must stay within its SQL query and
+    wall-clock budget on a realistic dataset. A new route without
+    a budget fails the suite. The viewer's session and user are cached
+    on login, as with a shared cache, so budgets count the queries of
+    the views only. A budget is only raised together with a comment on
+    what the extra queries are for."""
+
+    # route name: (method, max number of queries)
+    budgets = {
+        # three dashboard counters, top mentors and recommendations
+        "index": ("get", 5),
+        "user-create": ("get", 0),
+        # the user, their two lists of meetings and recommendations
+        "user-detail": ("get", 4),
+        "user-update": ("get", 2),
+        "mentor-list": ("get", 3),
+        "meeting-list": ("get", 2),
+        "past-meetings": ("get", 2),
+        "mentor-detail": ("get", 3),
+        "meeting-detail": ("get", 2),
+        # the meeting, then a savepoint around the lock-first update and
+        # the change of the booking and of the places
+        "book-meeting": ("post", 6),
+        "meeting-create": ("get", 0),
+        "meeting-update": ("get", 1),
+        "meeting-delete": ("get", 1),
+        "sphere-create": ("get", 0),
+        # the lock-first update of the rating, its vote, the sphere stats
+        # and the upsert of the mentor's ranking against the sphere prior
+        "mentor-rate": ("post", 11),
+        "sphere-list": ("get", 2),
+        "user-calendar": ("get", 3),
+        # the token's user, the mentor, the feed's ETag and its meetings
+        "mentor-calendar": ("get", 4),
+        "api-meeting-list": ("get", 2),
+        "api-meeting-batch": ("get", 1),
+        "api-mentor-list": ("get", 1),
+        "api-mentor-batch": ("get", 1),
+        "api-sphere-list": ("get", 1),
+        "api-sphere-typeahead": ("get", 1),
+        "api-mentor-typeahead": ("get", 1),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        spheres = [
+            Sphere.objects.create(name=f"Sphere {index}")
+            for index in range(NUMBER_OF_SPHERES)
+        ]
+        cls.mentors = [
+            get_user_model().objects.create_user(
+                username=f"mentor{index}",
+                password="test12345",
+                first_name="Ivan",
+                last_name=f"Ivanenko{index}",
+                mentor_sphere=spheres[index % NUMBER_OF_SPHERES],
+                experience_description="Long experience description " * 20
+            )
+            for index in range(NUMBER_OF_MENTORS)
+        ]
+        cls.meetings = []
+        for index in range(NUMBER_OF_MEETINGS):
+            meeting = Meeting.objects.create(
+                topic=f"Meeting {index}",
+                date=timezone.now() + timezone.timedelta(days=index + 1),
+                description="Meeting description",
+                limit_of_participants=PARTICIPANTS_PER_MEETING + 2,
+                link="google.com"
+            )
+            MentorSession.objects.create(
+                mentor=cls.mentors[index % NUMBER_OF_MENTORS],
+                meeting=meeting
+            )
+            meeting.participants.add(*(
+                cls.mentors[(index + offset) % NUMBER_OF_MENTORS]
+                for offset in range(1, PARTICIPANTS_PER_MEETING + 1)
+            ))
+            cls.meetings.append(meeting)
+        for mentor in cls.mentors[1:]:
+            cls.mentors[0].rating.vote(voter_id=mentor.id, rate=4)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.viewer = self.mentors[1]
+        self.client.force_login(self.viewer)
+
+    def get_url_kwargs(self, name: str) -> dict:
+        mentor_id = self.mentors[0].id
+        viewer_meeting_id = self.meetings[1].id
+        feed = {"pk": self.viewer.id, "token": calendar_token(self.viewer)}
+        return {
+            "user-detail": {"pk": self.viewer.id},
+            "user-update": {"pk": self.viewer.id},
+            "mentor-detail": {"pk": mentor_id},
+            "mentor-rate": {"pk": mentor_id},
+            "meeting-detail": {"pk": self.meetings[0].id},
+            "book-meeting": {"pk": self.meetings[0].id},
+            "meeting-update": {"pk": viewer_meeting_id},
+            "meeting-delete": {"pk": viewer_meeting_id},
+            "user-calendar": feed,
+            "mentor-calendar": {**feed, "mentor_pk": mentor_id},
+        }.get(name, {})
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(
+            set(self.budgets),
+            {pattern.name for pattern in urlpatterns}
+        )
+
+    def test_routes_within_budget(self):
+        request_data = {
+            "mentor-rate": {"rate": 5},
+            "api-meeting-batch": {
+                "ids": ",".join(
+                    str(meeting.id) for meeting in self.meetings[:50]
+                )
+            },
+            "api-mentor-batch": {
+                "ids": ",".join(str(mentor.id) for mentor in self.mentors)
+            },
+            "api-sphere-typeahead": {"q": "sph"},
+            "api-mentor-typeahead": {"q": "iv"},
+        }
+        for name, (method, max_queries) in self.budgets.items():
+            with self.subTest(route=name):
+                if name == "user-create":
+                    self.client.logout()
+                url = reverse(
+                    f"mentorizon:{name}", kwargs=self.get_url_kwargs(name)
+                )
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = getattr(self.client, method)(
+                        url, data=request_data.get(name)
+                    )
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                    elapsed = time.perf_counter() - start
+
+                self.assertLess(response.status_code, 400)
+                self.assertLessEqual(
+                    len(queries),
+                    max_queries,
+                    "\n".join(query["sql"] for query in queries)
+                )
+                self.assertLess(elapsed, MAX_SECONDS)
+                self.client.force_login(self.viewer)
+
+    def test_revalidation_within_budget(self):
+        """A repeat visit of an unchanged page costs one updated_at
+        lookup, the session and the user come from the cache."""
+        for name in (
+            "mentor-list",
+            "meeting-list",
+            "sphere-list",
+            "mentor-detail",
+            "meeting-detail",
+        ):
+            with self.subTest(route=name):
+                url = reverse(
+                    f"mentorizon:{name}", kwargs=self.get_url_kwargs(name)
+                )
+                # the first visit may set the CSRF cookie, part of the ETag
+                self.client.get(url)
+                etag = self.client.get(url)["ETag"]
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 304)
+                self.assertLessEqual(len(queries), 1)
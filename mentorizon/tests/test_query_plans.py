@@ -0,0 +1,143 @@
+import re
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from mentorizon import views
+from mentorizon.models import Meeting, WaitlistEntry
+from mentorizon.recommendations import recommended_meetings
+
+LARGE_TABLES = {
+    "mentorizon_meeting",
+    "mentorizon_meeting_participants",
+    "mentorizon_meetingrecommendation",
+    "mentorizon_mentorranking",
+    "mentorizon_mentorsession",
+    "mentorizon_rating",
+    "mentorizon_ratingvote",
+    "mentorizon_user",
+    "mentorizon_waitlistentry",
+}
+FULL_SCAN = re.compile(r"\bSCAN (\w+)(?! USING (COVERING )?INDEX)")
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN")
+class QueryPlanTest(TestCase):
+    """The main queryset of every view must not fall back to a full
+    scan of a large table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko"
+        )
+
+    def setup_view(self, view_class, params: dict = None, **kwargs):
+        request = RequestFactory().get("/", params or {})
+        request.user = self.user
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view
+
+    def view_queryset(self, view_class, params: dict = None):
+        view = self.setup_view(view_class, params)
+        queryset = view.get_queryset()
+        if hasattr(view, "get_keyset_ordering"):
+            queryset = queryset.order_by(
+                *view.get_keyset_ordering(queryset)
+            )[:view.paginate_by + 1]
+        return queryset
+
+    def assertNoFullScan(self, queryset):
+        plan = queryset.explain()
+        scanned = {
+            table for table, _ in FULL_SCAN.findall(plan)
+        } & LARGE_TABLES
+        self.assertFalse(scanned, f"Full table scan in plan:\n{plan}")
+
+    def test_list_views(self):
+        cases = (
+            (views.MeetingListView, {}),
+            (views.MeetingListView, {"name": "Art"}),
+            (views.MeetingListView, {"topic": "painting"}),
+            (views.MentorListView, {}),
+            (views.MentorListView, {"name": "Art"}),
+            (views.MentorListView, {"last_name": "ivanenko"}),
+            (views.MentorListView, {"sort": "rating"}),
+            (views.MentorListView, {"sort": "rating", "name": "Art"}),
+            (views.SphereListView, {}),
+            (views.SphereListView, {"name": "art"}),
+        )
+        for view_class, params in cases:
+            with self.subTest(view=view_class.__name__, params=params):
+                self.assertNoFullScan(self.view_queryset(view_class, params))
+
+    def test_detail_views(self):
+        for view_class in (
+            views.MeetingDetailView,
+            views.MentorDetailView,
+            views.UserDetailView,
+        ):
+            with self.subTest(view=view_class.__name__):
+                self.assertNoFullScan(
+                    self.view_queryset(view_class).filter(pk=1)
+                )
+
+    def test_profile_meetings(self):
+        self.assertNoFullScan(Meeting.objects.filter(
+            mentor_session__mentor_id=self.user.id
+        ).with_booking_state(self.user))
+        self.assertNoFullScan(
+            Meeting.objects.filter(participants__id=self.user.id)
+        )
+
+    def test_recommendations(self):
+        self.assertNoFullScan(recommended_meetings(self.user))
+
+    def test_waitlist(self):
+        waitlist = WaitlistEntry.objects.filter(meeting_id=1)
+        # head of the queue
+        self.assertNoFullScan(waitlist.order_by("id")[:1])
+        # position of the user
+        self.assertNoFullScan(waitlist.filter(
+            id__lte=waitlist.filter(user_id=self.user.id).values("id")
+        ).order_by())
+
+    def test_dashboard_counters(self):
+        self.assertNoFullScan(
+            get_user_model().objects.filter(mentor_sphere__isnull=False)
+        )
+        self.assertNoFullScan(Meeting.objects.order_by())
+
+    def test_last_update_lookups(self):
+        for view_class in (
+            views.MeetingListView,
+            views.MentorListView,
+            views.SphereListView,
+            views.MeetingDetailView,
+            views.MentorDetailView,
+        ):
+            with self.subTest(view=view_class.__name__):
+                view = self.setup_view(view_class, pk=1)
+                with CaptureQueriesContext(connection) as queries:
+                    view.get_last_update()
+                self.assertEqual(len(queries), 1)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+                    plan = "\n".join(row[-1] for row in cursor.fetchall())
+                scanned = {
+                    table for table, _ in FULL_SCAN.findall(plan)
+                } & LARGE_TABLES
+                self.assertFalse(scanned, f"Full table scan in plan:\n{plan}")
+
+    def test_detects_full_scan(self):
+        with self.assertRaises(AssertionError):
+            self.assertNoFullScan(
+                get_user_model().objects.filter(email="test@example.com")
+            )
@@ -0,0 +1,148 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import (
+    Meeting,
+    MeetingRecommendation,
+    MentorSession,
+    Sphere,
+)
+from mentorizon.recommendations import (
+    build_recommendations,
+    recommended_meetings,
+)
+
+
+class RecommendationsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        art = Sphere.objects.create(name="Art")
+        music = Sphere.objects.create(name="Music")
+        cls.painter = cls.create_user("painter", art)
+        cls.sculptor = cls.create_user("sculptor", art)
+        cls.pianist = cls.create_user("pianist", music)
+        cls.alice = cls.create_user("alice")
+        cls.bob = cls.create_user("bob")
+        cls.painting = cls.create_meeting("Painting", cls.painter)
+        cls.sculpture = cls.create_meeting("Sculpture", cls.sculptor)
+        cls.piano = cls.create_meeting("Piano", cls.pianist)
+        cls.painting.participants.add(cls.alice, cls.bob)
+        cls.sculpture.participants.add(cls.bob)
+
+    @staticmethod
+    def create_user(username: str, sphere: Sphere = None):
+        return get_user_model().objects.create_user(
+            username=username,
+            password="test12345",
+            first_name=username.capitalize(),
+            last_name="Ivanenko",
+            mentor_sphere=sphere
+        )
+
+    @staticmethod
+    def create_meeting(topic: str, mentor, days: int = 5, limit: int = 5):
+        meeting = Meeting.objects.create(
+            topic=topic,
+            date=timezone.now() + timezone.timedelta(days=days),
+            description="Description",
+            limit_of_participants=limit,
+            link="https://example.com/room"
+        )
+        MentorSession.objects.create(mentor=mentor, meeting=meeting)
+        return meeting
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def stored(self, user) -> list:
+        return list(MeetingRecommendation.objects.filter(
+            user=user
+        ).values_list("meeting__topic", flat=True))
+
+    def test_meetings_booked_together(self):
+        build_recommendations()
+
+        self.assertEqual(self.stored(self.alice), ["Sculpture"])
+        self.assertEqual(self.stored(self.bob), [])
+
+    def test_meetings_of_voted_mentors(self):
+        self.pianist.rating.vote(self.alice.id, 5)
+        self.sculptor.rating.vote(self.alice.id, 1)
+        self.sculpture.participants.remove(self.bob)
+
+        build_recommendations()
+
+        # the sculptor's meeting only as a meeting of the sphere
+        self.assertEqual(self.stored(self.alice), ["Piano", "Sculpture"])
+
+    def test_meetings_of_the_sphere(self):
+        newcomer = self.create_user("newcomer", self.pianist.mentor_sphere)
+
+        build_recommendations()
+
+        self.assertEqual(self.stored(newcomer), ["Piano"])
+        # not their own meetings
+        self.assertEqual(self.stored(self.pianist), [])
+        self.assertEqual(self.stored(self.painter), ["Sculpture"])
+
+    def test_only_bookable_meetings(self):
+        full = self.create_meeting("Full sculpture", self.sculptor, 6, 1)
+        full.participants.add(self.painter)
+        past = self.create_meeting("Past sculpture", self.sculptor, -1)
+        past.participants.add(self.bob)
+
+        build_recommendations()
+
+        self.assertEqual(self.stored(self.alice), ["Sculpture"])
+
+    def test_rebuild_replaces_recommendations(self):
+        MeetingRecommendation.objects.create(
+            user=self.bob, meeting=self.piano, score=1
+        )
+
+        out = StringIO()
+        call_command("build_recommendations", "--top-k", "1", stdout=out)
+
+        self.assertEqual(self.stored(self.bob), [])
+        self.assertIn("Stored recommendations for", out.getvalue())
+
+    def test_reads_one_query(self):
+        build_recommendations()
+
+        with self.assertNumQueries(1):
+            recommendations = list(recommended_meetings(self.alice))
+            recommendations[0].meeting.mentor_session.mentor.last_name
+
+        self.assertEqual(
+            [recommendation.meeting for recommendation in recommendations],
+            [self.sculpture]
+        )
+
+    def test_pages_show_recommendations(self):
+        build_recommendations()
+        self.client.force_login(self.alice)
+
+        response = self.client.get(reverse("mentorizon:index"))
+        self.assertContains(response, "Recommended for you")
+        self.assertContains(response, "Sculpture")
+
+        response = self.client.get(
+            reverse("mentorizon:user-detail", args=[self.alice.id])
+        )
+        self.assertContains(response, "Sculpture")
+
+        response = self.client.get(
+            reverse("mentorizon:user-detail", args=[self.bob.id])
+        )
+        self.assertNotContains(response, "Recommended for you")
+
+        self.sculpture.book(self.alice.id)
+        response = self.client.get(reverse("mentorizon:index"))
+        self.assertNotContains(response, "Recommended for you")
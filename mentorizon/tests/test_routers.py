@@ -0,0 +1,186 @@
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import (
+    override_settings,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.auth import CachedModelBackend
+from mentorizon.middleware import (
+    PIN_COOKIE_NAME,
+    replica_pinning_middleware,
+)
+from mentorizon.models import Meeting, MentorSession
+from mentorizon.routers import (
+    begin_request,
+    end_request,
+    PrimaryReplicaRouter,
+)
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class PrimaryReplicaRouterTest(SimpleTestCase):
+
+    def setUp(self) -> None:
+        self.router = PrimaryReplicaRouter()
+        self.token = begin_request(pinned=False)
+
+    def tearDown(self) -> None:
+        end_request(self.token)
+
+    def test_request_reads_from_replica(self):
+        self.assertEqual(self.router.db_for_read(Meeting), "replica")
+        self.assertEqual(self.router.db_for_write(Meeting), "default")
+
+    def test_reads_after_write_use_primary(self):
+        self.router.db_for_write(Meeting)
+
+        self.assertEqual(self.router.db_for_read(Meeting), "default")
+
+    def test_pinned_request_reads_from_primary(self):
+        token = begin_request(pinned=True)
+        try:
+            self.assertEqual(self.router.db_for_read(Meeting), "default")
+        finally:
+            end_request(token)
+
+    def test_other_apps_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Session), "default")
+
+    def test_outside_request_reads_from_primary(self):
+        end_request(self.token)
+        self.token = begin_request(pinned=False)
+        end_request(self.token)
+        try:
+            self.assertEqual(self.router.db_for_read(Meeting), "default")
+        finally:
+            self.token = begin_request(pinned=False)
+
+    def test_replica_is_not_migrated(self):
+        self.assertFalse(
+            self.router.allow_migrate("replica", "mentorizon", "meeting")
+        )
+        self.assertTrue(
+            self.router.allow_migrate("default", "mentorizon", "meeting")
+        )
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_without_replica(self):
+        self.assertEqual(self.router.db_for_read(Meeting), "default")
+
+
+class ReplicaPinningMiddlewareTest(SimpleTestCase):
+
+    def test_write_sets_pin_cookie(self):
+        def view(request):
+            PrimaryReplicaRouter().db_for_write(Meeting)
+            return HttpResponse()
+
+        response = replica_pinning_middleware(view)(
+            RequestFactory().post("/")
+        )
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_read_does_not_pin(self):
+        response = replica_pinning_middleware(lambda request: HttpResponse())(
+            RequestFactory().get("/")
+        )
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    @override_settings(REPLICA_DATABASE="replica")
+    def test_pin_cookie_routes_reads_to_primary(self):
+        databases = []
+
+        def view(request):
+            databases.append(PrimaryReplicaRouter().db_for_read(Meeting))
+            return HttpResponse()
+
+        middleware = replica_pinning_middleware(view)
+        middleware(RequestFactory().get("/"))
+        request = RequestFactory().get("/")
+        request.COOKIES[PIN_COOKIE_NAME] = "1"
+        middleware(request)
+
+        self.assertEqual(databases, ["replica", "default"])
+
+
+@override_settings(
+    DATABASE_ROUTERS=["mentorizon.routers.PrimaryReplicaRouter"]
+)
+class ReadYourWritesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+        cls.meeting = Meeting.objects.create(
+            topic="Painting",
+            date=timezone.now() + timezone.timedelta(days=1),
+            description="Test meeting",
+            limit_of_participants=2,
+            link="google.com"
+        )
+        MentorSession.objects.create(
+            mentor=get_user_model().objects.create_user(
+                username="mentor", password="test12345"
+            ),
+            meeting=cls.meeting
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_booking_pins_user_to_primary(self):
+        response = self.client.post(
+            reverse("mentorizon:book-meeting", kwargs={"pk": self.meeting.id})
+        )
+
+        self.assertEqual(
+            response.cookies[PIN_COOKIE_NAME]["max-age"], 10
+        )
+
+    def test_page_view_does_not_pin(self):
+        response = self.client.get(reverse("mentorizon:meeting-list"))
+
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+
+@override_settings(
+    REPLICA_DATABASE="replica",
+    DATABASE_ROUTERS=["mentorizon.routers.PrimaryReplicaRouter"],
+    AUTH_USER_CACHE=False,
+)
+class AuthenticationRoutingTest(TransactionTestCase):
+    """The tests have no replica database, reading from it fails. Not
+    a TestCase, whose transaction sends every read to the primary."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+        self.backend = CachedModelBackend()
+        self.token = begin_request(pinned=False)
+
+    def tearDown(self) -> None:
+        end_request(self.token)
+
+    def test_users_are_looked_up_on_primary(self):
+        self.assertEqual(self.backend.get_user(self.user.id), self.user)
+        self.assertEqual(
+            self.backend.authenticate(
+                None, username="user", password="test12345"
+            ),
+            self.user
+        )
+        self.assertIsNone(
+            self.backend.authenticate(
+                None, username="user", password="wrong"
+            )
+        )
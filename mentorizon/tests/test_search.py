@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from mentorizon.models import Meeting, Sphere
+from mentorizon.search import install_search_index, search
+
+
+def create_meeting(topic: str, description: str) -> Meeting:
+    return Meeting.objects.create(
+        topic=topic,
+        date=timezone.now() + timezone.timedelta(days=1),
+        description=description,
+        limit_of_participants=2,
+        link="google.com"
+    )
+
+
+class SearchTest(TestCase):
+
+    def setUp(self) -> None:
+        self.in_topic = create_meeting("Painting basics", "Colours")
+        self.in_description = create_meeting("Drawing", "Painting and more")
+        create_meeting("Python", "Programming")
+
+    def test_ranked_prefix_search(self):
+        results = search(Meeting.objects.all(), "paint").order_by(
+            "search_rank"
+        )
+
+        self.assertEqual(list(results), [self.in_topic, self.in_description])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.in_topic.topic = "Sculpture"
+        self.in_topic.description = "Clay"
+        self.in_topic.save()
+        self.in_description.delete()
+
+        self.assertFalse(search(Meeting.objects.all(), "painting").exists())
+        self.assertTrue(search(Meeting.objects.all(), "sculpt").exists())
+
+    def test_query_syntax_is_escaped(self):
+        results = search(Meeting.objects.all(), 'python" OR (NEAR*')
+
+        self.assertFalse(results.exists())
+
+    def test_reinstall_restores_dropped_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER mentorizon_sphere_fts_insert")
+        Sphere.objects.create(name="Languages")
+        install_search_index()
+
+        self.assertTrue(search(Sphere.objects.all(), "lang").exists())
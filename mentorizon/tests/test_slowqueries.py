@@ -0,0 +1,100 @@
+import json
+from contextlib import contextmanager
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.template import Context, Template
+from django.test import override_settings, TestCase
+from django.urls import reverse
+
+from mentorizon.models import Sphere
+from mentorizon.slowqueries import log_slow_query
+
+
+@override_settings(
+    SLOW_QUERY_THRESHOLD_MS=0,
+    SLOW_QUERY_SAMPLE_RATE=1.0,
+    SLOW_QUERY_EXPLAIN=False
+)
+class SlowQueryLogTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+        Sphere.objects.create(name="Art")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    @contextmanager
+    def log_slow_queries(self, logged: bool = True):
+        """Yield the list filled with the logged entries."""
+        entries = []
+        assert_logs = self.assertLogs if logged else self.assertNoLogs
+        with connection.execute_wrapper(log_slow_query), assert_logs(
+            "mentorizon.slow_queries"
+        ) as logs:
+            yield entries
+        if logged:
+            entries.extend(
+                json.loads(record.getMessage()) for record in logs.records
+            )
+
+    def test_asgi_request_queries_attributed(self):
+        self.async_client.force_login(self.user)
+
+        async def get_spheres():
+            await self.async_client.get(reverse("mentorizon:sphere-list"))
+
+        # the view runs in this thread
+        with self.log_slow_queries() as entries:
+            async_to_sync(get_spheres)()
+
+        last_update_query = next(
+            entry for entry in entries
+            if 'ORDER BY "mentorizon_sphere"."updated_at"' in entry["sql"]
+        )
+        self.assertEqual(
+            last_update_query["view"], "mentorizon:sphere-list"
+        )
+        self.assertTrue(any(
+            line.startswith("mentorizon/views.py:")
+            and line.endswith(" in get_last_update")
+            for line in last_update_query["source"]
+        ))
+
+    def test_template_line(self):
+        template = Template(
+            "{% for sphere in spheres %}\n{{ sphere.name }}{% endfor %}"
+        )
+        with self.log_slow_queries() as entries:
+            template.render(Context({"spheres": Sphere.objects.all()}))
+
+        [entry] = entries
+        self.assertEqual(entry["template"], "<unknown source>:1")
+        self.assertIsNone(entry["view"])
+        self.assertTrue(entry["source"][0].startswith(
+            "mentorizon/tests/test_slowqueries.py:"
+        ))
+
+    @override_settings(SLOW_QUERY_EXPLAIN=True)
+    def test_explain(self):
+        with self.log_slow_queries() as entries:
+            list(Sphere.objects.filter(name="Art"))
+
+        [entry] = entries
+        self.assertTrue(entry["explain"])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60_000)
+    def test_fast_queries_not_logged(self):
+        with self.log_slow_queries(logged=False):
+            list(Sphere.objects.all())
+
+    @override_settings(SLOW_QUERY_SAMPLE_RATE=0)
+    def test_sampling(self):
+        with self.log_slow_queries(logged=False):
+            list(Sphere.objects.all())
@@ -0,0 +1,131 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from mentorizon.models import Meeting, MentorSession, Sphere, SphereStats
+
+
+class SphereStatsTest(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.art = Sphere.objects.create(name="Art")
+        self.music = Sphere.objects.create(name="Music")
+        self.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=self.art
+        )
+        self.user = get_user_model().objects.create_user(
+            username="user", password="test12345"
+        )
+        self.client.force_login(self.mentor)
+
+    def create_meeting(self, topic: str, days: int) -> Meeting:
+        meeting = Meeting.objects.create(
+            topic=topic,
+            date=timezone.now() + timezone.timedelta(days=days),
+            description="Description",
+            limit_of_participants=3,
+            link="https://example.com/room"
+        )
+        MentorSession.objects.create(mentor=self.mentor, meeting=meeting)
+        return meeting
+
+    def assertStats(self, sphere: Sphere, *expected) -> None:
+        stats = SphereStats.objects.get(sphere=sphere)
+        self.assertEqual(
+            (
+                stats.mentors_count,
+                stats.upcoming_meetings_count,
+                stats.votes_count,
+                stats.votes_sum,
+                stats.average_rating,
+            ),
+            expected
+        )
+
+    def test_counters_follow_changes(self):
+        self.assertStats(self.art, 1, 0, 0, 0, None)
+
+        self.client.post(reverse("mentorizon:meeting-create"), {
+            "topic": "Painting",
+            "date": timezone.now() + timezone.timedelta(days=5),
+            "description": "Description",
+            "limit_of_participants": 3,
+            "link": "https://example.com/room",
+        })
+        self.create_meeting("Drawing", days=-1)
+        self.mentor.rating.vote(voter_id=self.user.id, rate=4)
+        self.assertStats(self.art, 1, 1, 1, 4, 4.0)
+
+        self.mentor.rating.vote(voter_id=self.user.id, rate=5)
+        self.assertStats(self.art, 1, 1, 1, 5, 5.0)
+
+        self.client.post(reverse(
+            "mentorizon:meeting-delete",
+            args=[Meeting.objects.get(topic="Painting").id]
+        ))
+        self.assertStats(self.art, 1, 0, 1, 5, 5.0)
+
+    def test_mentor_changing_sphere(self):
+        self.create_meeting("Painting", days=5)
+        self.mentor.rating.vote(voter_id=self.user.id, rate=4)
+
+        self.mentor.mentor_sphere = self.music
+        self.mentor.save()
+
+        self.assertStats(self.art, 0, 0, 0, 0, None)
+        self.assertStats(self.music, 1, 1, 1, 4, 4.0)
+
+        self.mentor.mentor_sphere = None
+        self.mentor.save()
+
+        self.assertStats(self.music, 0, 0, 0, 0, None)
+
+    def test_mentor_deleted(self):
+        self.create_meeting("Painting", days=5)
+        self.mentor.rating.vote(voter_id=self.user.id, rate=4)
+
+        self.mentor.delete()
+
+        self.assertStats(self.art, 0, 0, 0, 0, None)
+
+    def test_rebuild_drops_started_meetings(self):
+        meeting = self.create_meeting("Painting", days=5)
+        self.create_meeting("Drawing", days=5)
+        self.mentor.rating.vote(voter_id=self.user.id, rate=3)
+        Meeting.objects.filter(pk=meeting.pk).update(
+            date=timezone.now() - timezone.timedelta(hours=1)
+        )
+        self.assertStats(self.art, 1, 2, 1, 3, 3.0)
+
+        call_command("rebuild_sphere_stats", stdout=StringIO())
+
+        self.assertStats(self.art, 1, 1, 1, 3, 3.0)
+        self.assertStats(self.music, 0, 0, 0, 0, None)
+
+    @override_settings(
+        AUTH_USER_CACHE=True,
+        SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    )
+    def test_sphere_list_reads_stats(self):
+        url = reverse("mentorizon:sphere-list")
+        # fill the cached dashboard counters
+        self.client.get(url)
+        self.mentor.rating.vote(voter_id=self.user.id, rate=4)
+
+        # last update and the spheres with their stats
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertContains(response, "Mentors: 1")
+        self.assertContains(response, "Average rating: 4.0")
+        self.assertContains(response, "Average rating: no votes yet")
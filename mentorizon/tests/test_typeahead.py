@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from mentorizon.models import Sphere
+from mentorizon.typeahead import mentor_index, sphere_index
+
+
+class TypeaheadTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.art = Sphere.objects.create(name="Art")
+        cls.architecture = Sphere.objects.create(name="Architecture")
+        cls.music = Sphere.objects.create(name="Music")
+        cls.mentor = get_user_model().objects.create_user(
+            username="mentor",
+            password="test12345",
+            first_name="Ivan",
+            last_name="Ivanenko",
+            mentor_sphere=cls.art
+        )
+        cls.other_mentor = get_user_model().objects.create_user(
+            username="other",
+            password="test12345",
+            first_name="Olena",
+            last_name="Ivasiuk",
+            mentor_sphere=cls.music
+        )
+        cls.user = get_user_model().objects.create_user(
+            username="user",
+            password="test12345",
+            first_name="Ivo",
+            last_name="User"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_sphere_prefix_search(self):
+        self.assertEqual(
+            [sphere["name"] for sphere in sphere_index.search(" aR")],
+            ["Architecture", "Art"]
+        )
+        self.assertEqual(sphere_index.search("art", limit=1), [
+            {"id": self.art.id, "name": "Art"}
+        ])
+        self.assertEqual(sphere_index.search(""), [])
+
+    def test_mentor_prefix_search(self):
+        self.assertEqual(
+            [mentor["id"] for mentor in mentor_index.search("iv")],
+            [self.mentor.id, self.other_mentor.id]
+        )
+        self.assertEqual(mentor_index.search("olena iv"), [{
+            "id": self.other_mentor.id,
+            "name": "Olena Ivasiuk",
+            "label": "Olena Ivasiuk (Music)",
+        }])
+        self.assertEqual(mentor_index.search("ivo"), [])
+
+    def test_index_is_rebuilt_on_changes(self):
+        sphere_index.search("a")
+
+        with self.assertNumQueries(0):
+            sphere_index.search("a")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Sphere.objects.create(name="Astronomy")
+
+        self.assertEqual(
+            [sphere["name"] for sphere in sphere_index.search("a")],
+            ["Architecture", "Art", "Astronomy"]
+        )
+
+    def test_endpoints(self):
+        response = self.client.get(
+            reverse("mentorizon:api-sphere-typeahead"), {"q": "mu"}
+        )
+        self.assertEqual(response.json(), {
+            "results": [{"id": self.music.id, "name": "Music"}]
+        })
+
+        response = self.client.get(
+            reverse("mentorizon:api-mentor-typeahead"),
+            {"q": "iva", "fields": "name"}
+        )
+        self.assertEqual(response.json(), {
+            "results": [{"name": "Ivan Ivanenko"}, {"name": "Olena Ivasiuk"}]
+        })
+
+        response = self.client.get(
+            reverse("mentorizon:api-mentor-typeahead"), {"limit": "a"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_endpoints_require_login(self):
+        self.client.logout()
+
+        response = self.client.get(
+            reverse("mentorizon:api-sphere-typeahead"), {"q": "a"}
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_filters_do_not_render_spheres(self):
+        response = self.client.get(
+            reverse("mentorizon:meeting-list"), {"name": "Art"}
+        )
+
+        self.assertContains(
+            response,
+            f'data-typeahead="{reverse("mentorizon:api-sphere-typeahead")}"'
+        )
+        self.assertContains(response, 'value="Art"')
+        self.assertContains(response, "js/typeahead.js", count=1)
+        self.assertNotContains(response, "<option")
+
+    def test_user_update_picks_sphere_by_name(self):
+        self.client.force_login(self.mentor)
+        url = reverse("mentorizon:user-update", args=[self.mentor.id])
+
+        response = self.client.get(url)
+        self.assertContains(response, 'value="Art"')
+        self.assertNotContains(response, "Architecture")
+
+        self.client.post(url, {
+            "first_name": "Ivan",
+            "last_name": "Ivanenko",
+            "mentor_sphere": "Music",
+            "years_of_experience": 3,
+        })
+        self.mentor.refresh_from_db()
+        self.assertEqual(self.mentor.mentor_sphere, self.music)
+
+    def test_sphere_name_is_case_insensitive(self):
+        self.client.force_login(self.mentor)
+
+        self.client.post(
+            reverse("mentorizon:user-update", args=[self.mentor.id]),
+            {
+                "first_name": "Ivan",
+                "last_name": "Ivanenko",
+                "mentor_sphere": " music",
+                "years_of_experience": 3,
+            }
+        )
+
+        self.mentor.refresh_from_db()
+        self.assertEqual(self.mentor.mentor_sphere, self.music)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.test import TestCase
 from django.urls import reverse
@@ -44,6 +45,7 @@ class PrivateTests(TestCase):
         )
 
     def setUp(self) -> None:
+        cache.clear()
         self.sphere1 = Sphere.objects.get(pk=1)
         self.sphere2 = Sphere.objects.get(pk=2)
         self.mentor = get_user_model().objects.get(pk=1)
@@ -106,6 +108,15 @@ class PrivateTests(TestCase):
         self.assertContains(response2, "Rating: 0")
         self.assertContains(response3, "Rating: 4.0")
 
+    def test_invalid_rate_is_rejected(self):
+        url = reverse("mentorizon:mentor-rate", kwargs={"pk": self.mentor.id})
+
+        for data in ({}, {"rate": "five"}, {"rate": 0}, {"rate": 6}):
+            response = self.client.post(url, data=data)
+            self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.mentor.rating.rating_votes.count(), 0)
+
     def test_book_meeting(self):
         response1 = self.client.get(
             reverse("mentorizon:meeting-detail", kwargs={
@@ -295,3 +306,53 @@ class PrivateTests(TestCase):
         self.assertTrue(Meeting.objects.filter(pk=self.meeting1.id))
         with self.assertRaises(ObjectDoesNotExist):
             Meeting.objects.get(pk=self.meeting2.id)
+
+    def test_meeting_detail_not_modified(self):
+        url = reverse(
+            "mentorizon:meeting-detail", kwargs={"pk": self.meeting1.id}
+        )
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]
+        ).status_code, 304)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        ).status_code, 304)
+
+    def test_etag_depends_on_viewer(self):
+        url = reverse(
+            "mentorizon:meeting-detail", kwargs={"pk": self.meeting1.id}
+        )
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(self.mentor)
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_etag_changes_after_booking(self):
+        url = reverse(
+            "mentorizon:meeting-detail", kwargs={"pk": self.meeting1.id}
+        )
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.client.post(
+            reverse("mentorizon:book-meeting", kwargs={"pk": self.meeting1.id})
+        )
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_list_etag_changes_after_delete(self):
+        url = reverse("mentorizon:meeting-list")
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meeting2.delete()
+
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
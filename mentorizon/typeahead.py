@@ -0,0 +1,111 @@
+"""Prefix search over sphere and mentor names for typeahead widgets.
+
+Each process keeps the names of an index lowercased in a sorted list
+and answers a prefix with a binary search, without querying the
+database. An index is rebuilt on the first search after the version of
+its API collection changes, which the Sphere and User signals do on
+saves and deletions (see mentorizon.caching.invalidate_collections).
+"""
+import bisect
+import threading
+
+from django.contrib.auth import get_user_model
+
+from mentorizon.caching import collection_versions
+from mentorizon.models import Sphere
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+CHUNK_SIZE = 2000
+
+
+class TypeaheadIndex:
+    collection = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (collection version, sorted keys, items of the keys)
+        self._state = None
+
+    def get_entries(self):
+        """Iterable of (name, item) pairs, items being dicts with an id,
+        several names may share an item."""
+        raise NotImplementedError
+
+    def build(self) -> tuple:
+        entries = sorted(
+            ((name.lower(), item) for name, item in self.get_entries()),
+            key=lambda entry: (entry[0], entry[1]["id"])
+        )
+        return (
+            [key for key, _ in entries],
+            [item for _, item in entries],
+        )
+
+    def get_state(self) -> tuple:
+        version = collection_versions(self.collection)[self.collection]
+        state = self._state
+        if state is None or state[0] != version:
+            with self._lock:
+                state = self._state
+                if state is None or state[0] != version:
+                    state = (version, *self.build())
+                    self._state = state
+        return state
+
+    def search(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list:
+        """Items with a name starting with prefix, case-insensitive,
+        in the order of their names."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        _, keys, items = self.get_state()
+        results = []
+        seen = set()
+        position = bisect.bisect_left(keys, prefix)
+        while (
+            position < len(keys)
+            and keys[position].startswith(prefix)
+            and len(results) < limit
+        ):
+            item = items[position]
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                results.append(item)
+            position += 1
+        return results
+
+
+class SphereIndex(TypeaheadIndex):
+    collection = "spheres"
+
+    def get_entries(self):
+        spheres = Sphere.objects.values_list("id", "name").order_by()
+        for sphere_id, name in spheres.iterator(chunk_size=CHUNK_SIZE):
+            yield name, {"id": sphere_id, "name": name}
+
+
+class MentorIndex(TypeaheadIndex):
+    """Mentors found by the start of their first or last name."""
+    collection = "mentors"
+
+    def get_entries(self):
+        mentors = get_user_model().objects.filter(
+            mentor_sphere__isnull=False
+        ).values_list(
+            "id", "first_name", "last_name", "mentor_sphere__name"
+        ).order_by()
+        for mentor_id, first_name, last_name, sphere in mentors.iterator(
+            chunk_size=CHUNK_SIZE
+        ):
+            item = {
+                "id": mentor_id,
+                "name": f"{first_name} {last_name}",
+                "label": f"{first_name} {last_name} ({sphere})",
+            }
+            yield f"{first_name} {last_name}", item
+            yield f"{last_name} {first_name}", item
+
+
+sphere_index = SphereIndex()
+mentor_index = MentorIndex()
@@ -1,5 +1,15 @@
 from django.urls import path
 
+from mentorizon.api import (
+    MeetingApiBatchView,
+    MeetingApiListView,
+    MentorApiBatchView,
+    MentorApiListView,
+    MentorTypeaheadView,
+    SphereApiListView,
+    SphereTypeaheadView,
+)
+from mentorizon.feeds import MentorCalendarView, UserCalendarView
 from mentorizon.views import (
     BookMeetingView,
     index,
@@ -10,6 +20,7 @@ from mentorizon.views import (
     MeetingUpdateView,
     MentorDetailView,
     MentorListView,
+    PastMeetingListView,
     RateMentorView,
     SphereCreateView,
     SphereListView,
@@ -33,6 +44,11 @@ urlpatterns = [
     ),
     path("mentors/", MentorListView.as_view(), name="mentor-list"),
     path("meetings/", MeetingListView.as_view(), name="meeting-list"),
+    path(
+        "meetings/past/",
+        PastMeetingListView.as_view(),
+        name="past-meetings"
+    ),
     path("mentor/<int:pk>/", MentorDetailView.as_view(), name="mentor-detail"),
     path(
         "meeting/<int:pk>/", MeetingDetailView.as_view(), name="meeting-detail"
@@ -63,7 +79,48 @@ urlpatterns = [
         RateMentorView.as_view(),
         name="mentor-rate"
     ),
-    path("spheres/", SphereListView.as_view(), name="sphere-list")
+    path("spheres/", SphereListView.as_view(), name="sphere-list"),
+    path(
+        "calendar/<int:pk>/<str:token>/meetings.ics",
+        UserCalendarView.as_view(),
+        name="user-calendar"
+    ),
+    path(
+        "calendar/<int:pk>/<str:token>/mentor/<int:mentor_pk>.ics",
+        MentorCalendarView.as_view(),
+        name="mentor-calendar"
+    ),
+    path(
+        "api/meetings/",
+        MeetingApiListView.as_view(),
+        name="api-meeting-list"
+    ),
+    path(
+        "api/meetings/batch/",
+        MeetingApiBatchView.as_view(),
+        name="api-meeting-batch"
+    ),
+    path(
+        "api/mentors/",
+        MentorApiListView.as_view(),
+        name="api-mentor-list"
+    ),
+    path(
+        "api/mentors/batch/",
+        MentorApiBatchView.as_view(),
+        name="api-mentor-batch"
+    ),
+    path("api/spheres/", SphereApiListView.as_view(), name="api-sphere-list"),
+    path(
+        "api/spheres/typeahead/",
+        SphereTypeaheadView.as_view(),
+        name="api-sphere-typeahead"
+    ),
+    path(
+        "api/mentors/typeahead/",
+        MentorTypeaheadView.as_view(),
+        name="api-mentor-typeahead"
+    ),
 ]
 
 app_name = "mentorizon"
@@ -1,19 +1,30 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Avg, F, Count
-from django.db.models.functions import Round
-from django.http import HttpResponseRedirect
+from django.db import transaction
+from django.db.models import F, Q
+from django.http import HttpResponseBadRequest, HttpResponseRedirect
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.views import generic
 from django.shortcuts import render, get_object_or_404
 from django.views.generic.edit import ProcessFormView
 
+from mentorizon.caching import (
+    bump_card_version,
+    get_dashboard_counters,
+    invalidate_collections,
+)
+from mentorizon.conditional import ConditionalGetMixin, latest_update
+from mentorizon.feeds import calendar_token
+from mentorizon.leaderboard import refresh_mentor_ranking, top_mentors
 from mentorizon.forms import (
     MeetingCreateForm,
     MeetingSearchForm,
     MeetingUpdateForm,
+    MentorFilterForm,
     MentorSearchForm,
+    RateForm,
     SphereCreateForm,
     SphereFilterForm,
     SphereSearchForm,
@@ -21,25 +32,26 @@ from mentorizon.forms import (
     UserUpdateForm,
 )
 from mentorizon.models import (
+    ArchivedAttendance,
+    ArchivedMeeting,
     Meeting,
+    MentorRanking,
     MentorSession,
-    RatingVote,
+    Rating,
     Sphere,
+    SphereStats,
+    WaitlistEntry,
 )
+from mentorizon.pagination import KeysetPaginationMixin
+from mentorizon.recommendations import recommended_meetings
+from mentorizon.search import search
 
 
 @login_required
 def index(request):
-    num_mentors = get_user_model().objects.filter(
-        mentor_sphere__isnull=False
-    ).count()
-    num_meetings = Meeting.objects.count()
-    num_spheres = Sphere.objects.count()
-    context = {
-        "num_mentors": num_mentors,
-        "num_meetings": num_meetings,
-        "num_spheres": num_spheres
-    }
+    context = get_dashboard_counters()
+    context["top_mentors"] = top_mentors()
+    context["recommendations"] = recommended_meetings(request.user)
     return render(request, "mentorizon/index.html", context=context)
 
 
@@ -51,23 +63,24 @@ class UserCreateView(generic.CreateView):
 
 class UserDetailView(LoginRequiredMixin, generic.DetailView):
     model = get_user_model()
-    queryset = get_user_model().objects.prefetch_related(
-        "mentor_sessions", "rating"
-    ).annotate(avg_rating=Round(Avg("rating__rating_votes__rate"), 1))
+    queryset = get_user_model().objects.select_related(
+        "mentor_sphere", "rating"
+    )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        obj = self.get_object()
+        obj = self.object
         mentor_meetings = Meeting.objects.select_related(
             "mentor_session"
         ).filter(
             mentor_session__mentor_id=obj.id
-        ).annotate(num_participants=Count("participants"))
-        particip_meetings = Meeting.objects.prefetch_related(
-            "participants"
-        ).filter(participants__id=obj.id)
+        ).with_booking_state(self.request.user)
+        particip_meetings = Meeting.objects.filter(participants__id=obj.id)
         context["mentor_meetings"] = mentor_meetings
         context["particip_meetings"] = particip_meetings
+        # recommendations are private to the user
+        if obj.id == self.request.user.id:
+            context["recommendations"] = recommended_meetings(obj)
         return context
 
 
@@ -77,18 +90,41 @@ class UserUpdateView(LoginRequiredMixin, generic.UpdateView):
     template_name = "mentorizon/user_update.html"
 
 
-class MentorListView(LoginRequiredMixin, generic.ListView):
+def dashboard_counters_etag() -> tuple:
+    """Cached counters changing when rows are deleted or meetings
+    start, which updated_at timestamps cannot show."""
+    return tuple(sorted(get_dashboard_counters().items()))
+
+
+class MentorListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    generic.ListView
+):
     model = get_user_model()
     queryset = get_user_model().objects.filter(
         mentor_sphere__isnull=False
-    ).select_related("mentor_sphere").prefetch_related(
-        "mentor_sessions", "rating"
-    ).annotate(
-        avg_rating=Round(Avg("rating__rating_votes__rate"), 1)
+    ).select_related("mentor_sphere", "rating").prefetch_related(
+        "mentor_sessions"
     ).order_by("last_name")
     template_name = "mentorizon/mentor_list.html"
     context_object_name = "mentor_list"
     paginate_by = 6
+    keyset_ordering = ("last_name", "id")
+
+    def get_last_update(self):
+        return latest_update(
+            get_user_model().objects.all(),
+            Rating.objects.all(),
+            Sphere.objects.all(),
+            Meeting._base_manager.all(),
+            MentorRanking.objects.all(),
+            SphereStats.objects.all()
+        )
+
+    def get_etag_extra(self) -> tuple:
+        return dashboard_counters_etag()
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -96,53 +132,100 @@ class MentorListView(LoginRequiredMixin, generic.ListView):
         context["search_form"] = MentorSearchForm(
             initial={"last_name": last_name}
         )
-        context["filter_form"] = SphereFilterForm()
+        context["filter_form"] = MentorFilterForm(initial={
+            "name": self.request.GET.get("name"),
+            "sort": self.request.GET.get("sort"),
+        })
+        context["media"] = (
+            context["search_form"].media + context["filter_form"].media
+        )
+        context["sort_by_rating"] = self.sort_by_rating
         return context
 
     def get_queryset(self):
         search_form = MentorSearchForm(self.request.GET)
         sphere_name = self.request.GET.get("name")
-        if search_form.is_valid():
-            self.queryset = self.queryset.filter(
-                last_name__icontains=search_form.cleaned_data["last_name"]
+        self.sort_by_rating = self.request.GET.get("sort") == "rating"
+        if search_form.is_valid() and search_form.cleaned_data["last_name"]:
+            self.queryset = search(
+                self.queryset, search_form.cleaned_data["last_name"]
             )
-        if sphere_name:
+        if self.sort_by_rating:
+            # the leaderboard of a sphere is a range of the ranking index
+            self.queryset = self.queryset.filter(
+                ranking__isnull=False
+            ).select_related("ranking")
+            self.keyset_ordering = ("-ranking__score", "id")
+            if sphere_name:
+                self.queryset = self.queryset.filter(
+                    ranking__sphere__name=sphere_name
+                )
+        elif sphere_name:
             self.queryset = self.queryset.filter(
                 mentor_sphere__name=sphere_name
             )
         return self.queryset
 
 
-class MentorDetailView(LoginRequiredMixin, generic.DetailView):
+class MentorDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = get_user_model()
     queryset = get_user_model().objects.filter(
         mentor_sphere__isnull=False
-    ).select_related("mentor_sphere").prefetch_related(
-        "mentor_sessions", "rating"
-    ).annotate(avg_rating=Round(Avg("rating__rating_votes__rate"), 1))
+    ).select_related("mentor_sphere", "rating")
     template_name = "mentorizon/mentor_detail.html"
     context_object_name = "mentor"
 
+    def get_last_update(self):
+        pk = self.kwargs["pk"]
+        return latest_update(
+            get_user_model().objects.filter(pk=pk),
+            Rating.objects.filter(mentor_id=pk),
+            Sphere.objects.filter(users=pk),
+            Meeting._base_manager.filter(mentor_session__mentor_id=pk)
+        )
+
+    def get_etag_extra(self) -> tuple:
+        # the page links the calendar feed of the viewer
+        return (
+            *dashboard_counters_etag(),
+            calendar_token(self.request.user),
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        obj = self.get_object()
+        obj = self.object
         meetings = Meeting.objects.select_related("mentor_session").filter(
             mentor_session__mentor_id=obj.id
-        ).annotate(
-            available_places=F("limit_of_participants") - Count("participants")
-        )
+        ).with_booking_state(self.request.user)
         context["meetings"] = meetings
         return context
 
 
-class MeetingListView(LoginRequiredMixin, generic.ListView):
+class MeetingListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    generic.ListView
+):
     model = Meeting
     queryset = Meeting.objects.select_related(
         "mentor_session__mentor__mentor_sphere"
-    ).prefetch_related("participants").annotate(
-        available_places=F("limit_of_participants") - Count("participants")
     ).order_by("date")
     paginate_by = 6
+    keyset_ordering = ("date", "id")
+
+    def get_last_update(self):
+        return latest_update(
+            Meeting._base_manager.all(),
+            get_user_model().objects.all(),
+            Sphere.objects.all(),
+            SphereStats.objects.all()
+        )
+
+    def get_etag_extra(self) -> tuple:
+        return dashboard_counters_etag()
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -150,15 +233,21 @@ class MeetingListView(LoginRequiredMixin, generic.ListView):
         context["search_form"] = MeetingSearchForm(
             initial={"topic": topic}
         )
-        context["filter_form"] = SphereFilterForm()
+        context["filter_form"] = SphereFilterForm(
+            initial={"name": self.request.GET.get("name")}
+        )
+        context["media"] = (
+            context["search_form"].media + context["filter_form"].media
+        )
         return context
 
     def get_queryset(self):
         search_form = MeetingSearchForm(self.request.GET)
         sphere_name = self.request.GET.get("name")
-        if search_form.is_valid():
-            self.queryset = self.queryset.filter(
-                topic__icontains=search_form.cleaned_data["topic"]
+        self.queryset = self.queryset.with_booking_state(self.request.user)
+        if search_form.is_valid() and search_form.cleaned_data["topic"]:
+            self.queryset = search(
+                self.queryset, search_form.cleaned_data["topic"]
             )
         if sphere_name:
             self.queryset = self.queryset.filter(
@@ -167,43 +256,91 @@ class MeetingListView(LoginRequiredMixin, generic.ListView):
         return self.queryset
 
 
-class MeetingDetailView(LoginRequiredMixin, generic.DetailView):
+class MeetingDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = Meeting
-    queryset = Meeting.objects.select_related(
-        "mentor_session"
-    ).prefetch_related("participants").annotate(
-        available_places=F("limit_of_participants") - Count("participants")
-    )
+    queryset = Meeting.objects.select_related("mentor_session__mentor")
+
+    def get_last_update(self):
+        pk = self.kwargs["pk"]
+        return latest_update(
+            Meeting.objects.filter(pk=pk),
+            get_user_model().objects.filter(mentor_sessions__meeting_id=pk)
+        )
+
+    def get_queryset(self):
+        return super().get_queryset().with_booking_state(self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.object.is_waiting:
+            waitlist = WaitlistEntry.objects.filter(meeting_id=self.object.id)
+            context["waitlist_position"] = waitlist.filter(
+                id__lte=waitlist.filter(
+                    user_id=self.request.user.id
+                ).values("id")
+            ).count()
+        return context
+
+
+class PastMeetingListView(
+    LoginRequiredMixin,
+    KeysetPaginationMixin,
+    generic.ListView
+):
+    """Meetings the user mentored or attended. Most are in the archive;
+    the first page also shows those the archive_meetings command has
+    not moved yet."""
+    model = ArchivedMeeting
+    template_name = "mentorizon/past_meeting_list.html"
+    context_object_name = "meeting_list"
+    paginate_by = 12
+    keyset_ordering = ("-date", "-id")
+
+    def get_queryset(self):
+        user_id = self.request.user.id
+        return ArchivedMeeting.objects.filter(
+            Q(mentor_id=user_id) | Q(id__in=ArchivedAttendance.objects.filter(
+                user_id=user_id
+            ).values("meeting_id"))
+        ).select_related("mentor")
+
+    def get_context_data(self, *, object_list=None, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if not context["page_obj"].has_previous():
+            user_id = self.request.user.id
+            context["recent_meetings"] = Meeting._base_manager.filter(
+                Q(mentor_session__mentor_id=user_id)
+                | Q(id__in=Meeting.participants.through.objects.filter(
+                    user_id=user_id
+                ).values("meeting_id")),
+                date__lte=timezone.now()
+            ).select_related("mentor_session__mentor").annotate(
+                participants_count=(
+                    F("limit_of_participants") - F("available_places")
+                )
+            ).order_by("-date", "-id")
+        return context
 
 
 class BookMeetingView(LoginRequiredMixin, ProcessFormView):
 
     def post(self, request, *args, **kwargs):
         meeting_id = self.kwargs["pk"]
-        meeting = get_object_or_404(Meeting, pk=meeting_id)
-        participants = meeting.participants.all()
-        user = self.request.user
-        mentor = meeting.mentor_session.mentor
-        if user is not mentor:
-            if user in participants:
-                meeting.participants.remove(user)
-                return HttpResponseRedirect(reverse(
-                    "mentorizon:meeting-detail",
-                    kwargs={"pk": meeting_id}
-                ))
-            if len(participants) < meeting.limit_of_participants:
-                meeting.participants.add(user)
-                return HttpResponseRedirect(reverse(
-                    "mentorizon:meeting-detail",
-                    kwargs={"pk": meeting_id}
-                ))
-
-            return HttpResponseRedirect(
-                reverse_lazy(
-                    "mentorizon:meeting-detail",
-                    kwargs={"pk": meeting_id}
-                )
-            )
+        meeting = get_object_or_404(
+            Meeting.objects.select_related("mentor_session"), pk=meeting_id
+        )
+        user_id = self.request.user.id
+        if user_id != meeting.mentor_session.mentor_id:
+            if (
+                meeting.unbook(user_id)
+                or meeting.leave_waitlist(user_id)
+                or meeting.book(user_id)
+                or meeting.join_waitlist(user_id)
+            ):
+                bump_card_version(Meeting, meeting_id)
+                invalidate_collections("meetings")
         return HttpResponseRedirect(
             reverse_lazy(
                 "mentorizon:meeting-detail",
@@ -217,7 +354,7 @@ class MeetingCreateView(LoginRequiredMixin, generic.CreateView):
     form_class = MeetingCreateForm
 
     def form_valid(self, form):
-        if self.request.user.mentor_sphere is not None:
+        if self.request.user.mentor_sphere_id is not None:
             meeting = Meeting.objects.create(**form.cleaned_data)
             MentorSession.objects.create(
                 mentor=self.request.user,
@@ -231,6 +368,26 @@ class MeetingUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Meeting
     form_class = MeetingUpdateForm
 
+    def form_valid(self, form):
+        limit = form.cleaned_data["limit_of_participants"]
+        with transaction.atomic():
+            # the form counted the participants before the transaction,
+            # so only change the limit if it still holds them all
+            if not self.object.change_limit(limit):
+                form.add_error(
+                    "limit_of_participants",
+                    "Limit of participants can't be less than current "
+                    "number of participants: "
+                    f"{self.object.participants.count()}"
+                )
+                return self.form_invalid(form)
+            self.object = form.save(commit=False)
+            self.object.save(update_fields=[
+                field for field in form.Meta.fields
+                if field != "limit_of_participants"
+            ])
+        return HttpResponseRedirect(self.get_success_url())
+
 
 class MeetingDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Meeting
@@ -255,12 +412,24 @@ class SphereCreateView(LoginRequiredMixin, generic.CreateView):
         return reverse_lazy("mentorizon:user-update", kwargs={"pk": pk})
 
 
-class SphereListView(LoginRequiredMixin, generic.ListView):
+class SphereListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    generic.ListView
+):
     model = Sphere
-    queryset = Sphere.objects.prefetch_related(
-        "users"
-    )
+    queryset = Sphere.objects.select_related("stats")
     paginate_by = 6
+    keyset_ordering = ("name", "id")
+
+    def get_last_update(self):
+        return latest_update(
+            Sphere.objects.all(), SphereStats.objects.all()
+        )
+
+    def get_etag_extra(self) -> tuple:
+        return dashboard_counters_etag()
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -272,26 +441,28 @@ class SphereListView(LoginRequiredMixin, generic.ListView):
 
     def get_queryset(self):
         search_form = SphereSearchForm(self.request.GET)
-        if search_form.is_valid():
-            return self.queryset.filter(
-                name__icontains=search_form.cleaned_data["name"]
-            )
+        if search_form.is_valid() and search_form.cleaned_data["name"]:
+            return search(self.queryset, search_form.cleaned_data["name"])
         return self.queryset
 
 
 class RateMentorView(LoginRequiredMixin, generic.View):
 
     def post(self, request, *args, **kwargs):
-        mentor = get_object_or_404(get_user_model(), pk=kwargs["pk"])
-        rate = self.request.POST["rate"]
+        mentor = get_object_or_404(
+            get_user_model().objects.select_related("rating"),
+            pk=kwargs["pk"]
+        )
+        form = RateForm(self.request.POST)
+        if not form.is_valid():
+            return HttpResponseBadRequest("Rate must be from 1 to 5.")
         voter = self.request.user
         if voter.id != mentor.id:
-            RatingVote.objects.update_or_create(
-                rating_id=mentor.rating.id,
-                voter_id=voter.id,
-                defaults={
-                    "rate": rate
-                })
+            mentor.rating.vote(
+                voter_id=voter.id, rate=form.cleaned_data["rate"]
+            )
+            refresh_mentor_ranking(mentor.id)
+            invalidate_collections("mentors")
             return HttpResponseRedirect(
                 reverse_lazy(
                     "mentorizon:mentor-detail", kwargs={"pk": mentor.id}
@@ -304,8 +475,8 @@ class RateMentorView(LoginRequiredMixin, generic.View):
 
 
 def error_404_view(request, exception):
-    return render(request, "404.html")
+    return render(request, "404.html", status=404)
 
 
 def error_500_view(request):
-    return render(request, "500.html")
+    return render(request, "500.html", status=500)
@@ -0,0 +1,49 @@
+// Fill the datalist of every input with a data-typeahead endpoint with
+// the names starting with what the user typed.
+document.addEventListener("DOMContentLoaded", () => {
+  const DELAY = 150;
+
+  document.querySelectorAll("input[data-typeahead]").forEach((input) => {
+    const options = document.getElementById(input.getAttribute("list"));
+    let timer = null;
+    let controller = null;
+
+    const suggest = async () => {
+      const query = input.value.trim();
+      if (controller) {
+        controller.abort();
+      }
+      if (!query) {
+        options.replaceChildren();
+        return;
+      }
+      controller = new AbortController();
+      const url = new URL(input.dataset.typeahead, window.location.origin);
+      url.searchParams.set("q", query);
+      try {
+        const response = await fetch(url, {signal: controller.signal});
+        if (!response.ok) {
+          return;
+        }
+        const data = await response.json();
+        options.replaceChildren(...data.results.map((result) => {
+          const option = document.createElement("option");
+          option.value = result.name;
+          if (result.label) {
+            option.label = result.label;
+          }
+          return option;
+        }));
+      } catch (error) {
+        if (error.name !== "AbortError") {
+          throw error;
+        }
+      }
+    };
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(suggest, DELAY);
+    });
+  });
+});